@@ -0,0 +1,237 @@
+#!python
+from hashtable import HashTable # from folder.filename import Class
+from linkedlist import DoublyLinkedList
+import functools
+import sys
+
+
+class CacheEntry(object):
+    """A cached value along with what the cache needs to evict it: its size
+    in bytes, how often it was used and its node in a recency list."""
+
+    __slots__ = ('key', 'value', 'nbytes', 'freq', 'node')
+
+    def __init__(self, key, value, nbytes):
+        """Initialize this entry with the given key, value and size."""
+        self.key = key
+        self.value = value
+        self.nbytes = nbytes
+        self.freq = 1  # Number of times this entry was set or hit
+        self.node = None  # Node of this entry in a recency list
+
+    def __repr__(self):
+        """Return a string representation of this entry."""
+        return 'CacheEntry({!r}, {!r})'.format(self.key, self.value)
+
+
+def default_sizeof(key, value):
+    """Return the approximate number of bytes used by a key and its value."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class Cache(object):
+    """Bounded cache built on a HashTable that maps each key to its entry and
+    doubly linked recency lists, so get and set take O(1) time.
+    With the 'lru' policy the least recently used entry is evicted first.
+    With the 'lfu' policy the least frequently used entry is evicted first,
+    and the least recently used one among entries used equally often."""
+
+    POLICIES = ('lru', 'lfu')
+
+    def __init__(self, max_entries=None, max_bytes=None, policy='lru',
+                 sizeof=default_sizeof):
+        """Initialize this cache, which will hold at most max_entries entries
+        and at most max_bytes bytes as measured by sizeof(key, value).
+        Either limit can be None for no limit."""
+        if policy not in self.POLICIES:
+            raise ValueError('Unknown eviction policy: {}'.format(policy))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.sizeof = sizeof
+        self.table = HashTable()  # Maps each key to its CacheEntry
+        self.nbytes = 0  # Total size of all entries
+        # LRU: one list, most recently used first
+        self.recency = DoublyLinkedList()
+        # LFU: maps each use count to a list, most recently used first
+        self.freq_lists = HashTable()
+        self.min_freq = 0  # Lowest use count of any entry
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        """Return a string representation of this cache."""
+        return 'Cache({} entries, policy={!r})'.format(self.length(),
+                                                       self.policy)
+
+    def __len__(self):
+        """Return the number of entries in this cache."""
+        return self.table.size
+
+    def __contains__(self, key):
+        """Return True if this cache holds the given key, or False."""
+        return self.table.contains(key)
+
+    def length(self):
+        """Return the number of entries in this cache."""
+        return self.table.size
+
+    def contains(self, key):
+        """Return True if this cache holds the given key, or False, without
+        counting it as a use of the entry. Run time: O(1) on average"""
+        return self.table.contains(key)
+
+    def stats(self):
+        """Return a dict of the hit, miss and eviction counters along with
+        the number of entries and bytes held."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': self.table.size,
+                'bytes': self.nbytes}
+
+    def get(self, key):
+        """Return the value cached for the given key and mark it as used, or
+        raise KeyError. Run time: O(1) on average"""
+        try:
+            entry = self.table.get(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._touch(entry)
+        return entry.value
+
+    def set(self, key, value):
+        """Cache the given value for the given key, evicting entries until
+        both limits hold again. Setting a cached key counts as a use of its
+        entry. A value that could never fit within max_bytes is not cached.
+        Run time: O(1) on average, plus O(1) per eviction"""
+        nbytes = self.sizeof(key, value)
+        if ((self.max_bytes is not None and nbytes > self.max_bytes) or
+                self.max_entries == 0):
+            if self.table.contains(key):
+                self.delete(key)
+            return
+        if self.table.contains(key):
+            self._update(self.table.get(key), value, nbytes)
+            return
+        if self.max_entries is not None:
+            while self.table.size >= self.max_entries:
+                self._evict()
+        if self.max_bytes is not None:
+            while self.nbytes + nbytes > self.max_bytes:
+                self._evict()
+        entry = CacheEntry(key, value, nbytes)
+        self.table.set(key, entry)
+        self._link(entry)
+        self.min_freq = 1
+
+    def _update(self, entry, value, nbytes):
+        """Replace the value of the given cached entry, keeping its use count
+        and counting this as another use, and evict other entries until
+        max_bytes holds again. Run time: O(1), plus O(1) per eviction"""
+        # Unlinked, the entry can't be picked for eviction
+        self._unlink(entry)
+        entry.value = value
+        entry.nbytes = nbytes
+        if self.max_bytes is not None:
+            while self.nbytes + nbytes > self.max_bytes:
+                self._evict()
+        entry.freq += 1
+        # The old use count's list may be gone, but min_freq stays a lower
+        # bound and _evict finds the lowest use count again when it is
+        self._link(entry)
+
+    def delete(self, key):
+        """Remove the given key and its value from this cache, or raise
+        KeyError. Run time: O(1) on average"""
+        entry = self.table.get(key)
+        self.table.delete(key)
+        self._unlink(entry)
+
+    def clear(self):
+        """Remove all entries from this cache, keeping its counters."""
+        self.table = HashTable()
+        self.recency = DoublyLinkedList()
+        self.freq_lists = HashTable()
+        self.min_freq = 0
+        self.nbytes = 0
+
+    def _freq_list(self, freq):
+        """Return the list of entries used freq times, creating it if needed."""
+        if not self.freq_lists.contains(freq):
+            self.freq_lists.set(freq, DoublyLinkedList())
+        return self.freq_lists.get(freq)
+
+    def _touch(self, entry):
+        """Record a use of the given entry. Run time: O(1)"""
+        if self.policy == 'lru':
+            self.recency.move_to_front(entry.node)
+            return
+        # Move the entry from the list of its old use count to the next one
+        old_list = self.freq_lists.get(entry.freq)
+        old_list.remove(entry.node)
+        if old_list.is_empty():
+            self.freq_lists.delete(entry.freq)
+            if self.min_freq == entry.freq:
+                self.min_freq += 1
+        entry.freq += 1
+        entry.node = self._freq_list(entry.freq).prepend(entry)
+
+    def _link(self, entry):
+        """Add the given entry to the recency list for its use count and to
+        the byte count. Run time: O(1)"""
+        self.nbytes += entry.nbytes
+        if self.policy == 'lru':
+            entry.node = self.recency.prepend(entry)
+        else:
+            entry.node = self._freq_list(entry.freq).prepend(entry)
+
+    def _unlink(self, entry):
+        """Remove the given entry from its recency list and byte count."""
+        self.nbytes -= entry.nbytes
+        if self.policy == 'lru':
+            self.recency.remove(entry.node)
+            return
+        freq_list = self.freq_lists.get(entry.freq)
+        freq_list.remove(entry.node)
+        if freq_list.is_empty():
+            self.freq_lists.delete(entry.freq)
+
+    def _evict(self):
+        """Remove the entry that the eviction policy picks.
+        Run time: O(1), except after deleting every least frequently used
+        entry, when finding the new lowest use count takes O(f) time where f
+        is the number of distinct use counts"""
+        if self.policy == 'lru':
+            entry = self.recency.tail.data
+        else:
+            if not self.freq_lists.contains(self.min_freq):
+                self.min_freq = min(self.freq_lists.keys())
+            entry = self.freq_lists.get(self.min_freq).tail.data
+        self.table.delete(entry.key)
+        self._unlink(entry)
+        self.evictions += 1
+
+
+def cached(max_entries=128, max_bytes=None, policy='lru'):
+    """Return a decorator that caches the results of the function it wraps,
+    keyed by its (hashable) arguments. The Cache is available as the
+    wrapper's cache attribute, for example to read its stats."""
+    def decorator(func):
+        cache = Cache(max_entries, max_bytes, policy)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key += (Cache,) + tuple(sorted(kwargs.items()))
+            try:
+                return cache.get(key)
+            except KeyError:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+                return value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
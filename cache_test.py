@@ -0,0 +1,153 @@
+#!python
+
+from cache import Cache, cached
+import unittest
+
+
+class CacheTest(unittest.TestCase):
+
+    def test_init(self):
+        cache = Cache(max_entries=2)
+        assert cache.length() == 0
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0,
+                                 'entries': 0, 'bytes': 0}
+        with self.assertRaises(ValueError):
+            Cache(policy='fifo')
+
+    def test_set_and_get(self):
+        cache = Cache()
+        cache.set('I', 1)
+        cache.set('V', 5)
+        cache.set('V', 4)  # Update value
+        assert cache.get('I') == 1
+        assert cache.get('V') == 4
+        assert cache.length() == 2
+        assert cache.contains('V') is True
+        with self.assertRaises(KeyError):
+            cache.get('X')
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_delete(self):
+        cache = Cache()
+        cache.set('I', 1)
+        cache.delete('I')
+        assert cache.contains('I') is False
+        assert cache.nbytes == 0
+        with self.assertRaises(KeyError):
+            cache.delete('I')
+
+    def test_lru_eviction(self):
+        cache = Cache(max_entries=3)
+        for key in 'ABC':
+            cache.set(key, key)
+        cache.get('A')  # B is now the least recently used
+        cache.set('D', 'D')
+        assert 'B' not in cache
+        assert 'A' in cache and 'C' in cache and 'D' in cache
+        cache.set('E', 'E')
+        assert 'C' not in cache
+        assert cache.evictions == 2
+        assert len(cache) == 3
+
+    def test_lfu_eviction(self):
+        cache = Cache(max_entries=3, policy='lfu')
+        for key in 'ABC':
+            cache.set(key, key)
+        cache.get('A')
+        cache.get('A')
+        cache.get('B')
+        cache.set('D', 'D')  # C was used the least
+        assert 'C' not in cache
+        cache.get('D')
+        cache.set('E', 'E')  # B and D were used twice, B less recently
+        assert 'B' not in cache
+        assert 'A' in cache and 'D' in cache and 'E' in cache
+        assert cache.evictions == 2
+
+    def test_lfu_delete_least_used(self):
+        cache = Cache(max_entries=2, policy='lfu')
+        cache.set('A', 'A')
+        cache.set('B', 'B')
+        cache.get('B')
+        cache.delete('A')  # Remove the only entry with the lowest count
+        cache.set('C', 'C')
+        cache.get('C')
+        cache.get('C')
+        cache.set('D', 'D')  # B was used less than C
+        assert 'B' not in cache
+        assert 'C' in cache and 'D' in cache
+
+    def test_lfu_evict_after_replacing_least_used(self):
+        cache = Cache(max_bytes=10, policy='lfu',
+                      sizeof=lambda key, value: len(value))
+        cache.set('A', 'aaaa')
+        cache.set('B', 'bbbb')
+        cache.get('B')
+        # Replacing A removes the only entry used once before evicting
+        cache.set('A', 'a' * 8)
+        assert 'B' not in cache
+        assert cache.get('A') == 'a' * 8
+
+    def test_lfu_update_keeps_use_count(self):
+        cache = Cache(max_entries=2, policy='lfu')
+        cache.set('hot', 1)
+        for _ in range(10):
+            cache.get('hot')
+        cache.set('cold', 1)
+        cache.set('hot', 2)  # Refreshing the value doesn't reset its count
+        assert cache.table.get('hot').freq == 12
+        cache.set('new', 1)  # cold was used the least
+        assert 'cold' not in cache
+        assert cache.get('hot') == 2
+
+    def test_update_bytes(self):
+        cache = Cache(max_bytes=10, sizeof=lambda key, value: len(value))
+        cache.set('A', 'aaaa')
+        cache.set('B', 'bbbb')
+        cache.set('B', 'bb')  # Shrinks in place
+        assert cache.nbytes == 6 and len(cache) == 2
+        cache.set('B', 'b' * 8)  # Grows, evicting A but never B itself
+        assert 'A' not in cache
+        assert cache.get('B') == 'b' * 8
+        assert cache.nbytes == 8
+        cache.set('B', 'b' * 11)  # Too big to cache at all
+        assert 'B' not in cache and cache.nbytes == 0
+
+    def test_max_bytes(self):
+        cache = Cache(max_bytes=10, sizeof=lambda key, value: len(value))
+        cache.set('A', 'aaaa')
+        cache.set('B', 'bbbb')
+        assert cache.nbytes == 8
+        cache.set('C', 'cccc')  # Only fits after evicting A
+        assert 'A' not in cache
+        assert cache.nbytes == 8
+        cache.set('D', 'd' * 11)  # Can never fit, so is not cached
+        assert 'D' not in cache
+        assert cache.nbytes == 8
+
+
+class CachedTest(unittest.TestCase):
+
+    def test_cached(self):
+        calls = []
+
+        @cached(max_entries=2)
+        def square(number, offset=0):
+            """Return the square of number plus offset."""
+            calls.append(number)
+            return number * number + offset
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert square(3, offset=1) == 10
+        assert calls == [3, 3]
+        assert square.cache.stats()['hits'] == 1
+        assert square.__name__ == 'square'
+        square(4)  # Evicts square(3)
+        square(3)
+        assert calls == [3, 3, 4, 3]
+
+
+if __name__ == '__main__':
+    unittest.main()
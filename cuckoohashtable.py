@@ -0,0 +1,330 @@
+#!python
+from hashtable import (KeysView, ValuesView, ItemsView, KeyedHash,
+                       round_up_power_of_two)
+import random
+
+
+class CuckooHashTable(object):
+    """Hash table using bucketized cuckoo hashing: every key can only be in
+    one of hash_count buckets, picked by different seeded hash functions, each
+    holding bucket_size slots, or in a small stash. A lookup therefore
+    checks at most hash_count * bucket_size + stash_size slots, however the
+    keys collide. An insertion that finds all of its slots taken evicts a
+    random entry from them, which moves to one of its own other buckets, and
+    so on. If that chain of evictions grows too long, the entry left over
+    goes to the stash, and once the stash is full the table grows and picks
+    new hash functions. Only keys whose hash() is equal can't be separated
+    that way, so more of them than fit in their buckets and the stash
+    overflow the stash, and lookups of such keys are no longer O(1)."""
+
+    # Longest chain of evictions an insertion tries before using the stash
+    MAX_KICKS = 100
+
+    def __init__(self, init_size=8, hash_count=2, bucket_size=4, stash_size=4,
+                 max_load_factor=0.9, min_load_factor=0.25, seed=None):
+        """Initialize this hash table with the given initial number of
+        buckets, rounded up to a power of two, each with bucket_size slots.
+        The table grows once an insertion would push the load factor (the
+        ratio of entries to slots) past max_load_factor, and halves when a
+        deletion drops it below min_load_factor (None to never shrink).
+        Seed the random choices (and hash functions) with seed to make them
+        repeatable."""
+        if hash_count < 2:
+            raise ValueError('Need at least two hash functions: {}'.format(
+                hash_count))
+        self.hash_count = hash_count
+        self.bucket_size = bucket_size
+        self.stash_size = stash_size
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.random = random.Random(seed)
+        self.init_size = round_up_power_of_two(init_size)
+        self._allocate(self.init_size)
+        self.size = 0  # Number of key-value entries
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'CuckooHashTable({!r})'.format(list(self.items()))
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _allocate(self, bucket_count):
+        """Replace the slots with bucket_count empty buckets, an empty stash
+        and new hash functions."""
+        capacity = bucket_count * self.bucket_size
+        self.hashes = [None] * capacity  # Full hash of the key in each slot
+        self.slot_keys = [None] * capacity
+        self.slot_values = [None] * capacity
+        self.stash = []  # (hash, key, value) of entries without a slot
+        self.mixer = KeyedHash(self.random.getrandbits(64))
+
+    def bucket_count(self):
+        """Return the number of buckets in this hash table."""
+        return len(self.hashes) // self.bucket_size
+
+    def _buckets(self, key_hash):
+        """Return the index of the first slot of each bucket a key with the
+        given hash may be stored in. The i-th hash function is h1 + i * h2,
+        where h1 and h2 are the two halves of one seeded hash, which is as
+        good for cuckoo hashing as independent functions but only mixes the
+        hash once. An odd h2 makes the buckets differ while i is less than
+        the number of buckets."""
+        bucket_size = self.bucket_size
+        mask = len(self.hashes) // bucket_size - 1
+        mixed = self.mixer.mix(key_hash)
+        step = (mixed >> 32) | 1
+        buckets = [(mixed & mask) * bucket_size]
+        for _ in range(self.hash_count - 1):
+            mixed += step
+            buckets.append((mixed & mask) * bucket_size)
+        return buckets
+
+    def _find_slot(self, key, key_hash):
+        """Return the slot index holding the given key, or -1 if it is not in
+        any slot. Run time: O(1), at most hash_count * bucket_size slots are
+        checked. Hashes are compared before keys, as in OpenHashTable."""
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        bucket_size = self.bucket_size
+        for start in self._buckets(key_hash):
+            end = start + bucket_size
+            # Let list.index scan the bucket's hashes, which is much faster
+            # than comparing them one by one here
+            while key_hash in hashes[start:end]:
+                index = hashes.index(key_hash, start, end)
+                if slot_keys[index] is key or slot_keys[index] == key:
+                    return index
+                start = index + 1
+        return -1
+
+    def _find_stash(self, key, key_hash):
+        """Return the stash index holding the given key, or -1 if not found.
+        Run time: O(1), the stash holds at most stash_size entries"""
+        for index, (stash_hash, stash_key, _) in enumerate(self.stash):
+            if stash_hash == key_hash and (stash_key is key or
+                                           stash_key == key):
+                return index
+        return -1
+
+    def _iter_entries(self):
+        """Generate the (key, value) pair of each entry."""
+        for index, slot_hash in enumerate(self.hashes):
+            if slot_hash is not None:
+                yield (self.slot_keys[index], self.slot_values[index])
+        for _, key, value in self.stash:
+            yield (key, value)
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        for key, _ in self._iter_entries():
+            yield key
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        for _, value in self._iter_entries():
+            yield value
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        return self._iter_entries()
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it where c is the
+        number of slots"""
+        return KeysView(self)
+
+    def values(self):
+        """Return a live view of all values in this hash table."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return a live view of all entries (key-value pairs)."""
+        return ItemsView(self)
+
+    def load_factor(self):
+        """Return the load factor, the ratio of number of entries to slots."""
+        return float(self.size) / len(self.hashes)
+
+    def length(self):
+        """Return the number of key-value entries by traversing its slots.
+        Run time: O(c) where c is the number of slots"""
+        return sum(1 for _ in self._iter_entries())
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) in the worst case"""
+        key_hash = hash(key)
+        return (self._find_slot(key, key_hash) >= 0 or
+                self._find_stash(key, key_hash) >= 0)
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) in the worst case"""
+        key_hash = hash(key)
+        index = self._find_slot(key, key_hash)
+        if index >= 0:
+            return self.slot_values[index]
+        index = self._find_stash(key, key_hash)
+        if index >= 0:
+            return self.stash[index][2]
+        raise KeyError('Key not found: {}'.format(key))
+
+    def set(self, key, value=None):
+        """Insert or update the given key with its associated value.
+        Run time: O(1) to update, O(1) on average to insert, O(n) when the
+        insertion makes the table grow"""
+        key_hash = hash(key)
+        index = self._find_slot(key, key_hash)
+        if index >= 0:  # Key already present, so only its value is updated
+            self.slot_values[index] = value
+            return
+        index = self._find_stash(key, key_hash)
+        if index >= 0:
+            self.stash[index] = (key_hash, key, value)
+            return
+        self.size += 1
+        if self.size > len(self.hashes) * self.max_load_factor:
+            self._resize(self.bucket_count() * 2)
+        leftover = self._place(key_hash, key, value)
+        if leftover is not None:
+            self._resize(self.bucket_count() * 2, leftover)
+
+    def _place(self, key_hash, key, value):
+        """Store the given new entry in an empty slot of one of its buckets,
+        evicting entries along a random walk if they are all taken, or else in
+        the stash. Return None, or the (hash, key, value) of the entry left
+        without a place if the stash is full too."""
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        bucket_size = self.bucket_size
+        for _ in range(self.MAX_KICKS):
+            buckets = self._buckets(key_hash)
+            for start in buckets:
+                for index in range(start, start + bucket_size):
+                    if hashes[index] is None:
+                        hashes[index] = key_hash
+                        slot_keys[index] = key
+                        slot_values[index] = value
+                        return None
+            # Evict a random entry from the full buckets and place it next
+            index = (self.random.choice(buckets) +
+                     self.random.randrange(bucket_size))
+            hashes[index], key_hash = key_hash, hashes[index]
+            slot_keys[index], key = key, slot_keys[index]
+            slot_values[index], value = value, slot_values[index]
+        if len(self.stash) < self.stash_size:
+            self.stash.append((key_hash, key, value))
+            return None
+        return (key_hash, key, value)
+
+    def _place_stash(self):
+        """Move stashed entries into empty slots of their buckets, without
+        evicting anything, so the stash has room for later insertions."""
+        stash = self.stash
+        self.stash = []
+        for key_hash, key, value in stash:
+            placed = False
+            for start in self._buckets(key_hash):
+                for index in range(start, start + self.bucket_size):
+                    if self.hashes[index] is None:
+                        self.hashes[index] = key_hash
+                        self.slot_keys[index] = key
+                        self.slot_values[index] = value
+                        placed = True
+                        break
+                if placed:
+                    break
+            if not placed:
+                self.stash.append((key_hash, key, value))
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError.
+        Run time: O(1), or O(n) when the deletion makes the table shrink"""
+        key_hash = hash(key)
+        index = self._find_slot(key, key_hash)
+        if index >= 0:
+            self.hashes[index] = None
+            self.slot_keys[index] = None
+            self.slot_values[index] = None
+            if self.stash:
+                self._place_stash()
+        else:
+            index = self._find_stash(key, key_hash)
+            if index < 0:
+                raise KeyError('Key not found: {}'.format(key))
+            del self.stash[index]
+        self.size -= 1
+        if (self.min_load_factor is not None and
+                self.bucket_count() > self.init_size and
+                self.load_factor() < self.min_load_factor):
+            self._resize(self.bucket_count() // 2)
+
+    def set_many(self, items):
+        """Insert or update every (key, value) pair in the given iterable."""
+        for key, value in items:
+            self.set(key, value)
+
+    def get_many(self, keys):
+        """Return a list of the values associated with the given keys, in
+        order, or raise KeyError if any key is not found."""
+        return [self.get(key) for key in keys]
+
+    def delete_many(self, keys):
+        """Delete every key in the given iterable, or raise KeyError at the
+        first key that is not found (after deleting the keys before it)."""
+        for key in keys:
+            self.delete(key)
+
+    def compact(self):
+        """Shrink this hash table to the fewest buckets (a power of two, but
+        at least the initial number) that keep the load factor at most 0.5.
+        Best and worst case running time: O(c) where c is the number of slots"""
+        bucket_count = self.init_size
+        while bucket_count * self.bucket_size < self.size * 2:
+            bucket_count *= 2
+        if bucket_count < self.bucket_count():
+            self._resize(bucket_count)
+
+    def _resize(self, bucket_count, extra=None):
+        """Move all entries, plus the given extra (hash, key, value) entry if
+        any, into bucket_count new buckets with new hash functions, doubling
+        the number of buckets again until every entry finds a place.
+        Best and worst case running time: O(n) where n is total # of items"""
+        entries = [(slot_hash, self.slot_keys[index], self.slot_values[index])
+                   for index, slot_hash in enumerate(self.hashes)
+                   if slot_hash is not None]
+        entries.extend(self.stash)
+        if extra is not None:
+            entries.append(extra)
+        while True:
+            self._allocate(bucket_count)
+            # Entries that still find no place once slots outnumber entries
+            # 8 to 1 share their full hash with others, which no number of
+            # buckets separates, so let them overflow the stash instead
+            sparse = bucket_count * self.bucket_size >= 8 * len(entries)
+            for entry in entries:
+                leftover = self._place(*entry)
+                if leftover is not None:
+                    if not sparse:
+                        break  # Start over with twice as many buckets
+                    self.stash.append(leftover)
+            else:
+                return
+            bucket_count *= 2
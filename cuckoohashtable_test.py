@@ -0,0 +1,136 @@
+#!python
+
+from cuckoohashtable import CuckooHashTable
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class CollidingKey(object):
+    """Key whose hash is always the same, so all of them share buckets."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.name == other.name
+
+
+class CuckooHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = CuckooHashTable(5, bucket_size=2)
+        assert ht.bucket_count() == 8  # Rounded up to a power of two
+        assert len(ht.hashes) == 16
+        assert ht.size == 0
+        assert ht.length() == 0
+        with self.assertRaises(ValueError):
+            CuckooHashTable(hash_count=1)
+
+    def test_set_and_get(self):
+        ht = CuckooHashTable(seed=1)
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        ht.set('V', 4)  # Update value
+        assert ht.get('I') == 1
+        assert ht.get('V') == 4
+        assert ht.get('X') == 10
+        assert ht.size == 3
+        assert ht.length() == 3
+        assert 'V' in ht
+        assert ht.contains('A') is False
+        with self.assertRaises(KeyError):
+            ht.get('A')
+
+    def test_delete(self):
+        ht = CuckooHashTable(seed=1)
+        ht.set_many([('I', 1), ('V', 5), ('X', 10)])
+        ht.delete('I')
+        ht.delete_many(['X'])
+        assert ht.contains('I') is False
+        assert ht.get_many(['V']) == [5]
+        assert ht.size == 1
+        with self.assertRaises(KeyError):
+            ht.delete('I')
+
+    def test_views(self):
+        ht = CuckooHashTable(seed=1)
+        ht.set_many([('I', 1), ('V', 5)])
+        self.assertCountEqual(ht.keys(), ['I', 'V'])
+        self.assertCountEqual(ht.values(), [1, 5])
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5)])
+        assert len(ht.keys()) == 2
+        self.assertCountEqual(ht, ['I', 'V'])
+
+    def test_many_entries(self):
+        ht = CuckooHashTable(seed=2)
+        for number in range(2000):
+            ht.set(number, number * 2)
+        assert ht.size == ht.length() == 2000
+        assert ht.load_factor() <= ht.max_load_factor
+        for number in range(2000):
+            assert ht.get(number) == number * 2
+        for number in range(0, 2000, 2):
+            ht.delete(number)
+        assert ht.size == ht.length() == 1000
+        for number in range(2000):
+            assert ht.contains(number) is bool(number % 2)
+
+    def test_shrink_and_compact(self):
+        ht = CuckooHashTable(2, seed=3)
+        for number in range(100):
+            ht.set(number, number)
+        grown = ht.bucket_count()
+        for number in range(90):
+            ht.delete(number)
+        assert ht.bucket_count() < grown
+        ht = CuckooHashTable(2, min_load_factor=None, seed=3)
+        for number in range(100):
+            ht.set(number, number)
+        for number in range(95):
+            ht.delete(number)
+        ht.compact()
+        assert ht.bucket_count() == 4
+        self.assertCountEqual(ht.keys(), range(95, 100))
+
+    def test_stash(self):
+        # Keys with equal hashes always share their buckets, so only
+        # hash_count * bucket_size of them fit in slots
+        ht = CuckooHashTable(bucket_size=1, stash_size=2, seed=4)
+        keys = [CollidingKey(name) for name in 'ABCD']
+        for key in keys:
+            ht.set(key, key.name)
+        assert len(ht.stash) == 2
+        for key in keys:
+            assert ht.get(key) == key.name
+        ht.delete(keys[0])  # Frees a slot for a stashed entry
+        assert len(ht.stash) == 1
+        assert ht.size == ht.length() == 3
+        for key in keys[1:]:
+            assert ht.get(key) == key.name
+
+    def test_equal_hashes_overflow_stash(self):
+        ht = CuckooHashTable(bucket_size=2, stash_size=2, seed=6)
+        keys = [CollidingKey(number) for number in range(20)]
+        for key in keys:
+            ht.set(key, key.name)
+        assert ht.size == ht.length() == 20
+        for key in keys:
+            assert ht.get(key) == key.name
+
+    def test_stash_full_grows(self):
+        ht = CuckooHashTable(bucket_size=1, stash_size=0, seed=5)
+        for number in range(500):
+            ht.set(number, number)
+        assert ht.stash == []
+        for number in range(500):
+            assert ht.get(number) == number
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,403 @@
+#!python
+from hashtable import KeysView, ValuesView, ItemsView
+import hashlib
+import io
+import mmap
+import os
+import pickle
+import struct
+import threading
+
+# File layout, all integers little-endian:
+#   header: magic, version, capacity, size, deleted, heap_end
+#   slots:  capacity fixed-width (hash, offset) pairs, where offset points to
+#           a record in the heap, or is EMPTY or DELETED
+#   heap:   records of (key length, value length, key bytes, value bytes)
+HEADER = struct.Struct('<4sIQQQQ')
+HEADER_SIZE = 64
+SLOT = struct.Struct('<QQ')
+RECORD = struct.Struct('<II')
+MAGIC = b'HTMM'
+# Magic written over the header of a file that a rebuild has replaced, so
+# readers that still map it know to open the new file
+MOVED = b'HTMV'
+# Version 2 encodes keys without the pickle memo, see encode_key
+VERSION = 2
+EMPTY = 0  # Offset of a slot that was never used
+DELETED = 1  # Offset of a slot whose entry was deleted
+# Pickle protocol used for keys and values, fixed so equal keys written by
+# different Python versions encode to the same bytes
+PROTOCOL = 2
+
+
+# Each thread's buffer and pickler for encode_key, reused between calls
+_key_encoder = threading.local()
+
+
+def encode(obj):
+    """Return the bytes stored on disk for the given value."""
+    return pickle.dumps(obj, PROTOCOL)
+
+
+def encode_key(key):
+    """Return the bytes stored on disk for the given key, which are the same
+    for all equal keys of the same types. Plain pickling isn't: its memo
+    writes an object repeated within the key as a reference to the first
+    copy, so (a, a) and (a, b) pickle differently even when a == b. Keys are
+    pickled in fast mode, without the memo, so they can't be recursive.
+    Run time: O(k) for a key that pickles to k bytes"""
+    try:
+        buffer = _key_encoder.buffer
+        pickler = _key_encoder.pickler
+    except AttributeError:
+        # Creating a pickler takes longer than pickling a small key
+        buffer = _key_encoder.buffer = io.BytesIO()
+        pickler = _key_encoder.pickler = pickle.Pickler(buffer, PROTOCOL)
+        pickler.fast = True
+    buffer.seek(0)
+    buffer.truncate()
+    pickler.dump(key)
+    return buffer.getvalue()
+
+
+def stable_hash(key_bytes):
+    """Return a 64-bit hash of the given encoded key. Unlike hash(), it is
+    the same in every process, so it can be stored in the file."""
+    return struct.unpack('<Q', hashlib.blake2b(key_bytes,
+                                               digest_size=8).digest())[0]
+
+
+class DiskHashTable(object):
+    """Persistent hash table stored in a memory-mapped file. Slots are fixed
+    width (key hash and record offset) and resolve collisions by linear
+    probing, and keys and values are pickled into an append-only heap.
+    Opening a file only maps it, so it takes O(1) time whatever its size,
+    and every process opening it read-only shares the same page cache.
+    One writer may change the table while readers have it open: readers
+    reread the header before each operation, remap the file when the writer
+    has grown it, and reopen it when the writer has replaced it.
+    Keys are compared by their pickled bytes, so keys that are equal but of
+    different types (such as 1 and 1.0) are different keys here."""
+
+    def __init__(self, path, init_size=8, readonly=False):
+        """Open the hash table stored at the given path, creating it with
+        the given initial number of slots (rounded up to a power of two) if
+        the file does not exist. A readonly table can't be changed."""
+        self.path = path
+        self.readonly = readonly
+        if not os.path.exists(path):
+            if readonly:
+                raise ValueError('No hash table file: {}'.format(path))
+            capacity = 1
+            while capacity < init_size:
+                capacity *= 2
+            self._create(path, capacity)
+        self._open()
+
+    @staticmethod
+    def _create(path, capacity):
+        """Write an empty hash table file with the given number of slots."""
+        slots_end = HEADER_SIZE + capacity * SLOT.size
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, capacity, 0, 0, slots_end))
+            # Unwritten bytes read as zero, so every slot starts out EMPTY
+            file.truncate(slots_end + 4096)
+
+    def _open(self):
+        """Map this hash table's file into memory and read its header."""
+        self.file = open(self.path, 'rb' if self.readonly else 'r+b')
+        self._map()
+        magic, version, capacity, size, deleted, heap_end = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Not a hash table file: {}'.format(self.path))
+        self.capacity = capacity
+        self.size = size
+        self.deleted = deleted
+        self.heap_end = heap_end
+
+    def _map(self):
+        """Map the whole of this hash table's file, as long as it is now."""
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+
+    def _remap(self):
+        """Map this hash table's file again, after it grew past the map."""
+        self.map.close()
+        self._map()
+
+    def _refresh(self):
+        """Pick up the changes a writer made since the last operation of
+        this read-only table: reread the header, remap the file if the heap
+        grew past the map, and reopen it if a rebuild replaced it.
+        Run time: O(1), unless the file has to be remapped or reopened"""
+        magic, _, capacity, size, deleted, heap_end = \
+            HEADER.unpack_from(self.map, 0)
+        if magic == MOVED:
+            self.close()
+            self._open()
+            return
+        self.capacity = capacity
+        self.size = size
+        self.deleted = deleted
+        self.heap_end = heap_end
+        if heap_end > len(self.map):
+            self._remap()
+
+    def close(self):
+        """Unmap and close this hash table's file."""
+        self.map.close()
+        self.file.close()
+
+    def flush(self):
+        """Write all changes to this hash table's file to disk."""
+        self.map.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'DiskHashTable({!r})'.format(self.path)
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        if self.readonly:
+            self._refresh()
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _write_header(self):
+        """Write the cached header fields back to the file."""
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, self.capacity,
+                         self.size, self.deleted, self.heap_end)
+
+    def _check_writable(self):
+        """Raise ValueError if this hash table was opened read-only."""
+        if self.readonly:
+            raise ValueError('Hash table is read-only: {}'.format(self.path))
+
+    def _slot(self, index):
+        """Return the (hash, offset) pair stored in the given slot."""
+        return SLOT.unpack_from(self.map, HEADER_SIZE + index * SLOT.size)
+
+    def _record(self, offset):
+        """Return the (key bytes, value bytes) of the record at the offset."""
+        if offset + RECORD.size > len(self.map):
+            self._remap()  # A writer appended it after the header was read
+        key_length, value_length = RECORD.unpack_from(self.map, offset)
+        start = offset + RECORD.size
+        if start + key_length + value_length > len(self.map):
+            self._remap()
+        return (self.map[start:start + key_length],
+                self.map[start + key_length:start + key_length + value_length])
+
+    def _record_key(self, offset):
+        """Return the key bytes of the record at the given offset."""
+        if offset + RECORD.size > len(self.map):
+            self._remap()  # A writer appended it after the header was read
+        key_length = RECORD.unpack_from(self.map, offset)[0]
+        start = offset + RECORD.size
+        if start + key_length > len(self.map):
+            self._remap()
+        return self.map[start:start + key_length]
+
+    def _find_slot(self, key_bytes, key_hash):
+        """Return the slot index holding the given encoded key, or -1.
+        Run time: O(1) on average, the load factor is kept below 0.75"""
+        mask = self.capacity - 1
+        index = key_hash & mask
+        while True:
+            slot_hash, offset = self._slot(index)
+            if offset == EMPTY:
+                return -1
+            if (offset != DELETED and slot_hash == key_hash and
+                    self._record_key(offset) == key_bytes):
+                return index
+            index = (index + 1) & mask
+
+    def _iter_records(self):
+        """Generate the (key bytes, value bytes) of each entry."""
+        if self.readonly:
+            self._refresh()
+        for index in range(self.capacity):
+            offset = self._slot(index)[1]
+            if offset != EMPTY and offset != DELETED:
+                yield self._record(offset)
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        for key_bytes, _ in self._iter_records():
+            yield pickle.loads(key_bytes)
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        for _, value_bytes in self._iter_records():
+            yield pickle.loads(value_bytes)
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        for key_bytes, value_bytes in self._iter_records():
+            yield (pickle.loads(key_bytes), pickle.loads(value_bytes))
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it where c is the
+        number of slots"""
+        return KeysView(self)
+
+    def values(self):
+        """Return a live view of all values in this hash table."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return a live view of all entries (key-value pairs)."""
+        return ItemsView(self)
+
+    def load_factor(self):
+        """Return the load factor, the ratio of number of entries to slots."""
+        if self.readonly:
+            self._refresh()
+        return float(self.size) / self.capacity
+
+    def length(self):
+        """Return the number of key-value entries by traversing its slots.
+        Run time: O(c) where c is the number of slots"""
+        return sum(1 for _ in self._iter_records())
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) on average"""
+        if self.readonly:
+            self._refresh()
+        key_bytes = encode_key(key)
+        return self._find_slot(key_bytes, stable_hash(key_bytes)) >= 0
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) on average, plus unpickling the value"""
+        if self.readonly:
+            self._refresh()
+        key_bytes = encode_key(key)
+        index = self._find_slot(key_bytes, stable_hash(key_bytes))
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        return pickle.loads(self._record(self._slot(index)[1])[1])
+
+    def set(self, key, value=None):
+        """Insert or update the given key with its associated value. The old
+        record of an updated key stays in the heap until compact is called.
+        Run time: O(1) on average, O(n) when the slots have to grow"""
+        self._check_writable()
+        key_bytes = encode_key(key)
+        self._set_record(stable_hash(key_bytes), key_bytes, encode(value))
+        self._write_header()
+
+    def _set_record(self, key_hash, key_bytes, value_bytes):
+        """Insert or update the given encoded entry, growing first if a new
+        entry would push the load factor (counting deleted slots) past 0.75."""
+        if self.size + self.deleted + 1 > self.capacity * 0.75:
+            if (self.size + 1) * 2 > self.capacity * 0.75:
+                self._rebuild(self.capacity * 2)
+            else:  # Mostly deleted slots, so reclaim them at the same size
+                self._rebuild(self.capacity)
+        offset = self._append_record(key_bytes, value_bytes)
+        mask = self.capacity - 1
+        index = key_hash & mask
+        free = -1  # First deleted slot seen along the probe sequence
+        while True:
+            slot_hash, slot_offset = self._slot(index)
+            if slot_offset == EMPTY:
+                break
+            if slot_offset == DELETED:
+                if free < 0:
+                    free = index
+            elif (slot_hash == key_hash and
+                  self._record_key(slot_offset) == key_bytes):
+                # Key already present, so point its slot at the new record
+                SLOT.pack_into(self.map, HEADER_SIZE + index * SLOT.size,
+                               key_hash, offset)
+                return
+            index = (index + 1) & mask
+        if free >= 0:
+            index = free
+            self.deleted -= 1
+        SLOT.pack_into(self.map, HEADER_SIZE + index * SLOT.size,
+                       key_hash, offset)
+        self.size += 1
+
+    def _append_record(self, key_bytes, value_bytes):
+        """Write a record to the end of the heap and return its offset,
+        doubling the file first if the record does not fit."""
+        offset = self.heap_end
+        end = offset + RECORD.size + len(key_bytes) + len(value_bytes)
+        if end > len(self.map):
+            new_length = max(end, len(self.map) * 2)
+            self.map.close()
+            self.file.truncate(new_length)
+            self._map()
+        RECORD.pack_into(self.map, offset, len(key_bytes), len(value_bytes))
+        start = offset + RECORD.size
+        self.map[start:end] = key_bytes + value_bytes
+        self.heap_end = end
+        return offset
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError.
+        Run time: O(1) on average"""
+        self._check_writable()
+        key_bytes = encode_key(key)
+        key_hash = stable_hash(key_bytes)
+        index = self._find_slot(key_bytes, key_hash)
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        SLOT.pack_into(self.map, HEADER_SIZE + index * SLOT.size,
+                       key_hash, DELETED)
+        self.size -= 1
+        self.deleted += 1
+        self._write_header()
+
+    def compact(self):
+        """Rewrite this hash table's file without deleted slots or records
+        of deleted and updated entries. Run time: O(n + c)"""
+        self._check_writable()
+        capacity = 8
+        while capacity * 0.75 < self.size * 2:
+            capacity *= 2
+        self._rebuild(capacity)
+
+    def _rebuild(self, capacity):
+        """Copy every entry into a new file with the given number of slots,
+        using the stored hashes, then replace this hash table's file with it.
+        The old file's header is then marked as moved, so readers that still
+        map it reopen the new file."""
+        temp_path = self.path + '.tmp'
+        self._create(temp_path, capacity)
+        new_table = DiskHashTable(temp_path)
+        for index in range(self.capacity):
+            key_hash, offset = self._slot(index)
+            if offset != EMPTY and offset != DELETED:
+                key_bytes, value_bytes = self._record(offset)
+                new_table._set_record(key_hash, key_bytes, value_bytes)
+        new_table._write_header()
+        new_table.close()
+        os.replace(temp_path, self.path)
+        self.map[0:len(MOVED)] = MOVED
+        self.close()
+        self._open()
@@ -0,0 +1,159 @@
+#!python
+
+from diskhashtable import DiskHashTable
+import os
+import shutil
+import tempfile
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class DiskHashTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'table.htmm')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_init(self):
+        with DiskHashTable(self.path, 5) as ht:
+            assert ht.capacity == 8
+            assert ht.size == 0
+            assert ht.length() == 0
+        with self.assertRaises(ValueError):
+            DiskHashTable(os.path.join(self.folder, 'missing'), readonly=True)
+
+    def test_set_get_and_delete(self):
+        with DiskHashTable(self.path) as ht:
+            ht.set('I', 1)
+            ht.set('V', 4)
+            ht.set('V', 5)  # Update value
+            ht.set(('X', 10), {'nested': [1, 2]})
+            assert ht.get('I') == 1
+            assert ht.get('V') == 5
+            assert ht.get(('X', 10)) == {'nested': [1, 2]}
+            assert ht.contains('V') is True
+            assert 'A' not in ht
+            assert len(ht) == 3
+            with self.assertRaises(KeyError):
+                ht.get('A')
+            ht.delete('I')
+            assert ht.contains('I') is False
+            with self.assertRaises(KeyError):
+                ht.delete('I')
+            self.assertCountEqual(ht.items(), [('V', 5),
+                                               (('X', 10), {'nested': [1, 2]})])
+
+    def test_persists_after_reopen(self):
+        with DiskHashTable(self.path) as ht:
+            for number in range(1000):
+                ht.set(number, str(number) * 10)
+            for number in range(0, 1000, 2):
+                ht.delete(number)
+            assert ht.capacity == 2048
+        with DiskHashTable(self.path, readonly=True) as ht:
+            assert ht.size == ht.length() == 500
+            assert ht.get(999) == '999' * 10
+            assert ht.contains(998) is False
+            with self.assertRaises(ValueError):
+                ht.set('I', 1)
+            with self.assertRaises(ValueError):
+                ht.delete(999)
+
+    def test_readers_share_file(self):
+        writer = DiskHashTable(self.path)
+        writer.set('I', 1)
+        writer.flush()
+        reader = DiskHashTable(self.path, readonly=True)
+        assert reader.get('I') == 1
+        reader.close()
+        writer.close()
+
+    def test_reader_sees_writer_grow_file(self):
+        writer = DiskHashTable(self.path, init_size=1024)
+        reader = DiskHashTable(self.path, readonly=True)
+        mapped = len(reader.map)
+        for number in range(300):
+            writer.set(number, str(number) * 10)
+        assert len(writer.map) > mapped  # The heap grew past the reader's map
+        assert reader.get(299) == '299' * 10
+        assert len(reader) == reader.length() == 300
+        assert 150 in reader
+        reader.close()
+        writer.close()
+
+    def test_reader_views_see_writer(self):
+        writer = DiskHashTable(self.path)
+        reader = DiskHashTable(self.path, readonly=True)
+        keys = reader.keys()
+        assert len(keys) == 0
+        writer.set('I', 1)
+        writer.set('V', 5)
+        writer.flush()
+        assert len(keys) == len(reader.items()) == 2
+        reader.close()
+        writer.close()
+
+    def test_reader_sees_writer_rebuild(self):
+        writer = DiskHashTable(self.path)
+        writer.set('I', 1)
+        reader = DiskHashTable(self.path, readonly=True)
+        assert reader.get('I') == 1
+        for number in range(100):
+            writer.set(number, number)  # Rebuilds into a new file
+        writer.delete('I')
+        assert writer.capacity > reader.capacity
+        assert reader.get(99) == 99
+        assert reader.contains('I') is False
+        assert len(reader) == 100
+        reader.close()
+        writer.close()
+
+    def test_equal_keys_sharing_objects(self):
+        # Equal strings that are different objects, so plain pickling of a
+        # tuple repeating one of them differs from a tuple holding both
+        first = ''.join(['ab', 'cd'])
+        second = ''.join(['ab', 'cd'])
+        with DiskHashTable(self.path) as ht:
+            ht.set((first, first), 1)
+            assert ht.contains((first, second)) is True
+            assert ht.get((second, first)) == 1
+            ht.set((second, second), 2)
+            assert len(ht) == 1
+            assert ht.get((first, first)) == 2
+
+    def test_compact(self):
+        with DiskHashTable(self.path) as ht:
+            for number in range(100):
+                ht.set(number, number)
+                ht.set(number, -number)  # Leaves the first record unused
+            for number in range(90):
+                ht.delete(number)
+            size_before = os.path.getsize(self.path)
+            ht.compact()
+            assert os.path.getsize(self.path) < size_before
+            assert ht.deleted == 0
+            assert ht.capacity == 32
+            self.assertCountEqual(ht.items(),
+                                  [(n, -n) for n in range(90, 100)])
+
+    def test_churn_does_not_grow(self):
+        with DiskHashTable(self.path) as ht:
+            for number in range(200):
+                ht.set(number)
+                ht.delete(number)
+            assert ht.capacity == 8
+
+    def test_not_a_table(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'x' * 100)
+        with self.assertRaises(ValueError):
+            DiskHashTable(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,270 @@
 #!python
 from linkedlist import LinkedList # from folder.filename import Class
+from array import array
+import gc
+import pickle
+import random
+import struct
+import sys
+import time
+
+# Snapshot file layout, all integers little-endian:
+#   header:   magic, version, flags, entry count, hash of SNAPSHOT_CANARY
+#   hashes:   entry count signed 64-bit key hashes
+#   payloads: for each entry, the length and pickled bytes of its key, then
+#             of its value unless the SNAPSHOT_VALUES flag is not set
+SNAPSHOT_HEADER = struct.Struct('<4sHHQq')
+SNAPSHOT_LENGTH = struct.Struct('<I')
+SNAPSHOT_MAGIC = b'HTSN'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_VALUES = 1  # Flag set unless every value is None, as in a Set
+# String hashes differ between processes unless PYTHONHASHSEED is fixed, so
+# stored hashes are only reused if this canary still hashes the same
+SNAPSHOT_CANARY = 'HashTable snapshot canary'
+# Types whose hash depends only on their value, so a stored hash of one of
+# them is still right if the canary is. Others, like None before Python 3.12,
+# tuples holding them, and objects with the default __hash__, are hashed by
+# identity and get a new hash in every process, so they are hashed again
+SNAPSHOT_VALUE_HASHED = frozenset([str, bytes, int, float, bool])
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+MASK63 = 0x7FFFFFFFFFFFFFFF
+
+
+def round_up_power_of_two(number):
+    """Return the smallest power of two that is at least the given number."""
+    power = 1
+    while power < number:
+        power *= 2
+    return power
+
+
+class KeyedHash(object):
+    """Hash function that scrambles hash(key) with a secret random seed.
+    Tables index buckets by the low bits of a key's hash, and hash() of an
+    integer is the integer itself, so structured keys such as multiples of
+    the number of buckets all land in the same bucket. Passing the hash
+    through a seeded mixer spreads them out, and since the seed is unknown
+    outside this process, nobody can pick keys that collide on purpose,
+    except keys whose hash() is already equal."""
+
+    def __init__(self, seed=None):
+        """Initialize this hash function with the given 64-bit seed, or with
+        a random one if seed is None."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed & MASK64
+
+    def __repr__(self):
+        """Return a string representation of this hash function."""
+        return 'KeyedHash({!r})'.format(self.seed)
+
+    def __call__(self, key):
+        """Return a non-negative 63-bit hash of the given key.
+        Run time: O(1) plus hash(key)"""
+        return self.mix(hash(key))
+
+    def mix(self, key_hash):
+        """Return a non-negative 63-bit hash scrambled from the given hash,
+        using the 64-bit finalizer of MurmurHash3 so every bit of the seeded
+        hash affects every bit of the result. Run time: O(1)"""
+        mixed = (key_hash ^ self.seed) & MASK64
+        mixed = ((mixed ^ (mixed >> 33)) * 0xFF51AFD7ED558CCD) & MASK64
+        mixed = ((mixed ^ (mixed >> 33)) * 0xC4CEB9FE1A85EC53) & MASK64
+        return (mixed ^ (mixed >> 33)) & MASK63
+
+
+class Entry(object):
+    """A key-value entry stored in a hash table bucket. The full hash of the
+    key is stored with it, so resizing never has to hash the key again and
+    lookups can skip entries whose hash differs without comparing keys."""
+
+    __slots__ = ('key', 'value', 'hash')
+
+    def __init__(self, key, value, key_hash):
+        """Initialize this entry with the given key, value and key hash."""
+        self.key = key
+        self.value = value
+        self.hash = key_hash
+
+    def __repr__(self):
+        """Return a string representation of this entry."""
+        return 'Entry({!r}, {!r})'.format(self.key, self.value)
+
+
+class TableView(object):
+    """Live view of a hash table's keys, values or items. Iterating a view
+    streams the entries straight out of the table, so it needs O(1) extra
+    memory, and always reflects the table's current contents. Changing the
+    table while iterating one of its views may skip or repeat entries."""
+
+    def __init__(self, table):
+        """Initialize this view of the given hash table."""
+        self.table = table
+
+    def __len__(self):
+        """Return the number of entries in the viewed hash table, through its
+        own __len__ so tables shared with other processes catch up first."""
+        return len(self.table)
+
+    def __repr__(self):
+        """Return a string representation of this view."""
+        return '{}({!r})'.format(type(self).__name__, list(self))
+
+
+class KeysView(TableView):
+
+    def __iter__(self):
+        """Generate each key in the viewed hash table."""
+        return self.table._iter_keys()
+
+    def __contains__(self, key):
+        """Return True if the viewed hash table contains the given key.
+        Run time: O(1) on average, it is a hash table lookup"""
+        return self.table.contains(key)
+
+
+class ValuesView(TableView):
+
+    def __iter__(self):
+        """Generate each value in the viewed hash table."""
+        return self.table._iter_values()
+
+
+class ItemsView(TableView):
+
+    def __iter__(self):
+        """Generate each (key, value) pair in the viewed hash table."""
+        return self.table._iter_items()
+
+    def __contains__(self, item):
+        """Return True if the viewed hash table contains the given key with
+        the given value. Run time: O(1) on average"""
+        key, value = item
+        return self.table.contains(key) and self.table.get(key) == value
+
+
+def object_bytes(obj):
+    """Return the number of bytes used by the given object and its __dict__,
+    but not by the objects it refers to."""
+    nbytes = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        nbytes += sys.getsizeof(obj.__dict__)
+    return nbytes
+
+
+class HashTableStats(object):
+    """Counters describing how a hash table behaves: the distribution of
+    chain lengths (or probe lengths) seen by lookups, resizes and bytes
+    allocated. A table only collects them when given a HashTableStats, so
+    tables without one pay a single attribute check per operation."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.lookups = 0
+        # Histogram mapping each chain or probe length to # of lookups
+        self.probe_lengths = {}
+        self.longest = 0  # Longest chain or probe length seen
+        self.longest_hits = 0  # Number of lookups that saw the longest
+        self.resizes = 0
+        self.resize_seconds = 0.0  # Total time spent resizing
+        self.max_resize_seconds = 0.0  # Time of the slowest resize
+        self.bytes_allocated = 0  # Estimated bytes of buckets and entries
+
+    def __repr__(self):
+        """Return a string representation of these stats."""
+        return 'HashTableStats({!r})'.format(self.snapshot())
+
+    def record_lookup(self, length):
+        """Record a lookup that visited a chain of the given length or
+        probed the given number of slots. Run time: O(1)"""
+        self.lookups += 1
+        self.probe_lengths[length] = self.probe_lengths.get(length, 0) + 1
+        if length > self.longest:
+            self.longest = length
+            self.longest_hits = 1
+        elif length == self.longest:
+            self.longest_hits += 1
+
+    def record_resize(self, seconds, nbytes):
+        """Record a resize that took the given time and allocated the given
+        number of bytes. Run time: O(1)"""
+        self.resizes += 1
+        self.resize_seconds += seconds
+        self.max_resize_seconds = max(self.max_resize_seconds, seconds)
+        self.bytes_allocated += nbytes
+
+    def record_allocation(self, nbytes):
+        """Record the given number of bytes allocated for an entry."""
+        self.bytes_allocated += nbytes
+
+    def mean_probe_length(self):
+        """Return the average chain or probe length seen by lookups."""
+        if self.lookups == 0:
+            return 0.0
+        total = sum(length * count
+                    for length, count in self.probe_lengths.items())
+        return float(total) / self.lookups
+
+    def snapshot(self):
+        """Return a dict holding a copy of all counters."""
+        return {'lookups': self.lookups,
+                'probe_lengths': dict(self.probe_lengths),
+                'mean_probe_length': self.mean_probe_length(),
+                'longest': self.longest,
+                'longest_hits': self.longest_hits,
+                'resizes': self.resizes,
+                'resize_seconds': self.resize_seconds,
+                'max_resize_seconds': self.max_resize_seconds,
+                'bytes_allocated': self.bytes_allocated}
+
+    def reset(self):
+        """Set all counters back to zero."""
+        self.__init__()
+
 
 class HashTable(object):
 
-    def __init__(self, init_size=8):
-        """Initialize this hash table with the given initial size."""
+    # Class of the entries stored in buckets, which subclasses can extend
+    entry_class = Entry
+
+    # Number of old buckets moved to the new bucket list per operation while
+    # an incremental resize is in progress
+    MIGRATE_STEP = 4
+
+    def __init__(self, init_size=8, incremental=False, min_load_factor=0.25,
+                 iterable=None, stats=None, hash_func=None):
+        """Initialize this hash table with the given initial size and insert
+        the given (key, value) pairs, if any, with a single resize.
+        If incremental is True, resizing moves a few buckets at a time on each
+        operation instead of rehashing every entry at once, so no single call
+        stalls for O(n) time.
+        When a deletion drops the load factor below min_load_factor, the number
+        of buckets is halved, but never below init_size. Halving at 0.25 leaves
+        a load factor below 0.5, far enough from the 0.75 growth threshold that
+        alternating inserts and deletes don't resize back and forth.
+        Pass min_load_factor=None to never shrink automatically.
+        Pass a HashTableStats as stats to record lookups and resizes in it.
+        The number of buckets is always a power of two (init_size is rounded
+        up to one), so a bucket is picked by masking the low bits of a key's
+        hash instead of dividing. Keys are hashed with hash_func, which
+        defaults to hash(); pass a KeyedHash to resist hash flooding."""
+        init_size = round_up_power_of_two(init_size)
         self.buckets = [LinkedList() for _ in range(init_size)]
         self.size = 0  # Number of key-value entries
+        self.hash_func = hash if hash_func is None else hash_func
+        self.stats = stats
+        if stats is not None:
+            stats.record_allocation(self._buckets_bytes(init_size))
+        self.init_size = init_size  # Fewest buckets shrinking will leave
+        self.min_load_factor = min_load_factor
+        self.incremental = incremental
+        # Buckets not yet moved by an incremental resize, or None if idle
+        self.old_buckets = None
+        self.migrated = 0  # Number of old buckets already moved
+        # Insert the given entries
+        if iterable is not None:
+            self.set_many(iterable)
 
     def __str__(self):
         """Return a formatted string representation of this hash table."""
@@ -15,11 +273,79 @@ class HashTable(object):
 
     def __repr__(self):
         """Return a string representation of this hash table."""
-        return 'HashTable({!r})'.format(self.items())
+        return 'HashTable({!r})'.format(list(self.items()))
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
 
     def _bucket_index(self, key):
         """Return the bucket index where the given key would be stored."""
-        return hash(key) % len(self.buckets)
+        return self.hash_func(key) & (len(self.buckets) - 1)
+
+    def _bucket(self, key_hash):
+        """Return the bucket a key with the given hash is stored in right now,
+        which is an old bucket if an incremental resize has not moved it yet."""
+        if self.old_buckets is not None:
+            index = key_hash & (len(self.old_buckets) - 1)
+            if index >= self.migrated:
+                return self.old_buckets[index]
+            return self._new_bucket(key_hash & (len(self.buckets) - 1))
+        return self.buckets[key_hash & (len(self.buckets) - 1)]
+
+    def _new_bucket(self, index):
+        """Return the new bucket at the given index during an incremental
+        resize, creating it first if it has not been created yet."""
+        bucket = self.buckets[index]
+        if bucket is None:
+            bucket = self.buckets[index] = LinkedList()
+        return bucket
+
+    def _buckets_bytes(self, count):
+        """Return the number of bytes used by a list of count empty buckets."""
+        return sys.getsizeof(self.buckets) + count * object_bytes(LinkedList())
+
+    def _live_buckets(self):
+        """Return a list of all buckets that may hold entries."""
+        if self.old_buckets is None:
+            return self.buckets
+        return ([bucket for bucket in self.buckets if bucket is not None] +
+                self.old_buckets[self.migrated:])
+
+    def _iter_entries(self):
+        """Generate each entry in this hash table, bucket by bucket.
+        An incremental resize in progress is finished first, so that lookups
+        made while iterating don't move entries that were not reached yet."""
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+        for bucket in self.buckets:
+            node = bucket.head
+            while node is not None:
+                yield node.data
+                node = node.next
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        for entry in self._iter_entries():
+            yield entry.key
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        for entry in self._iter_entries():
+            yield entry.value
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        for entry in self._iter_entries():
+            yield (entry.key, entry.value)
 
     def load_factor(self):
         """Return the load factor, the ratio of number of entries to buckets.
@@ -29,35 +355,25 @@ class HashTable(object):
         return float(self.size) / len(self.buckets)
 
     def keys(self):
-        """Return a list of all keys in this hash table.
-        Best and worst case running time: O(n) where n is number of buckets"""
-        all_keys = []
-        for bucket in self.buckets:
-            for key, _ in bucket.items():
-                all_keys.append(key)
-        return all_keys
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(n + b) to iterate it where n is
+        total # of items and b is # of buckets"""
+        return KeysView(self)
 
     def values(self):
-        """Return a list of all values in this hash table.
-        Run time: O(n) where n is total # of items."""
-        all_values = []
-        for bucket in self.buckets:
-            for _, value in bucket.items():
-                all_values.append(value)
-        return all_values
+        """Return a live view of all values in this hash table.
+        Run time: O(1) to create the view, O(n + b) to iterate it"""
+        return ValuesView(self)
 
     def items(self):
-        """Return a list of all entries (key-value pairs) in this hash table.
-        Run-time is O(n), where n is the total # of items"""
-        all_items = []
-        for bucket in self.buckets:
-            all_items.extend(bucket.items())
-        return all_items
+        """Return a live view of all entries (key-value pairs) in this hash
+        table. Run time: O(1) to create the view, O(n + b) to iterate it"""
+        return ItemsView(self)
 
     def length(self):
         """Return the number of key-value entries by traversing its buckets.
         Run-time is O(b) where b is # of buckets, because .size is O(1)"""
-        return sum(bucket.size for bucket in self.buckets)
+        return sum(bucket.size for bucket in self._live_buckets())
 
     def contains(self, key):
         """Return True if this hash table contains the given key, or False.
@@ -66,12 +382,10 @@ class HashTable(object):
         - O(l) where l is the load factor.
         As size of hashtable increases, we will reach O(1), the # of elements
         per linkedlist will decrease"""
-        # Find the bucket the given key belongs in
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
-        # Check if an entry with the given key exists in that bucket
-        entry = bucket.find(lambda key_value: key_value[0] == key)
-        return entry is not None  # True or False
+        if self.old_buckets is not None:
+            self._migrate(self.MIGRATE_STEP)
+        # Check if an entry with the given key exists
+        return self._find(key) is not None  # True or False
 
     def get(self, key):
         """Return the value associated with the given key, or raise KeyError.
@@ -80,19 +394,26 @@ class HashTable(object):
         - O(l) where l is the load factor.
         As size of hashtable increases, we will reach O(1), the # of elements
         per linkedlist will decrease"""
-        # Find the bucket the given key belongs in
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
-        # Find the entry with the given key in that bucket, if one exists
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        if self.old_buckets is not None:
+            self._migrate(self.MIGRATE_STEP)
+        # Find the entry with the given key, if one exists
+        entry = self._find(key)
         if entry is not None:  # Found
             # Return the given key's associated value
-            assert isinstance(entry, tuple)
-            assert len(entry) == 2
-            return entry[1]
+            return entry.value
         else:  # Not found
             raise KeyError('Key not found: {}'.format(key))
 
+    def _find(self, key):
+        """Return the entry with the given key, or None if not found."""
+        # Find the bucket the given key belongs in
+        key_hash = self.hash_func(key)
+        bucket = self._bucket(key_hash)
+        if self.stats is not None:
+            self.stats.record_lookup(bucket.size)
+        # Find the entry with the given key in that bucket, if one exists
+        return bucket.find_key(key, key_hash)
+
     def set(self, key, value=None):
         """Insert or update the given key with its associated value.
         Run time:
@@ -100,26 +421,38 @@ class HashTable(object):
         - O(l) where l is the load factor.
         As size of hashtable increases, we will reach O(1), the # of elements
         per linkedlist will decrease"""
-        # Find the bucket the given key belongs in
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
-        # Find the entry with the given key in that bucket, if one exists
-        # Check if an entry with the given key exists in that bucket
-        entry = bucket.find(lambda key_value: key_value[0] == key)
-        if entry is not None:  # Found
-            # In this case, the given key's value is being updated
-            # Remove the old key-value entry from the bucket first
-            bucket.delete(entry)
-        # Case: entry is not found, increase size of our hash table
-        else:
-            self.size += 1
-        # Insert the new key-value entry into the bucket in either case
-        bucket.append((key, value))
+        if self.old_buckets is not None:
+            self._migrate(self.MIGRATE_STEP)
+        self._insert(key, value)
         # Check if the load factor exceeds a threshold such as 0.75
         if self.load_factor() > 0.75:
             # If so, resize the hash_table to reduce the load factor
             self._resize()
 
+    def _insert(self, key, value):
+        """Insert or update the given key with its associated value and return
+        its entry, without checking whether the buckets need to grow."""
+        # Find the bucket the given key belongs in
+        key_hash = self.hash_func(key)
+        bucket = self._bucket(key_hash)
+        if self.stats is not None:
+            self.stats.record_lookup(bucket.size)
+        # Find the entry with the given key in that bucket, if one exists
+        # Check if an entry with the given key exists in that bucket
+        entry = bucket.find_key(key, key_hash)
+        if entry is not None:  # Found
+            # In this case, the given key's value is updated in place
+            entry.value = value
+            return entry
+        # Case: entry is not found, insert a new entry and increase size
+        entry = self.entry_class(key, value, key_hash)
+        bucket.append(entry)
+        self.size += 1
+        if self.stats is not None:
+            self.stats.record_allocation(object_bytes(entry) +
+                                         object_bytes(bucket.tail))
+        return entry
+
     def delete(self, key):
         """Delete the given key and its associated value, or raise KeyError.
         Run time:
@@ -127,11 +460,21 @@ class HashTable(object):
         - O(l) where l is the load factor.
         As size of hashtable increases, we will reach O(1), the # of elements
         per linkedlist will decrease"""
+        if self.old_buckets is not None:
+            self._migrate(self.MIGRATE_STEP)
+        self._remove(key)
+        self._shrink()
+
+    def _remove(self, key):
+        """Delete the given key and its associated value, or raise KeyError,
+        without checking whether the buckets should shrink."""
         # Find the bucket the given key belongs in
-        index = self._bucket_index(key)
-        bucket = self.buckets[index]
+        key_hash = self.hash_func(key)
+        bucket = self._bucket(key_hash)
+        if self.stats is not None:
+            self.stats.record_lookup(bucket.size)
         # Find the entry with the given key in that bucket, if one exists
-        entry = bucket.find(lambda key_value: key_value[0] == key)
+        entry = bucket.find_key(key, key_hash)
         if entry is not None:  # Found
             # Remove the key-value entry from the bucket
             bucket.delete(entry)
@@ -139,6 +482,179 @@ class HashTable(object):
         else:  # Not found
             raise KeyError('Key not found: {}'.format(key))
 
+    def _shrink(self):
+        """Halve the number of buckets until the load factor is no longer
+        below the low-water mark or init_size is reached, unless an
+        incremental resize is still moving entries."""
+        if self.min_load_factor is None or self.old_buckets is not None:
+            return
+        new_size = len(self.buckets)
+        while (new_size // 2 >= self.init_size and
+               self.size < self.min_load_factor * new_size):
+            new_size //= 2
+        if new_size < len(self.buckets):
+            # Resize to give the memory of the emptied buckets back
+            self._resize(new_size)
+
+    def _reserve(self, count):
+        """Grow the buckets once to fit count more entries, instead of
+        doubling repeatedly as the load factor is crossed, and finish any
+        incremental resize in one go, as bulk operations do."""
+        needed = self.size + count  # Upper bound if keys are repeated
+        new_size = len(self.buckets)
+        while needed > new_size * 0.75:
+            new_size *= 2
+        if new_size > len(self.buckets):
+            self._resize(new_size)
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+
+    def set_many(self, items):
+        """Insert or update every (key, value) pair in the given iterable.
+        The buckets are grown once up front to fit all of the pairs, instead
+        of doubling repeatedly as the load factor is crossed.
+        Run time: O(n + m) where m is the number of pairs given"""
+        if not isinstance(items, (list, tuple)):
+            items = list(items)  # Count the pairs before inserting them
+        self._reserve(len(items))
+        for key, value in items:
+            self._insert(key, value)
+
+    def get_many(self, keys):
+        """Return a list of the values associated with the given keys, in the
+        same order, or raise KeyError if any key is not found.
+        Run time: O(m * l) where m is the number of keys given"""
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+        values = []
+        for key in keys:
+            entry = self._find(key)
+            if entry is None:
+                raise KeyError('Key not found: {}'.format(key))
+            values.append(entry.value)
+        return values
+
+    def delete_many(self, keys):
+        """Delete the given keys and their associated values, or raise KeyError
+        at the first key not found. The buckets are shrunk at most once, after
+        all of the keys have been deleted.
+        Run time: O(n + m * l) where m is the number of keys given"""
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+        try:
+            for key in keys:
+                self._remove(key)
+        finally:
+            self._shrink()
+
+    def dump(self, fp):
+        """Write a snapshot of this hash table to the given binary file.
+        Entries are collected in one pass, so the header counts exactly the
+        entries written even if iterating again would give others, and are
+        then streamed out one at a time after a header and an array of their
+        hashes, so their keys and values are never copied in memory.
+        Run time: O(n + b)"""
+        entries = list(self._iter_entries())
+        hashes = array('q')
+        has_values = False
+        for entry in entries:
+            hashes.append(entry.hash)
+            has_values = has_values or entry.value is not None
+        if sys.byteorder == 'big':
+            hashes.byteswap()
+        flags = SNAPSHOT_VALUES if has_values else 0
+        fp.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags,
+                                      len(hashes),
+                                      self.hash_func(SNAPSHOT_CANARY)))
+        fp.write(hashes.tobytes())
+        for entry in entries:
+            key_bytes = pickle.dumps(entry.key, pickle.HIGHEST_PROTOCOL)
+            fp.write(SNAPSHOT_LENGTH.pack(len(key_bytes)))
+            fp.write(key_bytes)
+            if has_values:
+                value_bytes = pickle.dumps(entry.value,
+                                           pickle.HIGHEST_PROTOCOL)
+                fp.write(SNAPSHOT_LENGTH.pack(len(value_bytes)))
+                fp.write(value_bytes)
+
+    @classmethod
+    def load(cls, fp, hash_func=None):
+        """Return a new hash table read from a snapshot in the given binary
+        file, hashing keys with the given hash_func (hash() if None). The
+        buckets are sized for every entry up front, and entries are appended
+        straight to their buckets. Stored hashes are reused for keys of types
+        hashed by value, unless the snapshot was written with a hash function
+        that gives other hashes, and other keys are hashed again.
+        Run time: O(n)"""
+        header = fp.read(SNAPSHOT_HEADER.size)
+        if len(header) < SNAPSHOT_HEADER.size:
+            raise ValueError('Snapshot is truncated')
+        magic, version, flags, count, canary = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError('Not a hash table snapshot')
+        hashes = array('q')
+        hashes.frombytes(fp.read(count * hashes.itemsize))
+        if len(hashes) < count:
+            raise ValueError('Snapshot is truncated')
+        if sys.byteorder == 'big':
+            hashes.byteswap()
+        if hash_func is None:
+            hash_func = hash
+        # Loading allocates millions of objects that can't form reference
+        # cycles, so pause the garbage collector instead of letting those
+        # allocations trigger full collections over and over
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            table = cls()
+            table.hash_func = hash_func
+            same_hashes = canary == hash_func(SNAPSHOT_CANARY)
+            new_size = len(table.buckets)
+            while count > new_size * 0.75:
+                new_size *= 2
+            if new_size > len(table.buckets):
+                table._resize(new_size)
+            buckets = table.buckets
+            for index in range(count):
+                key = pickle.loads(cls._read_payload(fp))
+                value = None
+                if flags & SNAPSHOT_VALUES:
+                    value = pickle.loads(cls._read_payload(fp))
+                if same_hashes and type(key) in SNAPSHOT_VALUE_HASHED:
+                    key_hash = hashes[index]
+                else:
+                    key_hash = hash_func(key)
+                buckets[key_hash & (new_size - 1)].append(
+                    table.entry_class(key, value, key_hash))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        table.size = count
+        return table
+
+    @staticmethod
+    def _read_payload(fp):
+        """Read one length-prefixed payload from the given snapshot file."""
+        length_bytes = fp.read(SNAPSHOT_LENGTH.size)
+        if len(length_bytes) < SNAPSHOT_LENGTH.size:
+            raise ValueError('Snapshot is truncated')
+        length = SNAPSHOT_LENGTH.unpack(length_bytes)[0]
+        payload = fp.read(length)
+        if len(payload) < length:
+            raise ValueError('Snapshot is truncated')
+        return payload
+
+    def compact(self):
+        """Shrink this hash table's buckets to the fewest (a power of two) that
+        keep the load factor at most 0.5 (but at least init_size), and finish any
+        incremental resize in progress so all old buckets are released.
+        Best and worst case running time: O(n) where n is total # of items"""
+        new_size = round_up_power_of_two(max(self.init_size, self.size * 2))
+        if new_size < len(self.buckets):
+            self._resize(new_size)
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+
     def _resize(self, new_size=None):
         """Resize this hash table's buckets and rehash all key-value entries.
         Should be called automatically when load factor exceeds a threshold
@@ -146,23 +662,400 @@ class HashTable(object):
         Best and worst case running time: O(n) where n is total # of items,
         because we need to rehash every item in the hash_table once the # of buckets changes
         Best and worst case space usage: O(2n) == O(n) where n is total # of items,
-        because we need to rehash every item in the hash_table once the # of buckets changes"""
+        because we need to rehash every item in the hash_table once the # of buckets changes
+        In incremental mode this only swaps in the new buckets in O(b) time,
+        and the entries are moved later by _migrate."""
         # If unspecified, choose new size dynamically based on current size
         if new_size is None:
             new_size = len(self.buckets) * 2  # Double size
         # Option to reduce size if buckets are sparsely filled (low load factor)
-        elif new_size is 0:
-            new_size = len(self.buckets) / 2  # Half size
-        # Get a list to temporarily hold all current key-value entries
-        old_items = self.items()
-        # Reset size property to 0, will be re-tallied in the set method
-        self.size = 0
+        elif new_size == 0:
+            new_size = max(self.init_size, len(self.buckets) // 2)  # Half size
+        # Bucket indexes are found by masking, so keep a power of two
+        new_size = round_up_power_of_two(new_size)
+        # Finish moving entries of a previous resize before starting another
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+        if self.stats is None:
+            self._replace_buckets(new_size)
+        else:
+            start = time.perf_counter()
+            self._replace_buckets(new_size)
+            self.stats.record_resize(time.perf_counter() - start,
+                                     self._buckets_bytes(new_size))
+
+    def _replace_buckets(self, new_size):
+        """Replace this hash table's buckets with new_size new buckets and
+        move every entry into them, or in incremental mode only start to."""
+        if self.incremental:
+            # Keep the old buckets around until _migrate has emptied them
+            self.old_buckets = self.buckets
+            self.migrated = 0
+            # New buckets are created as they are needed by _migrate, since
+            # creating all of them here would itself take O(b) time
+            self.buckets = [None] * new_size
+            return
+        old_buckets = self.buckets
         # Create a new list of new_size total empty linked list buckets
         self.buckets = [LinkedList() for _ in range(new_size)]
-        # Insert each key-value entry into the new list of buckets,
-        # which will rehash them into a new bucket index based on the new size
-        for key, value in old_items:
-            self.set(key, value)
+        # Insert each entry into the new list of buckets at a new index based
+        # on the new size, using its stored hash instead of hashing the key
+        mask = new_size - 1
+        for bucket in old_buckets:
+            for entry in bucket:
+                self.buckets[entry.hash & mask].append(entry)
+
+    def _migrate(self, count):
+        """Move the entries of up to count old buckets into the new buckets,
+        and drop the old buckets once all of them have been moved.
+        Run time: O(count * l) where l is the load factor"""
+        old_buckets = self.old_buckets
+        buckets = self.buckets
+        stop = min(self.migrated + count, len(old_buckets))
+        mask = len(buckets) - 1
+        for index in range(self.migrated, stop):
+            for entry in old_buckets[index]:
+                self._new_bucket(entry.hash & mask).append(entry)
+            old_buckets[index] = None  # Release the old bucket's nodes
+        # Create the remaining empty new buckets at the same pace, so all of
+        # them exist by the time the last old bucket has been moved
+        ratio_start = self.migrated * len(buckets) // len(old_buckets)
+        ratio_stop = stop * len(buckets) // len(old_buckets)
+        for index in range(ratio_start, ratio_stop):
+            if buckets[index] is None:
+                buckets[index] = LinkedList()
+        self.migrated = stop
+        if stop == len(old_buckets):
+            self.old_buckets = None
+            self.migrated = 0
+
+
+# Marker left in the hash array where an entry was deleted, so that probe
+# sequences passing through the slot keep going instead of stopping early
+_DELETED = object()
+
+
+class OpenHashTable(object):
+    """Hash table that stores its entries in flat parallel arrays of hashes,
+    keys and values and resolves collisions by probing for another slot
+    (open addressing) instead of chaining entries in linked list buckets."""
+
+    PROBING = ('linear', 'quadratic', 'robinhood')
+
+    def __init__(self, init_size=8, probing='linear', min_load_factor=0.25,
+                 stats=None, hash_func=None):
+        """Initialize this hash table with the given initial size, rounded up
+        to a power of two, and the given probing strategy: 'linear',
+        'quadratic' or 'robinhood' (linear probing with Robin Hood hashing).
+        When a deletion drops the load factor below min_load_factor, the number
+        of slots is halved, but never below the initial size. Pass
+        min_load_factor=None to never shrink automatically.
+        Pass a HashTableStats as stats to record probe lengths and resizes.
+        Keys are hashed with hash_func, which defaults to hash(); pass a
+        KeyedHash to resist hash flooding."""
+        if probing not in self.PROBING:
+            raise ValueError('Unknown probing strategy: {}'.format(probing))
+        self.probing = probing
+        self.hash_func = hash if hash_func is None else hash_func
+        capacity = round_up_power_of_two(init_size)
+        self.init_size = capacity  # Fewest slots shrinking will leave
+        self.min_load_factor = min_load_factor
+        self.hashes = [None] * capacity  # Full hash of the key in each slot
+        self.slot_keys = [None] * capacity
+        self.slot_values = [None] * capacity
+        self.size = 0  # Number of key-value entries
+        self.deleted = 0  # Number of slots holding a deleted marker
+        self.stats = stats
+        if stats is not None:
+            stats.record_allocation(3 * sys.getsizeof(self.hashes))
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'OpenHashTable({!r})'.format(list(self.items()))
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _find_slot(self, key, key_hash):
+        """Return the slot index holding the given key, or -1 if not found.
+        Run time: O(1) on average, since the load factor is kept below 0.75
+        the expected probe sequence is short. Hashes are compared before keys
+        so most non-matching slots are rejected without calling __eq__."""
+        hashes = self.hashes
+        mask = len(hashes) - 1
+        robinhood = self.probing == 'robinhood'
+        quadratic = self.probing == 'quadratic'
+        index = key_hash & mask
+        step = 0
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash is None:  # Empty slot ends every probe sequence
+                index = -1
+                break
+            if slot_hash == key_hash:
+                slot_key = self.slot_keys[index]
+                if slot_key is key or slot_key == key:
+                    break
+            elif robinhood and (index - slot_hash) & mask < step:
+                # Our key would have displaced this entry, so it is absent
+                index = -1
+                break
+            step += 1
+            if quadratic:  # Triangular steps visit every power-of-two slot
+                index = (index + step) & mask
+            else:
+                index = (index + 1) & mask
+        if self.stats is not None:
+            self.stats.record_lookup(step + 1)
+        return index
+
+    def load_factor(self):
+        """Return the load factor, the ratio of number of entries to slots.
+        Best and worst case running time: O(1)"""
+        return float(self.size) / len(self.hashes)
+
+    def _iter_slots(self):
+        """Generate the index of each slot holding an entry."""
+        hashes = self.hashes
+        for index in range(len(hashes)):
+            slot_hash = hashes[index]
+            if slot_hash is not None and slot_hash is not _DELETED:
+                yield index
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        slot_keys = self.slot_keys
+        for index in self._iter_slots():
+            yield slot_keys[index]
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        slot_values = self.slot_values
+        for index in self._iter_slots():
+            yield slot_values[index]
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        for index in self._iter_slots():
+            yield (slot_keys[index], slot_values[index])
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it where c is the
+        number of slots"""
+        return KeysView(self)
+
+    def values(self):
+        """Return a live view of all values in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it"""
+        return ValuesView(self)
+
+    def items(self):
+        """Return a live view of all entries (key-value pairs) in this hash
+        table. Run time: O(1) to create the view, O(c) to iterate it"""
+        return ItemsView(self)
+
+    def length(self):
+        """Return the number of key-value entries by traversing its slots.
+        Run time: O(c) where c is the number of slots"""
+        return sum(1 for slot_hash in self.hashes
+                   if slot_hash is not None and slot_hash is not _DELETED)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) on average"""
+        return self._find_slot(key, self.hash_func(key)) >= 0
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._find_slot(key, self.hash_func(key))
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        return self.slot_values[index]
+
+    def set(self, key, value=None):
+        """Insert or update the given key with its associated value.
+        Run time: O(1) on average, O(n) when the insertion triggers a resize"""
+        key_hash = self.hash_func(key)
+        if self.probing == 'robinhood':
+            probes = self._robinhood_set(key, value, key_hash)
+        else:
+            probes = self._probe_set(key, value, key_hash)
+        if self.stats is not None:
+            self.stats.record_lookup(probes)
+        # Deleted markers lengthen probe sequences too, so count them here
+        if float(self.size + self.deleted) / len(self.hashes) > 0.75:
+            self._resize()
+
+    def _probe_set(self, key, value, key_hash):
+        """Insert or update the given entry using linear or quadratic probing,
+        reusing the first deleted slot along the probe sequence if any, and
+        return the number of slots probed."""
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        mask = len(hashes) - 1
+        quadratic = self.probing == 'quadratic'
+        index = key_hash & mask
+        step = 0
+        free = -1  # First deleted slot seen along the probe sequence
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash is None:
+                break
+            if slot_hash is _DELETED:
+                if free < 0:
+                    free = index
+            elif slot_hash == key_hash and (slot_keys[index] is key or
+                                            slot_keys[index] == key):
+                # Key already present, so only its value is updated
+                self.slot_values[index] = value
+                return step + 1
+            step += 1
+            if quadratic:
+                index = (index + step) & mask
+            else:
+                index = (index + 1) & mask
+        if free >= 0:  # Reclaim the deleted slot instead of the empty one
+            index = free
+            self.deleted -= 1
+        hashes[index] = key_hash
+        slot_keys[index] = key
+        self.slot_values[index] = value
+        self.size += 1
+        return step + 1
+
+    def _robinhood_set(self, key, value, key_hash):
+        """Insert or update the given entry using Robin Hood hashing: an entry
+        that is closer to its home slot than the one being inserted gives up
+        its slot and continues probing, which keeps probe lengths even.
+        Return the number of slots probed."""
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        mask = len(hashes) - 1
+        index = key_hash & mask
+        distance = 0  # How far the carried entry is from its home slot
+        probes = 1
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash is None:
+                hashes[index] = key_hash
+                slot_keys[index] = key
+                slot_values[index] = value
+                self.size += 1
+                return probes
+            if slot_hash == key_hash and (slot_keys[index] is key or
+                                          slot_keys[index] == key):
+                slot_values[index] = value
+                return probes
+            slot_distance = (index - slot_hash) & mask
+            if slot_distance < distance:
+                # Take the slot from the richer entry and carry that one on
+                hashes[index], key_hash = key_hash, slot_hash
+                slot_keys[index], key = key, slot_keys[index]
+                slot_values[index], value = value, slot_values[index]
+                distance = slot_distance
+            index = (index + 1) & mask
+            distance += 1
+            probes += 1
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._find_slot(key, self.hash_func(key))
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        if self.probing == 'robinhood':
+            # Shift the following displaced entries back by one slot, so no
+            # deleted marker is needed and probe lengths stay short
+            mask = len(hashes) - 1
+            next_index = (index + 1) & mask
+            next_hash = hashes[next_index]
+            while next_hash is not None and (next_index - next_hash) & mask:
+                hashes[index] = next_hash
+                slot_keys[index] = slot_keys[next_index]
+                slot_values[index] = slot_values[next_index]
+                index = next_index
+                next_index = (index + 1) & mask
+                next_hash = hashes[next_index]
+            hashes[index] = None
+        else:
+            hashes[index] = _DELETED
+            self.deleted += 1
+        slot_keys[index] = None
+        slot_values[index] = None
+        self.size -= 1
+        if (self.min_load_factor is not None and
+                len(hashes) > self.init_size and
+                self.load_factor() < self.min_load_factor):
+            self._resize(len(hashes) // 2)
+
+    def compact(self):
+        """Shrink this hash table's slots to the smallest power of two that
+        keeps the load factor at most 0.5 (but at least the initial size), and
+        discard all deleted markers.
+        Best and worst case running time: O(c) where c is the number of slots"""
+        new_size = self.init_size
+        while new_size < self.size * 2:
+            new_size *= 2
+        self._resize(min(new_size, len(self.hashes)))
+
+    def _resize(self, new_size=None):
+        """Resize this hash table's slot arrays and reinsert all entries using
+        their stored hashes, which also discards all deleted markers.
+        Best and worst case running time: O(n) where n is total # of items"""
+        if new_size is None:
+            new_size = len(self.hashes)
+            # Only grow if live entries, not deleted markers, filled the table
+            if self.size * 2 > new_size * 0.75:
+                new_size *= 2
+        if self.stats is None:
+            self._replace_slots(new_size)
+        else:
+            start = time.perf_counter()
+            self._replace_slots(new_size)
+            self.stats.record_resize(time.perf_counter() - start,
+                                     3 * sys.getsizeof(self.hashes))
+
+    def _replace_slots(self, new_size):
+        """Replace this hash table's slot arrays with arrays of new_size empty
+        slots and reinsert every entry into them."""
+        old_hashes = self.hashes
+        old_keys = self.slot_keys
+        old_values = self.slot_values
+        self.hashes = [None] * new_size
+        self.slot_keys = [None] * new_size
+        self.slot_values = [None] * new_size
+        self.size = 0
+        self.deleted = 0
+        for index, key_hash in enumerate(old_hashes):
+            if key_hash is not None and key_hash is not _DELETED:
+                if self.probing == 'robinhood':
+                    self._robinhood_set(old_keys[index], old_values[index],
+                                        key_hash)
+                else:
+                    self._probe_set(old_keys[index], old_values[index],
+                                    key_hash)
 
 
 def test_hash_table():
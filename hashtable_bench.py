@@ -0,0 +1,349 @@
+#!python
+"""Benchmarks comparing the hash table implementations in this folder.
+Run with: python hashtable_bench.py"""
+
+from hashtable import (HashTable, HashTableStats, KeyedHash, OpenHashTable,
+                       object_bytes)
+from shardedhashtable import ShardedHashTable
+from cuckoohashtable import CuckooHashTable
+from inthashtable import IntHashTable
+from array import array
+import gc
+import io
+import pickle
+import random
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+
+def make_keys(count, seed=1):
+    """Return a list of count distinct string keys in random order."""
+    keys = ['key-{}'.format(i) for i in range(count)]
+    random.Random(seed).shuffle(keys)
+    return keys
+
+
+def bytes_per_entry(factory, keys):
+    """Return the average number of bytes allocated per entry when building
+    a table with the given factory and inserting every key."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = factory()
+    for key in keys:
+        table.set(key, 1)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return float(after - before) / len(keys)
+
+
+def time_per_op(func, items, repeat=3):
+    """Return the best time in nanoseconds to call func on each item."""
+    def run():
+        for item in items:
+            func(item)
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(items) * 1e9
+
+
+def benchmark_engines(count=100000):
+    """Compare the chained and open addressing tables on inserts, successful
+    and unsuccessful lookups, and memory used per entry."""
+    keys = make_keys(count)
+    missing = ['missing-{}'.format(i) for i in range(count)]
+    engines = [
+        ('chained', HashTable),
+        ('linear', lambda: OpenHashTable(probing='linear')),
+        ('quadratic', lambda: OpenHashTable(probing='quadratic')),
+        ('robinhood', lambda: OpenHashTable(probing='robinhood')),
+    ]
+    print('{} string keys'.format(count))
+    print('{:<10} {:>10} {:>10} {:>10} {:>12}'.format(
+        'engine', 'set ns', 'get ns', 'miss ns', 'bytes/entry'))
+    for name, factory in engines:
+        table = factory()
+        set_ns = time_per_op(lambda key: table.set(key, 1), keys, repeat=1)
+        get_ns = time_per_op(table.get, keys)
+        miss_ns = time_per_op(table.contains, missing)
+        memory = bytes_per_entry(factory, keys)
+        print('{:<10} {:>10.0f} {:>10.0f} {:>10.0f} {:>12.1f}'.format(
+            name, set_ns, get_ns, miss_ns, memory))
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction of a sorted list of values."""
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def benchmark_resize_latency(count=500000):
+    """Compare set latency percentiles of stop-the-world and incremental
+    resizing, where the slowest sets are the ones that trigger a resize."""
+    keys = make_keys(count)
+    clock = time.perf_counter
+    print('{} string keys'.format(count))
+    print('{:<12} {:>9} {:>9} {:>9} {:>9}'.format(
+        'resize', 'p50 us', 'p99 us', 'p999 us', 'max us'))
+    for name, incremental in [('full', False), ('incremental', True)]:
+        table = HashTable(incremental=incremental)
+        latencies = []
+        # Keep garbage collector pauses from masking the cost of resizing
+        gc.disable()
+        for key in keys:
+            start = clock()
+            table.set(key, 1)
+            latencies.append(clock() - start)
+        gc.enable()
+        latencies.sort()
+        print('{:<12} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+            name, *[percentile(latencies, fraction) * 1e6
+                    for fraction in (0.5, 0.99, 0.999, 1.0)]))
+
+
+def benchmark_memory(count=100000):
+    """Report the memory footprint of the chained hash table per entry, in
+    total and for each object that makes up one entry."""
+    keys = make_keys(count)
+    table = HashTable()
+    for key in keys:
+        table.set(key, 1)
+    node = table.buckets[table._bucket_index(keys[0])].head
+    print('{} string keys in the chained table'.format(count))
+    print('allocated bytes/entry: {:.1f}'.format(
+        bytes_per_entry(HashTable, keys)))
+    print('node bytes: {}'.format(object_bytes(node)))
+    print('entry bytes: {}'.format(sys.getsizeof(node.data)))
+    print('bucket bytes/entry: {:.1f}'.format(
+        float(sys.getsizeof(table.buckets) +
+              sum(sys.getsizeof(bucket) for bucket in table.buckets)) / count))
+
+
+def benchmark_bulk_load(count=1000000):
+    """Compare loading a table one set call at a time against set_many,
+    counting the resizes each one triggers."""
+    pairs = [(key, 1) for key in make_keys(count)]
+    print('{} string keys'.format(count))
+    print('{:<10} {:>10} {:>10}'.format('load', 'seconds', 'resizes'))
+    for name in ('set', 'set_many'):
+        table = HashTable()
+        resizes = [0]
+        resize = table._resize
+
+        def counting_resize(new_size=None):
+            resizes[0] += 1
+            resize(new_size)
+        table._resize = counting_resize
+        start = time.perf_counter()
+        if name == 'set':
+            for key, value in pairs:
+                table.set(key, value)
+        else:
+            table.set_many(pairs)
+        seconds = time.perf_counter() - start
+        print('{:<10} {:>10.2f} {:>10}'.format(name, seconds, resizes[0]))
+
+
+class GlobalLockHashTable(object):
+    """HashTable behind one lock, the baseline ShardedHashTable replaces."""
+
+    def __init__(self):
+        self.table = HashTable()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.table.get(key)
+
+    def set(self, key, value=None):
+        with self.lock:
+            self.table.set(key, value)
+
+
+def benchmark_contention(thread_counts=(1, 2, 4, 8), ops=200000):
+    """Compare throughput of a pool of worker threads doing 90% gets and 10%
+    sets against one globally locked table and a sharded one. Workers are
+    plain threads: concurrent.futures imports the standard library queue
+    module, which this folder's queue.py shadows."""
+    keys = make_keys(10000)
+    print('{} operations, 90% get / 10% set'.format(ops))
+    print('{:<8} {:>14} {:>14}'.format('threads', 'global ops/s',
+                                       'sharded ops/s'))
+    for thread_count in thread_counts:
+        rates = []
+        for table in (GlobalLockHashTable(), ShardedHashTable()):
+            for key in keys:
+                table.set(key, 0)
+
+            def work(seed):
+                rng = random.Random(seed)
+                for _ in range(ops // thread_count):
+                    key = keys[rng.randrange(len(keys))]
+                    if rng.random() < 0.1:
+                        table.set(key, seed)
+                    else:
+                        table.get(key)
+            threads = [threading.Thread(target=work, args=(seed,))
+                       for seed in range(thread_count)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            rates.append(ops / (time.perf_counter() - start))
+        print('{:<8} {:>14.0f} {:>14.0f}'.format(thread_count, *rates))
+
+
+def benchmark_snapshot(count=200000):
+    """Compare the size and speed of pickling a hash table with its binary
+    snapshot format."""
+    table = HashTable(iterable=[(key, 1) for key in make_keys(count)])
+    print('{} string keys'.format(count))
+    print('{:<10} {:>10} {:>10} {:>10}'.format('format', 'MB', 'dump s',
+                                               'load s'))
+    start = time.perf_counter()
+    data = pickle.dumps(table, pickle.HIGHEST_PROTOCOL)
+    dump_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)
+    load_seconds = time.perf_counter() - start
+    print('{:<10} {:>10.1f} {:>10.2f} {:>10.2f}'.format(
+        'pickle', len(data) / 1e6, dump_seconds, load_seconds))
+    snapshot = io.BytesIO()
+    start = time.perf_counter()
+    table.dump(snapshot)
+    dump_seconds = time.perf_counter() - start
+    snapshot.seek(0)
+    start = time.perf_counter()
+    HashTable.load(snapshot)
+    load_seconds = time.perf_counter() - start
+    print('{:<10} {:>10.1f} {:>10.2f} {:>10.2f}'.format(
+        'snapshot', len(snapshot.getvalue()) / 1e6, dump_seconds,
+        load_seconds))
+
+
+def benchmark_stats(count=100000):
+    """Measure the cost of collecting stats, and print the chain lengths
+    they show for sequential integer keys and random string keys."""
+    keys = make_keys(count)
+    print('{} string keys'.format(count))
+    print('{:<10} {:>10} {:>10}'.format('stats', 'set ns', 'get ns'))
+    for name, stats in [('off', None), ('on', HashTableStats())]:
+        table = HashTable(stats=stats)
+        set_ns = time_per_op(lambda key: table.set(key, 1), keys, repeat=1)
+        get_ns = time_per_op(table.get, keys)
+        print('{:<10} {:>10.0f} {:>10.0f}'.format(name, set_ns, get_ns))
+    print('{:<10} {:>10} {:>10}'.format('keys', 'mean chain', 'longest'))
+    for name, sample in [('integers', range(count)), ('strings', keys)]:
+        stats = HashTableStats()
+        table = HashTable(stats=stats)
+        for key in sample:
+            table.set(key, 1)
+        stats.reset()  # Only count the lookups below
+        for key in sample:
+            table.get(key)
+        print('{:<10} {:>10.2f} {:>10}'.format(
+            name, stats.mean_probe_length(), stats.longest))
+
+
+def benchmark_keyed_hash(counts=(1000, 2000, 4000)):
+    """Compare lookups of structured integer keys (multiples of 2**16, more
+    than the number of buckets) hashed with hash() and with a KeyedHash.
+    With hash() they all share one bucket, so each lookup gets slower as the
+    table grows, while with a KeyedHash lookups take the same time."""
+    print('{:<10} {:>12} {:>12}'.format('keys', 'hash() ns', 'keyed ns'))
+    for count in counts:
+        keys = [number << 16 for number in range(count)]
+        times = []
+        for hash_func in (None, KeyedHash()):
+            table = HashTable(hash_func=hash_func)
+            for key in keys:
+                table.set(key, 1)
+            times.append(time_per_op(table.get, keys, repeat=1))
+        print('{:<10} {:>12.0f} {:>12.0f}'.format(count, *times))
+
+
+def benchmark_cuckoo(count=100000):
+    """Compare the distribution of single lookup latencies of the chained,
+    open addressing and cuckoo tables, and the load factor each reaches.
+    Then fill cuckoo tables of a fixed size until the first insertion that
+    makes them grow, to show the highest load factor each bucket size
+    reaches."""
+    keys = make_keys(count)
+    engines = [
+        ('chained', HashTable),
+        ('linear', lambda: OpenHashTable(probing='linear')),
+        ('robinhood', lambda: OpenHashTable(probing='robinhood')),
+        ('cuckoo', lambda: CuckooHashTable(seed=1)),
+    ]
+    clock = time.perf_counter_ns
+    print('{} string keys, get latency in ns'.format(count))
+    print('{:<10} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+        'engine', 'p50', 'p99', 'p99.9', 'max', 'load'))
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for name, factory in engines:
+            table = factory()
+            for key in keys:
+                table.set(key, 1)
+            get = table.get
+            latencies = []
+            for key in keys:
+                start = clock()
+                get(key)
+                latencies.append(clock() - start)
+            latencies.sort()
+            print('{:<10} {:>8} {:>8} {:>8} {:>8} {:>8.2f}'.format(
+                name, percentile(latencies, 0.5),
+                percentile(latencies, 0.99), percentile(latencies, 0.999),
+                latencies[-1], table.load_factor()))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    print('{:<12} {:>10}'.format('bucket size', 'max load'))
+    for bucket_size in (1, 2, 4, 8):
+        table = CuckooHashTable(4096 // bucket_size, bucket_size=bucket_size,
+                                max_load_factor=1.0, seed=1)
+        slots = len(table.hashes)
+        size = table.size
+        for key in keys:
+            table.set(key, 1)
+            if len(table.hashes) != slots:
+                break
+            size = table.size  # Entries held without growing so far
+        print('{:<12} {:>10.2f}'.format(bucket_size, float(size) / slots))
+
+
+def benchmark_int_keys(count=200000):
+    """Compare memory per entry and lookup speed of the general tables and
+    IntHashTable on random 64-bit integer keys with float values, and of
+    looking up every key with separate get calls and with one get_many."""
+    rng = random.Random(1)
+    keys = array('q', (rng.getrandbits(63) for _ in range(count)))
+    engines = [('chained', HashTable), ('int', IntHashTable)]
+    print('{} integer keys'.format(count))
+    print('{:<10} {:>12} {:>10} {:>12}'.format('engine', 'bytes/entry',
+                                               'get ns', 'get_many ns'))
+    for name, factory in engines:
+        memory = bytes_per_entry(factory, keys)
+        table = factory()
+        table.set_many([(key, 1.0) for key in keys])
+        get_ns = time_per_op(table.get, keys)
+        many_ns = min(timeit.repeat(lambda: table.get_many(keys), number=1,
+                                    repeat=3)) / count * 1e9
+        print('{:<10} {:>12.1f} {:>10.0f} {:>12.0f}'.format(
+            name, memory, get_ns, many_ns))
+
+
+if __name__ == '__main__':
+    benchmark_engines()
+    benchmark_resize_latency()
+    benchmark_memory()
+    benchmark_bulk_load()
+    benchmark_contention()
+    benchmark_snapshot()
+    benchmark_stats()
+    benchmark_keyed_hash()
+    benchmark_cuckoo()
+    benchmark_int_keys()
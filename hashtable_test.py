@@ -1,12 +1,34 @@
 #!python
 
-from hashtable import HashTable
+from hashtable import (HashTable, OpenHashTable, HashTableStats, KeyedHash,
+                       Entry, KeysView)
+import io
+import os
+import struct
+import subprocess
+import sys
+import tempfile
 import unittest
 # Python 2 and 3 compatibility: unittest module renamed this assertion method
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
     unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
 
 
+class CountingKey(object):
+    """Key that counts how many times its hash has been computed."""
+
+    def __init__(self, name):
+        self.name = name
+        self.hash_calls = 0
+
+    def __hash__(self):
+        self.hash_calls += 1
+        return hash(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, CountingKey) and self.name == other.name
+
+
 class HashTableTest(unittest.TestCase):
 
     def test_init(self):
@@ -17,9 +39,9 @@ class HashTableTest(unittest.TestCase):
 
     def test_keys(self):
         ht = HashTable()
-        assert ht.keys() == []
+        assert list(ht.keys()) == []
         ht.set('I', 1)
-        assert ht.keys() == ['I']
+        assert list(ht.keys()) == ['I']
         ht.set('V', 5)
         self.assertCountEqual(ht.keys(), ['I', 'V'])  # Ignore item order
         ht.set('X', 10)
@@ -27,9 +49,9 @@ class HashTableTest(unittest.TestCase):
 
     def test_values(self):
         ht = HashTable()
-        assert ht.values() == []
+        assert list(ht.values()) == []
         ht.set('I', 1)
-        assert ht.values() == [1]
+        assert list(ht.values()) == [1]
         ht.set('V', 5)
         self.assertCountEqual(ht.values(), [1, 5])  # Ignore item order
         ht.set('X', 10)
@@ -37,14 +59,46 @@ class HashTableTest(unittest.TestCase):
 
     def test_items(self):
         ht = HashTable()
-        assert ht.items() == []
+        assert list(ht.items()) == []
         ht.set('I', 1)
-        assert ht.items() == [('I', 1)]
+        assert list(ht.items()) == [('I', 1)]
         ht.set('V', 5)
         self.assertCountEqual(ht.items(), [('I', 1), ('V', 5)])
         ht.set('X', 10)
         self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
 
+    def test_views(self):
+        ht = HashTable()
+        keys = ht.keys()
+        items = ht.items()
+        assert isinstance(keys, KeysView)
+        assert len(keys) == 0
+        ht.set('I', 1)
+        ht.set('V', 5)
+        # Views are live, so they reflect entries set after they were made
+        assert len(keys) == 2
+        assert 'V' in keys
+        assert 'A' not in keys
+        assert ('I', 1) in items
+        assert ('I', 2) not in items
+        assert 5 in ht.values()
+        self.assertCountEqual(keys, ['I', 'V'])
+
+    def test_iter_len_and_contains(self):
+        ht = HashTable(iterable=[('I', 1), ('V', 5), ('X', 10)])
+        self.assertCountEqual(iter(ht), ['I', 'V', 'X'])
+        assert len(ht) == 3
+        assert 'X' in ht
+        assert 'A' not in ht
+
+    def test_iterate_during_incremental_resize(self):
+        ht = HashTable(incremental=True)
+        for number in range(100):
+            ht.set(number, number)
+        # Lookups while iterating must not make entries be skipped
+        seen = [key for key in ht.keys() if ht.contains(key)]
+        self.assertCountEqual(seen, range(100))
+
     def test_length(self):
         ht = HashTable()
         assert ht.length() == 0
@@ -141,6 +195,399 @@ class HashTableTest(unittest.TestCase):
         with self.assertRaises(KeyError):
             ht.delete('A')  # Key does not exist
 
+    def test_shrink(self):
+        ht = HashTable(4)
+        for number in range(10):
+            ht.set(number, number)
+        assert len(ht.buckets) == 16
+        for number in range(7):
+            ht.delete(number)
+        assert len(ht.buckets) == 8  # 3/16 is below the low-water mark
+        assert ht.load_factor() == 0.375
+        ht.set(100)  # Hysteresis: growing back needs more than 0.75
+        ht.delete(100)
+        assert len(ht.buckets) == 8
+        ht.delete(7)
+        ht.delete(8)
+        assert len(ht.buckets) == 4  # Never below init_size
+        assert ht.get(9) == 9
+        ht.delete(9)
+        assert len(ht.buckets) == 4
+
+    def test_shrink_disabled(self):
+        ht = HashTable(4, min_load_factor=None)
+        for number in range(10):
+            ht.set(number)
+        for number in range(10):
+            ht.delete(number)
+        assert len(ht.buckets) == 16
+
+    def test_compact(self):
+        for incremental in (False, True):
+            ht = HashTable(4, incremental=incremental, min_load_factor=None)
+            for number in range(100):
+                ht.set(number, number)
+            for number in range(95):
+                ht.delete(number)
+            ht.compact()
+            assert len(ht.buckets) == 16  # Power of two above 5 * 2
+            assert ht.old_buckets is None
+            self.assertCountEqual(ht.keys(), range(95, 100))
+
+    def test_init_with_items(self):
+        ht = HashTable(iterable=[('I', 1), ('V', 5), ('X', 10)])
+        assert ht.size == 3
+        assert ht.get('V') == 5
+        ht = HashTable(iterable=((number, number) for number in range(100)))
+        assert ht.size == 100
+        assert len(ht.buckets) == 256  # Grown once to fit every entry
+
+    def test_set_many(self):
+        ht = HashTable()
+        resizes = []
+        resize = ht._resize
+        ht._resize = lambda *args: resizes.append(args) or resize(*args)
+        ht.set_many((number, number * 2) for number in range(1000))
+        assert len(resizes) == 1
+        assert ht.size == ht.length() == 1000
+        assert ht.load_factor() <= 0.75
+        ht.set_many([(0, 'zero'), (1000, 'new')])  # Update and insert
+        assert ht.size == 1001
+        assert ht.get(0) == 'zero'
+        assert ht.get(1000) == 'new'
+
+    def test_get_many(self):
+        ht = HashTable(iterable=[('I', 1), ('V', 5), ('X', 10)])
+        assert ht.get_many(['X', 'I']) == [10, 1]
+        assert ht.get_many([]) == []
+        with self.assertRaises(KeyError):
+            ht.get_many(['I', 'A'])
+
+    def test_delete_many(self):
+        ht = HashTable(4, iterable=[(number, None) for number in range(100)])
+        assert len(ht.buckets) == 256
+        ht.delete_many(range(95))
+        assert ht.size == ht.length() == 5
+        assert len(ht.buckets) == 16  # Shrunk once below the low-water mark
+        self.assertCountEqual(ht.keys(), range(95, 100))
+        with self.assertRaises(KeyError):
+            ht.delete_many([99, 0])
+        assert ht.size == 4
+
+    def test_dump_and_load(self):
+        ht = HashTable(iterable=[(number, str(number)) for number in range(100)])
+        ht.set('I', [1, 2])
+        snapshot = io.BytesIO()
+        ht.dump(snapshot)
+        snapshot.seek(0)
+        loaded = HashTable.load(snapshot)
+        assert loaded.size == loaded.length() == 101
+        assert len(loaded.buckets) == 256
+        assert loaded.get(42) == '42'
+        assert loaded.get('I') == [1, 2]
+        self.assertCountEqual(loaded.items(), ht.items())
+        loaded.set('V', 5)
+        loaded.delete(0)
+        assert loaded.size == 101
+
+    def test_load_rehashes_foreign_hashes(self):
+        ht = HashTable(iterable=[('I', 1), ('V', 5), ('X', 10)])
+        snapshot = io.BytesIO()
+        ht.dump(snapshot)
+        data = bytearray(snapshot.getvalue())
+        # Pretend the snapshot came from a process with other string hashes
+        struct.pack_into('<q', data, 16, hash('HashTable snapshot canary') + 1)
+        struct.pack_into('<qqq', data, 24, 1, 2, 3)
+        loaded = HashTable.load(io.BytesIO(bytes(data)))
+        assert loaded.get('I') == 1
+        assert loaded.get('X') == 10
+
+    def test_load_in_another_process(self):
+        # None and tuples holding it are hashed by identity before Python
+        # 3.12, so their hashes change between processes even though string
+        # hashes, and so the canary, stay the same with a fixed hash seed
+        path = os.path.join(tempfile.mkdtemp(), 'snapshot')
+        env = dict(os.environ, PYTHONHASHSEED='0')
+        dump = ("from hashtable import HashTable\n"
+                "ht = HashTable(iterable=[(None, 1), ((None, 1), 2), ('I', 3)])\n"
+                "with open({!r}, 'wb') as fp:\n"
+                "    ht.dump(fp)\n").format(path)
+        load = ("from hashtable import HashTable\n"
+                "with open({!r}, 'rb') as fp:\n"
+                "    ht = HashTable.load(fp)\n"
+                "print(ht.contains(None), ht.contains((None, 1)), ht.get('I'))\n"
+                ).format(path)
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        subprocess.check_call([sys.executable, '-c', dump], cwd=cwd, env=env)
+        output = subprocess.check_output([sys.executable, '-c', load],
+                                         cwd=cwd, env=env)
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+        assert output.split() == [b'True', b'True', b'3']
+
+    def test_load_invalid_snapshot(self):
+        with self.assertRaises(ValueError):
+            HashTable.load(io.BytesIO(b'not a snapshot at all, not at all'))
+        snapshot = io.BytesIO()
+        HashTable(iterable=[('I', 1)]).dump(snapshot)
+        with self.assertRaises(ValueError):
+            HashTable.load(io.BytesIO(snapshot.getvalue()[:-1]))
+
+    def test_entries_store_hash(self):
+        ht = HashTable()
+        ht.set('I', 1)
+        entry = ht.buckets[ht._bucket_index('I')].head.data
+        assert isinstance(entry, Entry)
+        assert entry.hash == hash('I')
+        ht.set('I', 2)  # Update value in place
+        assert entry.value == 2
+        assert ht.size == 1
+
+    def test_resize_does_not_rehash(self):
+        for incremental in (False, True):
+            ht = HashTable(2, incremental=incremental)
+            keys = [CountingKey(number) for number in range(50)]
+            for key in keys:
+                ht.set(key, key.name)
+            for key in keys:
+                ht.get(key)
+            # Once when set and once when looked up, never by a resize
+            assert all(key.hash_calls == 2 for key in keys)
+
+    def test_incremental_resize(self):
+        ht = HashTable(4, incremental=True)
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        assert ht.old_buckets is None
+        ht.set('L', 50)  # Should start an incremental resize
+        assert len(ht.buckets) == 8
+        assert ht.old_buckets is not None
+        # Entries are reachable while they are still in the old buckets
+        assert ht.get('I') == 1
+        assert ht.contains('L') is True
+        self.assertCountEqual(ht.keys(), ['I', 'V', 'X', 'L'])
+        assert ht.length() == 4
+
+    def test_incremental_resize_finishes(self):
+        ht = HashTable(incremental=True)
+        for number in range(200):
+            ht.set(number, number * 2)
+        for number in range(0, 200, 2):
+            ht.delete(number)
+        assert ht.size == ht.length() == 100
+        for _ in range(len(ht.buckets)):
+            ht.contains(-1)  # Every operation moves some old buckets
+        assert ht.old_buckets is None
+        assert None not in ht.buckets  # All new buckets were created
+        for number in range(200):
+            if number % 2:
+                assert ht.get(number) == number * 2
+            else:
+                assert ht.contains(number) is False
+
+    def test_stats(self):
+        stats = HashTableStats()
+        ht = HashTable(4, stats=stats)
+        assert stats.bytes_allocated > 0  # Initial buckets
+        # Keys 0, 4, 8 and 12 all land in bucket 0 of the 4 buckets
+        for key in (0, 4, 8, 12):
+            ht.set(key, key)  # Finds chains of length 0, 1, 2 and 3
+        assert stats.resizes == 1
+        assert stats.resize_seconds >= 0
+        assert ht.get(12) == 12  # Shares bucket 4 of 8 with key 4
+        snapshot = stats.snapshot()
+        assert snapshot['lookups'] == 5
+        assert snapshot['probe_lengths'] == {0: 1, 1: 1, 2: 2, 3: 1}
+        assert snapshot['mean_probe_length'] == 1.6
+        assert snapshot['longest'] == 3
+        assert snapshot['longest_hits'] == 1
+        stats.reset()
+        assert stats.snapshot()['lookups'] == 0
+        assert HashTable().stats is None  # Disabled by default
+
+    def test_init_size_power_of_two(self):
+        ht = HashTable(5)
+        assert len(ht.buckets) == 8
+        assert ht.init_size == 8
+
+    def test_keyed_hash(self):
+        keyed_hash = KeyedHash(seed=42)
+        assert keyed_hash(12345) == KeyedHash(seed=42)(12345)
+        assert keyed_hash(12345) != KeyedHash(seed=43)(12345)
+        assert 0 <= keyed_hash(-1) < 2 ** 63
+        assert KeyedHash().seed != KeyedHash().seed  # Random seeds
+
+    def test_keyed_hash_spreads_structured_keys(self):
+        keys = [number * 1024 for number in range(64)]
+        plain = HashTable(128)
+        keyed = HashTable(128, hash_func=KeyedHash(seed=7))
+        for key in keys:
+            plain.set(key, key)
+            keyed.set(key, key)
+        # Multiples of the number of buckets all share bucket 0 with hash()
+        assert plain.buckets[0].length() == 64
+        assert max(bucket.length() for bucket in keyed.buckets) <= 6
+        for key in keys:
+            assert keyed.get(key) == key
+        keyed.delete(0)
+        assert keyed.contains(0) is False
+        assert keyed.size == 63
+
+    def test_dump_and_load_with_keyed_hash(self):
+        ht = HashTable(hash_func=KeyedHash(seed=1))
+        ht.set_many((number, str(number)) for number in range(20))
+        snapshot = io.BytesIO()
+        ht.dump(snapshot)
+        for seed in (1, 2):  # Stored hashes are reused or recomputed
+            snapshot.seek(0)
+            loaded = HashTable.load(snapshot, hash_func=KeyedHash(seed))
+            assert loaded.hash_func.seed == seed
+            for number in range(20):
+                assert loaded.get(number) == str(number)
+
+
+class OpenHashTableTest(unittest.TestCase):
+    probing = 'linear'
+
+    def test_init(self):
+        ht = OpenHashTable(5, probing=self.probing)
+        assert len(ht.hashes) == 8  # Rounded up to a power of two
+        assert ht.length() == 0
+        assert ht.size == 0
+        with self.assertRaises(ValueError):
+            OpenHashTable(probing='cubic')
+
+    def test_items(self):
+        ht = OpenHashTable(probing=self.probing)
+        assert list(ht.items()) == []
+        ht.set('I', 1)
+        assert list(ht.items()) == [('I', 1)]
+        ht.set('V', 5)
+        ht.set('X', 10)
+        self.assertCountEqual(ht.keys(), ['I', 'V', 'X'])
+        self.assertCountEqual(ht.values(), [1, 5, 10])
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
+
+    def test_views(self):
+        ht = OpenHashTable(probing=self.probing)
+        keys = ht.keys()
+        ht.set('I', 1)
+        ht.set('V', 5)
+        assert len(keys) == len(ht) == 2
+        assert 'I' in keys and 'I' in ht
+        assert ('V', 5) in ht.items()
+        self.assertCountEqual(ht, ['I', 'V'])
+
+    def test_resize(self):
+        ht = OpenHashTable(4, probing=self.probing)
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        assert len(ht.hashes) == 4
+        assert ht.load_factor() == 0.75
+        ht.set('L', 50)  # Should trigger resize
+        assert len(ht.hashes) == 8
+        assert ht.load_factor() == 0.5
+        assert ht.get('L') == 50
+
+    def test_set_get_and_delete(self):
+        ht = OpenHashTable(probing=self.probing)
+        ht.set('I', 1)
+        ht.set('V', 4)
+        ht.set('V', 5)  # Update value
+        assert ht.get('I') == 1
+        assert ht.get('V') == 5
+        assert ht.size == 2
+        assert ht.contains('V') is True
+        assert ht.contains('A') is False
+        with self.assertRaises(KeyError):
+            ht.get('A')
+        ht.delete('I')
+        assert ht.size == 1
+        assert ht.contains('I') is False
+        with self.assertRaises(KeyError):
+            ht.delete('I')
+
+    def test_colliding_keys(self):
+        ht = OpenHashTable(probing=self.probing)
+        # Multiples of the capacity all share the same home slot
+        keys = [i * 64 for i in range(40)]
+        for key in keys:
+            ht.set(key, -key)
+        for key in keys[::3]:
+            ht.delete(key)
+        for key in keys[1::3]:
+            ht.set(key, key)
+        for index, key in enumerate(keys):
+            if index % 3 == 0:
+                assert ht.contains(key) is False
+            elif index % 3 == 1:
+                assert ht.get(key) == key
+            else:
+                assert ht.get(key) == -key
+        assert ht.size == ht.length() == 26
+
+    def test_shrink_and_compact(self):
+        ht = OpenHashTable(probing=self.probing)
+        for number in range(100):
+            ht.set(number, number)
+        assert len(ht.hashes) == 256
+        for number in range(90):
+            ht.delete(number)
+        assert len(ht.hashes) == 32
+        ht = OpenHashTable(probing=self.probing, min_load_factor=None)
+        for number in range(100):
+            ht.set(number, number)
+        for number in range(90):
+            ht.delete(number)
+        assert len(ht.hashes) == 256
+        ht.compact()
+        assert len(ht.hashes) == 32
+        assert ht.deleted == 0
+        self.assertCountEqual(ht.items(), [(n, n) for n in range(90, 100)])
+
+    def test_churn_does_not_grow(self):
+        ht = OpenHashTable(probing=self.probing)
+        for key in range(1000):
+            ht.set(key)
+            ht.delete(key)
+        assert ht.size == 0
+        assert len(ht.hashes) == 8
+
+    def test_stats(self):
+        stats = HashTableStats()
+        ht = OpenHashTable(probing=self.probing, stats=stats)
+        for key in range(100):
+            ht.set(key, key)
+        for key in range(100):
+            assert ht.get(key) == key
+        assert ht.contains(-1) is False
+        assert stats.lookups == 201
+        assert sum(stats.probe_lengths.values()) == 201
+        assert min(stats.probe_lengths) >= 1  # Every lookup probes a slot
+        assert stats.resizes == 5  # From 8 to 256 slots
+        assert stats.bytes_allocated > 0
+
+    def test_keyed_hash(self):
+        ht = OpenHashTable(probing=self.probing, hash_func=KeyedHash(seed=3))
+        keys = [number * 1024 for number in range(100)]
+        for key in keys:
+            ht.set(key, key)
+        for key in keys:
+            assert ht.get(key) == key
+        ht.delete(0)
+        assert ht.contains(0) is False
+        assert ht.size == 99
+
+
+class QuadraticOpenHashTableTest(OpenHashTableTest):
+    probing = 'quadratic'
+
+
+class RobinHoodOpenHashTableTest(OpenHashTableTest):
+    probing = 'robinhood'
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,320 @@
+#!python
+from hashtable import (KeysView, ValuesView, ItemsView, MASK64,
+                       round_up_power_of_two)
+from array import array
+
+# Key stored in empty slots, so it can't be used as a key itself
+EMPTY = -2 ** 63
+# Multiplier of Fibonacci hashing, 2**64 divided by the golden ratio
+FIBONACCI = 0x9E3779B97F4A7C15
+
+
+class IntHashTable(object):
+    """Hash table specialized for signed 64-bit integer keys and either
+    float or signed 64-bit integer values. Keys and values are stored
+    unboxed in two typed arrays, using 8 bytes each per slot, instead of as
+    Python objects in entries and linked list nodes. Collisions are resolved
+    by linear probing, and deletions shift the following entries back
+    instead of leaving deleted markers, so an empty slot always ends a probe
+    sequence. The smallest 64-bit integer marks empty slots and can't be a
+    key. The *_many methods take whole arrays (or any iterables) of keys and
+    values, to work through a batch in a single call."""
+
+    def __init__(self, init_size=8, value_type='d', min_load_factor=0.25,
+                 iterable=None):
+        """Initialize this hash table with the given initial number of slots,
+        rounded up to a power of two, storing values of the given array type
+        code: 'd' for floats or 'q' for integers. When a deletion drops the
+        load factor below min_load_factor, the number of slots is halved, but
+        never below the initial size. Pass min_load_factor=None to never
+        shrink automatically. Insert the given (key, value) pairs, if any."""
+        if value_type not in ('d', 'q'):
+            raise ValueError('Unknown value type: {}'.format(value_type))
+        self.value_type = value_type
+        self.min_load_factor = min_load_factor
+        self.init_size = round_up_power_of_two(max(init_size, 2))
+        self._allocate(self.init_size)
+        self.size = 0  # Number of key-value entries
+        if iterable is not None:
+            self.set_many(iterable)
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'IntHashTable({!r})'.format(list(self.items()))
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _allocate(self, capacity):
+        """Replace the slot arrays with arrays of capacity empty slots."""
+        self.slot_keys = array('q', [EMPTY]) * capacity
+        self.slot_values = array(self.value_type, [0]) * capacity
+        # Shift that keeps the top log2(capacity) bits of a 64-bit product
+        self.shift = 64 - (capacity.bit_length() - 1)
+
+    def _home(self, key):
+        """Return the slot index the given key is stored at unless it was
+        displaced. Fibonacci hashing multiplies the key by a large odd
+        constant and keeps the top bits, so keys that are multiples of the
+        number of slots still spread out. Run time: O(1)"""
+        return ((key & MASK64) * FIBONACCI & MASK64) >> self.shift
+
+    def _find_slot(self, key):
+        """Return the slot index holding the given key, or -1 if not found.
+        Run time: O(1) on average"""
+        if key == EMPTY:
+            return -1
+        slot_keys = self.slot_keys
+        mask = len(slot_keys) - 1
+        index = ((key & MASK64) * FIBONACCI & MASK64) >> self.shift
+        while True:
+            slot_key = slot_keys[index]
+            if slot_key == key:
+                return index
+            if slot_key == EMPTY:
+                return -1
+            index = (index + 1) & mask
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        for slot_key in self.slot_keys:
+            if slot_key != EMPTY:
+                yield slot_key
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        for index, slot_key in enumerate(self.slot_keys):
+            if slot_key != EMPTY:
+                yield self.slot_values[index]
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        for index, slot_key in enumerate(self.slot_keys):
+            if slot_key != EMPTY:
+                yield (slot_key, self.slot_values[index])
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it where c is the
+        number of slots"""
+        return KeysView(self)
+
+    def values(self):
+        """Return a live view of all values in this hash table."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return a live view of all entries (key-value pairs)."""
+        return ItemsView(self)
+
+    def load_factor(self):
+        """Return the load factor, the ratio of number of entries to slots."""
+        return float(self.size) / len(self.slot_keys)
+
+    def length(self):
+        """Return the number of key-value entries by traversing its slots.
+        Run time: O(c) where c is the number of slots"""
+        return len(self.slot_keys) - self.slot_keys.count(EMPTY)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) on average"""
+        return self._find_slot(key) >= 0
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._find_slot(key)
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        return self.slot_values[index]
+
+    def set(self, key, value=0):
+        """Insert or update the given key with its associated value.
+        Run time: O(1) on average, O(n) when the insertion triggers a resize"""
+        if key == EMPTY:
+            raise ValueError('Key is reserved for empty slots: {}'.format(key))
+        index = self._find_slot(key)
+        if index >= 0:
+            # Updating an existing key never needs more slots
+            self.slot_values[index] = value
+            return
+        if self.size + 1 > len(self.slot_keys) * 0.75:
+            self._resize(len(self.slot_keys) * 2)
+        self._insert(key, value)
+
+    def _insert(self, key, value):
+        """Insert or update the given entry, assuming there is a free slot."""
+        slot_keys = self.slot_keys
+        mask = len(slot_keys) - 1
+        index = ((key & MASK64) * FIBONACCI & MASK64) >> self.shift
+        while True:
+            slot_key = slot_keys[index]
+            if slot_key == key:
+                self.slot_values[index] = value
+                return
+            if slot_key == EMPTY:
+                # Store the value first, so a value that doesn't fit the
+                # values array raises before the key is added
+                self.slot_values[index] = value
+                slot_keys[index] = key
+                self.size += 1
+                return
+            index = (index + 1) & mask
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._find_slot(key)
+        if index < 0:
+            raise KeyError('Key not found: {}'.format(key))
+        self._remove_slot(index)
+        self._shrink()
+
+    def _remove_slot(self, index):
+        """Empty the given slot, then move each entry after it in the same
+        run of full slots back into the hole if that does not put it before
+        its home slot, so no lookup passes an empty slot on its way."""
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        mask = len(slot_keys) - 1
+        hole = index
+        while True:
+            index = (index + 1) & mask
+            slot_key = slot_keys[index]
+            if slot_key == EMPTY:
+                break
+            # Distance from the entry's home slot is at least its distance
+            # from the hole, so the hole is between its home slot and it
+            if (index - self._home(slot_key)) & mask >= (index - hole) & mask:
+                slot_keys[hole] = slot_key
+                slot_values[hole] = slot_values[index]
+                hole = index
+        slot_keys[hole] = EMPTY
+        slot_values[hole] = 0
+        self.size -= 1
+
+    def _shrink(self):
+        """Halve the number of slots until the load factor is no longer below
+        min_load_factor or the initial size is reached."""
+        if self.min_load_factor is None:
+            return
+        new_size = len(self.slot_keys)
+        while (new_size // 2 >= self.init_size and
+               self.size < self.min_load_factor * new_size):
+            new_size //= 2
+        if new_size < len(self.slot_keys):
+            self._resize(new_size)
+
+    def set_many(self, keys, values=None):
+        """Insert or update every key in the given array (or iterable) of
+        keys with the value at the same position in the given array (or
+        iterable) of values, or if values is None, every (key, value) pair in
+        the given iterable. The slots are grown once up front to fit all of them.
+        Keys and values are copied into typed arrays first, so a key or value
+        of the wrong type raises before any entry is changed.
+        Run time: O(n + m) where m is the number of keys given"""
+        if values is None:
+            pairs = list(keys)
+            keys = [key for key, _ in pairs]
+            values = [value for _, value in pairs]
+        if not (isinstance(keys, array) and keys.typecode == 'q'):
+            keys = array('q', keys)
+        if not (isinstance(values, array) and
+                values.typecode == self.value_type):
+            values = array(self.value_type, values)
+        if len(keys) != len(values):
+            raise ValueError('Got {} keys but {} values'.format(len(keys),
+                                                                len(values)))
+        if EMPTY in keys:
+            raise ValueError('Key is reserved for empty slots: {}'.format(
+                EMPTY))
+        needed = self.size + len(keys)  # Upper bound if keys are repeated
+        new_size = len(self.slot_keys)
+        while needed > new_size * 0.75:
+            new_size *= 2
+        if new_size > len(self.slot_keys):
+            self._resize(new_size)
+        insert = self._insert
+        for key, value in zip(keys, values):
+            insert(key, value)
+
+    def get_many(self, keys):
+        """Return an array of the values associated with the given array (or
+        iterable) of keys, in the same order, or raise KeyError if any key is
+        not found. Run time: O(m) on average where m is the number of keys"""
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        mask = len(slot_keys) - 1
+        shift = self.shift
+        result = array(self.value_type)
+        append = result.append
+        for key in keys:
+            index = ((key & MASK64) * FIBONACCI & MASK64) >> shift
+            while True:
+                slot_key = slot_keys[index]
+                if slot_key == key and key != EMPTY:
+                    append(slot_values[index])
+                    break
+                if slot_key == EMPTY:
+                    raise KeyError('Key not found: {}'.format(key))
+                index = (index + 1) & mask
+        return result
+
+    def contains_many(self, keys):
+        """Return a list of True or False for each key in the given array (or
+        iterable) of keys, telling if this hash table contains it.
+        Run time: O(m) on average where m is the number of keys"""
+        find_slot = self._find_slot
+        return [find_slot(key) >= 0 for key in keys]
+
+    def delete_many(self, keys):
+        """Delete the given keys and their associated values, or raise
+        KeyError at the first key not found. The slots are shrunk at most
+        once, after all of the keys have been deleted.
+        Run time: O(n + m) where m is the number of keys given"""
+        try:
+            for key in keys:
+                index = self._find_slot(key)
+                if index < 0:
+                    raise KeyError('Key not found: {}'.format(key))
+                self._remove_slot(index)
+        finally:
+            self._shrink()
+
+    def compact(self):
+        """Shrink this hash table's slots to the smallest power of two that
+        keeps the load factor at most 0.5 (but at least the initial size).
+        Best and worst case running time: O(c) where c is the number of slots"""
+        new_size = self.init_size
+        while new_size < self.size * 2:
+            new_size *= 2
+        if new_size < len(self.slot_keys):
+            self._resize(new_size)
+
+    def _resize(self, new_size):
+        """Resize this hash table's slot arrays to new_size slots and
+        reinsert all entries.
+        Best and worst case running time: O(n) where n is total # of items"""
+        old_keys = self.slot_keys
+        old_values = self.slot_values
+        self._allocate(new_size)
+        self.size = 0
+        insert = self._insert
+        for index, key in enumerate(old_keys):
+            if key != EMPTY:
+                insert(key, old_values[index])
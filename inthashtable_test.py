@@ -0,0 +1,160 @@
+#!python
+
+from inthashtable import IntHashTable, EMPTY
+from array import array
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class IntHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = IntHashTable(5)
+        assert len(ht.slot_keys) == 8  # Rounded up to a power of two
+        assert ht.size == 0
+        assert ht.length() == 0
+        assert ht.slot_keys.typecode == 'q'
+        assert ht.slot_values.typecode == 'd'
+        assert IntHashTable(value_type='q').slot_values.typecode == 'q'
+        with self.assertRaises(ValueError):
+            IntHashTable(value_type='f')
+
+    def test_set_and_get(self):
+        ht = IntHashTable()
+        ht.set(1, 1.5)
+        ht.set(-5, 5.0)
+        ht.set(2 ** 62, 10)
+        ht.set(-5, 4.0)  # Update value
+        assert ht.get(1) == 1.5
+        assert ht.get(-5) == 4.0
+        assert ht.get(2 ** 62) == 10.0
+        assert ht.size == 3
+        assert ht.length() == 3
+        assert -5 in ht
+        assert ht.contains(7) is False
+        with self.assertRaises(KeyError):
+            ht.get(7)
+        with self.assertRaises(ValueError):
+            ht.set(EMPTY, 1.0)
+        assert ht.contains(EMPTY) is False
+
+    def test_delete(self):
+        ht = IntHashTable(value_type='q')
+        for key in range(100):
+            ht.set(key * 8, key)  # Multiples of the number of slots
+        for key in range(0, 100, 2):
+            ht.delete(key * 8)
+        assert ht.size == ht.length() == 50
+        for key in range(100):
+            if key % 2:
+                assert ht.get(key * 8) == key
+            else:
+                assert ht.contains(key * 8) is False
+        with self.assertRaises(KeyError):
+            ht.delete(0)
+
+    def test_delete_keeps_probe_sequences(self):
+        ht = IntHashTable(16, min_load_factor=None)
+        keys = []
+        key = 0
+        while len(keys) < 6:  # Keys that all have the same home slot
+            if ht._home(key) == 3:
+                keys.append(key)
+            key += 1
+        for key in keys:
+            ht.set(key, float(key))
+        ht.set(1000003, 1.0)
+        for key in keys[:3]:
+            ht.delete(key)
+        for key in keys[3:]:
+            assert ht.get(key) == float(key)
+        assert ht.get(1000003) == 1.0
+        assert ht.size == ht.length() == 4
+
+    def test_resize(self):
+        ht = IntHashTable(4)
+        for key in range(1000):
+            ht.set(key, key / 2.0)
+        assert ht.load_factor() <= 0.75
+        assert len(ht.slot_keys) == 2048
+        for key in range(995):
+            ht.delete(key)
+        assert len(ht.slot_keys) == 16  # Shrunk with the deletions
+        self.assertCountEqual(ht.keys(), range(995, 1000))
+        ht = IntHashTable(4, min_load_factor=None)
+        ht.set_many(array('q', range(100)), array('d', range(100)))
+        ht.delete_many(range(95))
+        ht.compact()
+        assert len(ht.slot_keys) == 16
+        assert ht.get(99) == 99.0
+
+    def test_update_does_not_resize(self):
+        ht = IntHashTable(8)
+        for key in range(6):
+            ht.set(key, 1.0)
+        assert len(ht.slot_keys) == 8  # At the load factor threshold
+        ht.set(5, 2.0)
+        assert len(ht.slot_keys) == 8
+        assert ht.get(5) == 2.0
+        ht.set(6, 1.0)
+        assert len(ht.slot_keys) == 16
+
+    def test_set_many_and_get_many(self):
+        ht = IntHashTable(value_type='q')
+        keys = array('q', range(0, 3000, 3))
+        ht.set_many(keys, array('q', range(1000)))
+        assert ht.size == 1000
+        assert len(ht.slot_keys) == 2048  # Grown once to fit every key
+        result = ht.get_many(array('q', [3, 0, 2997]))
+        assert result == array('q', [1, 0, 999])
+        with self.assertRaises(KeyError):
+            ht.get_many([3, 1])
+        assert ht.contains_many([3, 1]) == [True, False]
+        ht.set_many([(1, 7), (3, 8)])  # Pairs, as in HashTable.set_many
+        assert ht.get_many([1, 3]) == array('q', [7, 8])
+        with self.assertRaises(ValueError):
+            ht.set_many([1, 2], [1])
+        ht.delete_many(array('q', [1, 3]))
+        assert ht.size == 999
+        with self.assertRaises(KeyError):
+            ht.delete_many([6, 1])
+        assert ht.contains(6) is False  # Deleted before the missing key
+
+    def test_set_many_with_generators(self):
+        ht = IntHashTable()
+        ht.set_many((key for key in range(10)),
+                    (key * 0.5 for key in range(10)))
+        assert ht.size == 10
+        assert ht.get(9) == 4.5
+
+    def test_value_of_wrong_type(self):
+        ht = IntHashTable(value_type='q')
+        with self.assertRaises(TypeError):
+            ht.set(1, 1.5)
+        assert ht.contains(1) is False
+        assert ht.size == 0
+        ht = IntHashTable()
+        ht.set(2, 1.0)
+        with self.assertRaises(TypeError):
+            ht.set(2, 'x')  # Update keeps the old value
+        assert ht.get(2) == 1.0
+        with self.assertRaises(TypeError):
+            ht.set_many([3, 4, 5], [1.0, 2.0, 'x'])
+        with self.assertRaises(TypeError):
+            ht.set_many([(6, 1.0), (7, 'x')])
+        assert list(ht.keys()) == [2]
+        assert ht.size == 1
+
+    def test_views(self):
+        ht = IntHashTable(iterable=[(1, 1.0), (2, 2.0)])
+        self.assertCountEqual(ht.keys(), [1, 2])
+        self.assertCountEqual(ht.values(), [1.0, 2.0])
+        self.assertCountEqual(ht.items(), [(1, 1.0), (2, 2.0)])
+        assert len(ht.items()) == 2
+        self.assertCountEqual(ht, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
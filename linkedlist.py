@@ -2,6 +2,9 @@
 
 class Node(object):
 
+    # Slots instead of a per-instance __dict__ make every node much smaller
+    __slots__ = ('data', 'next')
+
     def __init__(self, data):
         """Initialize this node with the given data."""
         self.data = data
@@ -12,17 +15,65 @@ class Node(object):
         return 'Node({!r})'.format(self.data)
 
 
+class NodePool(object):
+    """Free list of nodes that were deleted from linked lists, so adding an
+    item can reuse one instead of allocating a new node. Fewer allocations
+    also mean fewer garbage collections. The free nodes are chained through
+    their next pointers, so the pool needs no memory of its own. A pool can
+    be shared by several linked lists."""
+
+    def __init__(self, max_size=1024):
+        """Initialize this pool, which keeps at most max_size free nodes."""
+        self.max_size = max_size
+        self.head = None  # First free node
+        self.size = 0  # Number of free nodes
+        self.reused = 0  # Number of nodes handed out again
+
+    def __repr__(self):
+        """Return a string representation of this pool."""
+        return 'NodePool({} free nodes)'.format(self.size)
+
+    def acquire(self, data):
+        """Return a free node holding the given data, or a new node if this
+        pool is empty. Run time: O(1)"""
+        node = self.head
+        if node is None:
+            return Node(data)
+        self.head = node.next
+        self.size -= 1
+        self.reused += 1
+        node.data = data
+        node.next = None
+        return node
+
+    def release(self, node):
+        """Add the given node, which must no longer be used anywhere else, to
+        this pool, unless the pool is full. Run time: O(1)"""
+        if self.size < self.max_size:
+            node.data = None  # Don't keep the deleted item alive
+            node.next = self.head
+            self.head = node
+            self.size += 1
+
+
 class LinkedList(object):
 
-    def __init__(self, iterable=None):
-        """Initialize this linked list and append the given items, if any."""
+    def __init__(self, iterable=None, pool=None, indexed=False):
+        """Initialize this linked list and append the given items, if any.
+        If a NodePool is given, new nodes are taken from it and deleted nodes
+        are returned to it. If indexed is True, the list keeps a hash index
+        from each item to the node before it, which makes contains, count,
+        delete and replace O(1) on average, and its items must be unique and
+        hashable."""
         self.head = None  # First node
         self.tail = None  # Last node
         self.size = 0  # Number of nodes
-        # Append the given items
+        self.pool = pool
+        # Node before each item's node, or None for the head's item
+        self.predecessors = {} if indexed else None
+        # Link the given items in one pass
         if iterable is not None:
-            for item in iterable:
-                self.append(item)
+            self.extend(iterable)
 
     def __str__(self):
         """Return a formatted string representation of this linked list."""
@@ -109,7 +160,7 @@ class LinkedList(object):
         elif index == self.size: # If adding to end of LL
             self.append(item)
         else: # (1) index is valid (2) not adding to head or tail
-            new_node = Node(item) # create node from item data
+            new_node = self._new_node(item) # create node from item data
             cur_node = self.head # start at head
 
             while index > 1: # iterate thru LL until we reach index
@@ -120,12 +171,50 @@ class LinkedList(object):
             new_node.next = cur_node.next # get node's next pointer before re-assigning it            
             cur_node.next = new_node # re-assign node's next to new item 
             self.size += 1 # update LL size
+            if self.predecessors is not None:
+                self._index_link(cur_node, new_node)
+
+    def _new_node(self, item):
+        """Return a node holding the given item, from the pool if any."""
+        if self.predecessors is not None and item in self.predecessors:
+            raise ValueError('Item already in indexed list: {}'.format(item))
+        if self.pool is None:
+            return Node(item)
+        return self.pool.acquire(item)
+
+    def _index_link(self, previous, node):
+        """Record in the index that the given node was linked in after the
+        given previous node (None for the head). Run time: O(1) average"""
+        self.predecessors[node.data] = previous
+        if node.next is not None:
+            self.predecessors[node.next.data] = node
+
+    def _index_unlink(self, previous, node):
+        """Record in the index that the given node was unlinked from after the
+        given previous node (None for the head). Run time: O(1) average"""
+        del self.predecessors[node.data]
+        following = self.head if previous is None else previous.next
+        if following is not None:
+            self.predecessors[following.data] = previous
+
+    def _reindex(self):
+        """Rebuild the index from the nodes of this linked list.
+        Best and worst case running time: O(n)"""
+        self.predecessors.clear()
+        previous = None
+        node = self.head
+        while node is not None:
+            self.predecessors[node.data] = previous
+            previous = node
+            node = node.next
 
     def append(self, item):
         """Insert the given item at the tail of this linked list.
         Best and worst case running time: O(1) always takes same time"""
         # Create a new node to hold the given item
-        new_node = Node(item)
+        new_node = self._new_node(item)
+        if self.predecessors is not None:
+            self.predecessors[item] = self.tail
         # Check if this linked list is empty
         if self.is_empty():
             # Assign head to new node
@@ -142,7 +231,7 @@ class LinkedList(object):
         """Insert the given item at the head of this linked list.
         Best and worst case running time: O(1), always adding at head"""
         # Create a new node to hold the given item
-        new_node = Node(item)
+        new_node = self._new_node(item)
         # Check if this linked list is empty
         if self.is_empty():
             # Assign tail to new node
@@ -154,6 +243,170 @@ class LinkedList(object):
         self.size += 1
         # Update head to new node regardless
         self.head = new_node
+        if self.predecessors is not None:
+            self._index_link(None, new_node)
+
+    def extend(self, iterable):
+        """Insert the given items at the tail of this linked list, in order.
+        The new nodes are chained together first and the chain is linked
+        after the tail once, so no append call is made per item.
+        Best and worst case running time: O(k) for k items"""
+        if self.predecessors is not None:
+            # Each item must be checked and indexed as it is added
+            for item in iterable:
+                self.append(item)
+            return
+        new_node = Node if self.pool is None else self.pool.acquire
+        # Chain the new nodes after a placeholder node, so the loop needs no
+        # check for the first node
+        start = last = Node(None)
+        count = 0
+        for item in iterable:
+            last.next = last = new_node(item)
+            count += 1
+        first = start.next
+        if first is None:
+            return
+        # Link the chain after the tail
+        if self.tail is None:
+            self.head = first
+        else:
+            self.tail.next = first
+        self.tail = last
+        self.size += count
+
+    def concat(self, other):
+        """Move all nodes of the given other linked list to the tail of this
+        linked list by linking this tail to the other head. Other is left
+        empty, since its nodes now belong to this linked list.
+        Best and worst case running time: O(1), or O(m) to index the m moved
+        items if this linked list is indexed"""
+        if other is self:
+            raise ValueError('Cannot concatenate a linked list to itself')
+        if other.head is None:
+            return
+        if self.predecessors is not None:
+            for item in other:
+                if item in self.predecessors:
+                    raise ValueError(
+                        'Item already in indexed list: {}'.format(item))
+            previous = self.tail
+            node = other.head
+            while node is not None:
+                self.predecessors[node.data] = previous
+                previous = node
+                node = node.next
+        if self.tail is None:
+            self.head = other.head
+        else:
+            self.tail.next = other.head
+        self.tail = other.tail
+        self.size += other.size
+        other.head = None
+        other.tail = None
+        other.size = 0
+        if other.predecessors is not None:
+            other.predecessors.clear()
+
+    def split_at(self, index):
+        """Remove the items from the given index on from this linked list and
+        return them as a new linked list, or raise ValueError if the given
+        index is out of range of the list size. The nodes are moved, not
+        copied, and the new linked list uses the same pool as this one.
+        Best case running time: O(1) if splitting at the head
+        Worst case running time: O(n) to find the node before the index, or
+        to index the moved items if this linked list is indexed"""
+        if not (0 <= index <= self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        rest = LinkedList(pool=self.pool,
+                          indexed=self.predecessors is not None)
+        if index == self.size:
+            return rest
+        if index == 0:
+            # Move every node to the new list
+            rest.concat(self)
+            return rest
+        # Find the node before the given index, which becomes the new tail
+        node = self.head
+        for _ in range(index - 1):
+            node = node.next
+        rest.head = node.next
+        rest.tail = self.tail
+        rest.size = self.size - index
+        node.next = None
+        self.tail = node
+        self.size = index
+        if self.predecessors is not None:
+            # Move the index entries of the moved items to the new list
+            moved = rest.head
+            while moved is not None:
+                del self.predecessors[moved.data]
+                moved = moved.next
+            rest._reindex()
+        return rest
+
+    def sort(self, key=None):
+        """Sort the items of this linked list in place, in ascending order of
+        key(item), or of the items themselves if key is None. Items with equal
+        keys keep their order. This is a bottom-up merge sort that relinks the
+        existing nodes, so it needs no list of the items or new nodes: each
+        pass merges pairs of sorted runs of width nodes, doubling width until
+        one run is left. Keys are compared with < only, and computed again in
+        each pass rather than stored. An indexed list is reindexed after.
+        Best and worst case running time: O(n log n), with O(1) extra space"""
+        if self.size < 2:
+            return
+        if key is None:
+            key = _identity
+        # Placeholder node before the head, so runs are always linked after
+        # a node
+        start = Node(None)
+        start.next = self.head
+        width = 1
+        while True:
+            tail = start
+            node = start.next
+            merges = 0
+            while node is not None:
+                left = node
+                right = _cut(left, width)
+                node = _cut(right, width)
+                tail = _merge(tail, left, right, key)
+                merges += 1
+            if merges <= 1:
+                break
+            width *= 2
+        self.head = start.next
+        self.tail = tail
+        if self.predecessors is not None:
+            self._reindex()
+
+    def insert_sorted(self, item, key=None):
+        """Insert the given item into this linked list, which must already be
+        sorted by key, after all items whose key is not greater than its key,
+        so the list stays sorted without sorting it again.
+        Best case running time: O(1) if the item belongs at the tail, which
+        is checked first
+        Worst case running time: O(n) to find its place in the list"""
+        if key is None:
+            key = _identity
+        item_key = key(item)
+        if self.tail is None or not item_key < key(self.tail.data):
+            self.append(item)
+            return
+        if item_key < key(self.head.data):
+            self.prepend(item)
+            return
+        # Find the last node whose key is not greater than the item's key
+        node = self.head
+        while not item_key < key(node.next.data):
+            node = node.next
+        new_node = self._new_node(item)
+        new_node.next = node.next
+        node.next = new_node
+        self.size += 1
+        if self.predecessors is not None:
+            self._index_link(node, new_node)
 
     def find(self, quality):
         """Return an item from this linked list satisfying the given quality.
@@ -173,11 +426,91 @@ class LinkedList(object):
         # We never found data satisfying quality, but have to return something
         return None  # Constant time to return None
 
+    def find_key(self, key, key_hash=None):
+        """Return the first item in this linked list whose key attribute
+        equals the given key, and whose hash attribute equals key_hash if
+        given, or None. Like find with a quality function, but comparing
+        inline instead of calling a function for each node, so hash table
+        buckets of entries can be searched faster.
+        Best case running time: O(1) if item is near the head of the list.
+        Worst case running time: O(n) if item is not present."""
+        node = self.head
+        if key_hash is None:
+            while node is not None:
+                if node.data.key == key:
+                    return node.data
+                node = node.next
+        else:
+            while node is not None:
+                item = node.data
+                # Compare hashes first, since unequal keys' hashes often differ
+                if item.hash == key_hash and item.key == key:
+                    return item
+                node = node.next
+        return None
+
+    def index_of(self, item):
+        """Return the index of the first occurrence of the given item in this
+        linked list, or raise ValueError if it is not found.
+        Best case running time: O(1) if item is first item in list
+        Worst case running time: O(n) if item is near the tail or missing"""
+        index = 0
+        node = self.head
+        while node is not None:
+            if node.data == item:
+                return index
+            index += 1
+            node = node.next
+        raise ValueError('Item not in list: {}'.format(item))
+
+    def count(self, item):
+        """Return the number of occurrences of the given item in this linked
+        list. Best and worst case running time: O(n), or O(1) on average if
+        this linked list is indexed"""
+        if self.predecessors is not None:
+            return 1 if item in self.predecessors else 0
+        occurrences = 0
+        node = self.head
+        while node is not None:
+            if node.data == item:
+                occurrences += 1
+            node = node.next
+        return occurrences
+
+    def contains(self, item):
+        """Return True if the given item is in this linked list, or False.
+        Best case running time: O(1) if item is first item in list, or on
+        average if this linked list is indexed
+        Worst case running time: O(n) if item is not present"""
+        if self.predecessors is not None:
+            return item in self.predecessors
+        node = self.head
+        while node is not None:
+            if node.data == item:
+                return True
+            node = node.next
+        return False
+
     def replace(self, old_item, new_item):
         """Replace the given old_item in this linked list with given new_item
         using the same node, or raise ValueError if old_item is not found.
-        Best case running time: O(1) if old_item is first item in list
+        Best case running time: O(1) if old_item is first item in list, or on
+        average if this linked list is indexed
         Worst case running time: O(n) if old_item doesn't exist"""
+        if self.predecessors is not None:
+            if old_item not in self.predecessors:
+                raise ValueError('Item not in list: {}'.format(old_item))
+            if new_item != old_item and new_item in self.predecessors:
+                raise ValueError(
+                    'Item already in indexed list: {}'.format(new_item))
+            previous = self.predecessors.pop(old_item)
+            node = self.head if previous is None else previous.next
+            node.data = new_item
+            self.predecessors[new_item] = previous
+            return
+
+        if self.tail is None:  # empty list
+            raise ValueError('Item not in list: {}'.format(old_item))
 
         if self.tail.data == old_item: # check last item in list since append is common
             self.tail.data = new_item
@@ -196,9 +529,32 @@ class LinkedList(object):
         # we've gone thru entire LL without finding old_item
         raise ValueError('Item not in list: {}'.format(old_item))
 
+    def pop_left(self):
+        """Remove and return the item at the head of this linked list, or
+        raise ValueError if it is empty. Unlike delete, this doesn't compare
+        items, so it removes the head even if its item isn't equal to itself.
+        Best and worst case running time: O(1)"""
+        node = self.head
+        if node is None:
+            raise ValueError('List is empty')
+        self.head = node.next
+        if self.head is None:
+            self.tail = None
+        self.size -= 1
+        item = node.data
+        if self.predecessors is not None:
+            self._index_unlink(None, node)
+        # Recycle the unlinked node
+        if self.pool is not None:
+            self.pool.release(node)
+        else:
+            node.next = None
+        return item
+
     def delete(self, item):
         """Delete the given item from this linked list, or raise ValueError.
-        Best case running time:  O(1) if item is first item in list
+        Best case running time:  O(1) if item is first item in list, or on
+        average if this linked list is indexed
         Worst case running time: O(n) if item doesn't exist"""
         # Start at the head node
         node = self.head
@@ -206,6 +562,12 @@ class LinkedList(object):
         previous = None
         # Create a flag to track if we have found the given item
         found = False
+        if self.predecessors is not None:
+            # Look up the node before the given item instead of searching
+            if item in self.predecessors:
+                previous = self.predecessors[item]
+                node = self.head if previous is None else previous.next
+                found = True
         # Loop until we have found the given item or the node is None
         while not found and node is not None:
             # Check if the node's data matches the given item
@@ -240,12 +602,215 @@ class LinkedList(object):
                 self.tail = previous
             # Update size because node was found and deleted
             self.size -= 1
+            if self.predecessors is not None:
+                self._index_unlink(previous, node)
+            # Recycle the unlinked node
+            if self.pool is not None:
+                self.pool.release(node)
             return item
         else:
             # Otherwise raise an error to tell the user that delete has failed
             raise ValueError('Item not found: {}'.format(item))
 
 
+def _identity(item):
+    """Return the given item, the sort key used when no key is given."""
+    return item
+
+
+def _cut(node, count):
+    """Unlink the chain of nodes starting at the given node after count
+    nodes, and return the first node after the cut, or None if the chain is
+    not longer than count nodes. Run time: O(count)"""
+    while count > 1 and node is not None:
+        node = node.next
+        count -= 1
+    if node is None:
+        return None
+    rest = node.next
+    node.next = None
+    return rest
+
+
+def _merge(tail, left, right, key):
+    """Link the sorted chains of nodes starting at left and right after the
+    given tail node in sorted order, taking the left node first when keys are
+    equal, and return the last node linked. Each node's key is computed once.
+    Run time: O(l + r) for chains of l and r nodes"""
+    if right is None:
+        tail.next = left
+    else:
+        left_key = key(left.data)
+        right_key = key(right.data)
+        while True:
+            if right_key < left_key:
+                tail.next = tail = right
+                right = right.next
+                if right is None:
+                    tail.next = left
+                    break
+                right_key = key(right.data)
+            else:
+                tail.next = tail = left
+                left = left.next
+                if left is None:
+                    tail.next = right
+                    break
+                left_key = key(left.data)
+    # Walk to the end of the chain that was linked last
+    while tail.next is not None:
+        tail = tail.next
+    return tail
+
+
+class DoublyNode(Node):
+
+    __slots__ = ('prev',)
+
+    def __init__(self, data):
+        """Initialize this node with the given data and no neighbors."""
+        Node.__init__(self, data)
+        self.prev = None
+
+    def __repr__(self):
+        """Return a string representation of this node."""
+        return 'DoublyNode({!r})'.format(self.data)
+
+
+class DoublyLinkedList(object):
+    """Linked list whose nodes also point to their previous node. Adding an
+    item returns its node, which can later be removed or moved in O(1) time
+    without searching the list for it."""
+
+    def __init__(self, iterable=None):
+        """Initialize this linked list and append the given items, if any."""
+        self.head = None  # First node
+        self.tail = None  # Last node
+        self.size = 0  # Number of nodes
+        # Append the given items
+        if iterable is not None:
+            for item in iterable:
+                self.append(item)
+
+    def __str__(self):
+        """Return a formatted string representation of this linked list."""
+        items = ['({!r})'.format(item) for item in self.items()]
+        return '[{}]'.format(' <-> '.join(items))
+
+    def __repr__(self):
+        """Return a string representation of this linked list."""
+        return 'DoublyLinkedList({!r})'.format(self.items())
+
+    def __iter__(self):
+        node = self.head
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def items(self):
+        """Return a list of all items in this linked list.
+        Best and worst case running time: Theta(n) for n items in the list"""
+        return list(self)
+
+    def is_empty(self):
+        """Return True if this linked list is empty, or False."""
+        return self.head is None
+
+    def length(self):
+        """Return the number of items in this linked list.
+        Best and worst case running time: O(1) since size is kept up to date"""
+        return self.size
+
+    def _link_front(self, node):
+        """Link the given unlinked node in at the head of this linked list."""
+        node.prev = None
+        node.next = self.head
+        if self.head is None:
+            self.tail = node
+        else:
+            self.head.prev = node
+        self.head = node
+
+    def _unlink(self, node):
+        """Unlink the given node from its neighbors in this linked list."""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = None
+        node.next = None
+
+    def append(self, item):
+        """Insert the given item at the tail of this linked list and return
+        its node. Best and worst case running time: O(1)"""
+        node = DoublyNode(item)
+        node.prev = self.tail
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self.size += 1
+        return node
+
+    def prepend(self, item):
+        """Insert the given item at the head of this linked list and return
+        its node. Best and worst case running time: O(1)"""
+        node = DoublyNode(item)
+        self._link_front(node)
+        self.size += 1
+        return node
+
+    def insert_after(self, node, item):
+        """Insert the given item after the given node of this linked list and
+        return its node. Best and worst case running time: O(1)"""
+        new_node = DoublyNode(item)
+        new_node.prev = node
+        new_node.next = node.next
+        if node.next is None:
+            self.tail = new_node
+        else:
+            node.next.prev = new_node
+        node.next = new_node
+        self.size += 1
+        return new_node
+
+    def remove(self, node):
+        """Remove the given node from this linked list and return its item.
+        The node must belong to this linked list.
+        Best and worst case running time: O(1), no search is needed"""
+        self._unlink(node)
+        self.size -= 1
+        return node.data
+
+    def pop_left(self):
+        """Remove and return the item at the head of this linked list, or
+        raise ValueError if it is empty.
+        Best and worst case running time: O(1)"""
+        if self.head is None:
+            raise ValueError('List is empty')
+        return self.remove(self.head)
+
+    def pop_right(self):
+        """Remove and return the item at the tail of this linked list, or
+        raise ValueError if it is empty.
+        Best and worst case running time: O(1)"""
+        if self.tail is None:
+            raise ValueError('List is empty')
+        return self.remove(self.tail)
+
+    def move_to_front(self, node):
+        """Move the given node of this linked list to its head.
+        Best and worst case running time: O(1)"""
+        if node is not self.head:
+            self._unlink(node)
+            self._link_front(node)
+
+
 def test_linked_list():
     ll = LinkedList()
     print(ll)
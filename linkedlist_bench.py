@@ -0,0 +1,191 @@
+#!python
+"""Benchmarks of the linked list implementations in this folder.
+Run with: python linkedlist_bench.py"""
+
+from linkedlist import LinkedList, NodePool
+from skiplist import IndexableSkipList
+from unrolledlinkedlist import UnrolledLinkedList
+import random
+import time
+import tracemalloc
+
+
+def bytes_per_item(factory, count):
+    """Return the average number of bytes allocated per item when building a
+    list with the given factory and appending count items."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = factory()
+    for _ in range(count):
+        items.append(None)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return float(after - before) / count
+
+
+def ns_per_op(func, count, repeat=3):
+    """Return the best time in nanoseconds per call of func(count) divided
+    by count."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(count)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best / count * 1e9
+
+
+def benchmark_nodes(count=200000):
+    """Compare memory per node, and the speed of appending items and of
+    appending and deleting them in turn like a queue, with and without a
+    NodePool."""
+    def append_all(items):
+        def run(count):
+            for number in range(count):
+                items.append(number)
+        return run
+
+    def churn(items):
+        def run(count):
+            for number in range(count):
+                items.append(number)
+                items.delete(items.head.data)
+        return run
+
+    print('{} items'.format(count))
+    print('{:<10} {:>12} {:>10} {:>16}'.format('pool', 'bytes/node',
+                                               'append ns',
+                                               'append+delete ns'))
+    for name, factory in [('none', LinkedList),
+                          ('NodePool', lambda: LinkedList(pool=NodePool()))]:
+        memory = bytes_per_item(factory, count)
+        append_ns = ns_per_op(append_all(factory()), count)
+        churn_ns = ns_per_op(churn(factory()), count)
+        print('{:<10} {:>12.1f} {:>10.0f} {:>16.0f}'.format(
+            name, memory, append_ns, churn_ns))
+
+
+def benchmark_unrolled(count=200000, lookups=2000):
+    """Compare memory per item, iteration and indexed access of LinkedList
+    and UnrolledLinkedList."""
+    rng = random.Random(1)
+    indexes = [rng.randrange(count) for _ in range(lookups)]
+    print('{} items'.format(count))
+    print('{:<12} {:>12} {:>10} {:>14}'.format('list', 'bytes/item',
+                                               'iter ns', 'get_at_index ns'))
+    for name, factory in [('linked', LinkedList),
+                          ('unrolled', UnrolledLinkedList)]:
+        memory = bytes_per_item(factory, count)
+        items = factory(range(count))
+
+        def iterate(count):
+            for _ in items:
+                pass
+
+        def get_at_index(count):
+            for index in indexes:
+                items.get_at_index(index)
+        iter_ns = ns_per_op(iterate, count)
+        get_ns = ns_per_op(get_at_index, lookups, repeat=1)
+        print('{:<12} {:>12.1f} {:>10.0f} {:>14.0f}'.format(
+            name, memory, iter_ns, get_ns))
+
+
+def benchmark_bulk(count=200000):
+    """Compare building a list and joining two lists item by item through
+    append with extend and concat."""
+    def build_append(count):
+        items = LinkedList()
+        for number in range(count):
+            items.append(number)
+
+    def build_extend(count):
+        LinkedList().extend(range(count))
+
+    def join_append(count):
+        first, second = LinkedList(range(count)), LinkedList(range(count))
+        start = time.perf_counter()
+        for item in second:
+            first.append(item)
+        return time.perf_counter() - start
+
+    def join_concat(count):
+        first, second = LinkedList(range(count)), LinkedList(range(count))
+        start = time.perf_counter()
+        first.concat(second)
+        return time.perf_counter() - start
+
+    print('{} items'.format(count))
+    print('{:<8} {:>12} {:>12}'.format('', 'append ms', 'bulk ms'))
+    print('{:<8} {:>12.1f} {:>12.1f}'.format(
+        'build', ns_per_op(build_append, count) * count / 1e6,
+        ns_per_op(build_extend, count) * count / 1e6))
+    print('{:<8} {:>12.1f} {:>12.4f}'.format(
+        'join', join_append(count) * 1e3, join_concat(count) * 1e3))
+
+
+def benchmark_sort(count=200000):
+    """Compare time and peak memory of sorting a list in place with
+    LinkedList.sort and of sorting its items() and building a new list."""
+    def rebuild(items):
+        return LinkedList(sorted(items.items()))
+
+    def in_place(items):
+        items.sort()
+        return items
+
+    rng = random.Random(1)
+    numbers = [rng.random() for _ in range(count)]
+    print('{} items'.format(count))
+    print('{:<10} {:>10} {:>14}'.format('sort', 'ms', 'peak bytes'))
+    for name, func in [('rebuild', rebuild), ('in place', in_place)]:
+        items = LinkedList(numbers)
+        start = time.perf_counter()
+        func(items)
+        seconds = time.perf_counter() - start
+        # Measure memory in a separate run, since tracing slows it down
+        items = LinkedList(numbers)
+        tracemalloc.start()
+        func(items)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{:<10} {:>10.1f} {:>14}'.format(name, seconds * 1e3, peak))
+
+
+def benchmark_skiplist(count=1000000, ops=2000, linked_ops=20):
+    """Compare get_at_index and insert_at_index at random indexes of a list
+    of count items. LinkedList walks half the list per call on average, so
+    it only runs linked_ops calls."""
+    print('{} items'.format(count))
+    print('{:<12} {:>12} {:>18} {:>18}'.format('list', 'build s',
+                                               'get_at_index ns',
+                                               'insert_at_index ns'))
+    for name, factory, calls in [
+            ('linked', LinkedList, linked_ops),
+            ('unrolled', UnrolledLinkedList, ops),
+            ('skiplist', lambda items: IndexableSkipList(items, seed=1), ops)]:
+        rng = random.Random(1)
+        indexes = [rng.randrange(count) for _ in range(calls)]
+        start = time.perf_counter()
+        items = factory(range(count))
+        build_seconds = time.perf_counter() - start
+
+        def get_at_index(calls):
+            for index in indexes:
+                items.get_at_index(index)
+
+        def insert_at_index(calls):
+            for index in indexes:
+                items.insert_at_index(index, None)
+        get_ns = ns_per_op(get_at_index, calls, repeat=1)
+        insert_ns = ns_per_op(insert_at_index, calls, repeat=1)
+        print('{:<12} {:>12.2f} {:>18.0f} {:>18.0f}'.format(
+            name, build_seconds, get_ns, insert_ns))
+
+
+if __name__ == '__main__':
+    benchmark_nodes()
+    benchmark_unrolled()
+    benchmark_bulk()
+    benchmark_sort()
+    benchmark_skiplist()
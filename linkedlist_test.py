@@ -1,6 +1,7 @@
 #!python
 
-from linkedlist import LinkedList, Node
+from linkedlist import LinkedList, Node, NodePool, DoublyLinkedList
+import random
 import unittest
 
 
@@ -12,6 +13,52 @@ class NodeTest(unittest.TestCase):
         assert node.data is data
         assert node.next is None
 
+    def test_slots(self):
+        node = Node('A')
+        assert not hasattr(node, '__dict__')
+        with self.assertRaises(AttributeError):
+            node.other = 'B'
+
+
+class NodePoolTest(unittest.TestCase):
+
+    def test_reuse_deleted_nodes(self):
+        pool = NodePool()
+        ll = LinkedList(['A', 'B'], pool=pool)
+        node = ll.head
+        ll.delete('A')
+        assert pool.size == 1
+        assert node.data is None  # Deleted item is not kept alive
+        ll.append('C')
+        assert ll.tail is node  # Reused
+        assert node.data == 'C' and node.next is None
+        assert pool.size == 0
+        assert pool.reused == 1
+        assert ll.items() == ['B', 'C']
+
+    def test_shared_pool(self):
+        pool = NodePool()
+        first = LinkedList(['A'], pool=pool)
+        second = LinkedList(pool=pool)
+        node = first.head
+        first.delete('A')
+        second.prepend('B')
+        assert second.head is node
+        second.insert_at_index(1, 'C')
+        assert second.items() == ['B', 'C']
+
+    def test_max_size(self):
+        pool = NodePool(max_size=2)
+        ll = LinkedList(['A', 'B', 'C'], pool=pool)
+        for item in ['A', 'B', 'C']:
+            ll.delete(item)
+        assert pool.size == 2
+        for item in ['D', 'E', 'F']:
+            ll.append(item)
+        assert pool.size == 0
+        assert pool.reused == 2
+        assert ll.items() == ['D', 'E', 'F']
+
 
 class LinkedListTest(unittest.TestCase):
 
@@ -177,6 +224,262 @@ class LinkedListTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             ll.delete('X')  # item not in list
 
+    def test_extend(self):
+        ll = LinkedList(['A'])
+        ll.extend(iter(['B', 'C']))
+        assert ll.items() == ['A', 'B', 'C']
+        assert ll.tail.data == 'C' and ll.tail.next is None
+        assert ll.size == 3
+        ll.extend([])
+        assert ll.size == 3
+        ll = LinkedList(pool=NodePool())
+        ll.extend('DE')
+        assert ll.items() == ['D', 'E']
+        assert ll.head.data == 'D' and ll.tail.data == 'E'
+
+    def test_concat(self):
+        ll = LinkedList(['A', 'B'])
+        other = LinkedList(['C', 'D'])
+        other_tail = other.tail
+        ll.concat(other)
+        assert ll.items() == ['A', 'B', 'C', 'D']
+        assert ll.tail is other_tail
+        assert ll.size == 4
+        assert other.head is None and other.tail is None and other.size == 0
+        ll.concat(LinkedList())  # nothing to move
+        assert ll.size == 4
+        empty = LinkedList()
+        empty.concat(ll)
+        assert empty.items() == ['A', 'B', 'C', 'D']
+        assert ll.is_empty()
+        with self.assertRaises(ValueError):
+            empty.concat(empty)
+
+    def test_split_at(self):
+        ll = LinkedList(['A', 'B', 'C', 'D'])
+        rest = ll.split_at(1)
+        assert ll.items() == ['A'] and ll.tail.data == 'A'
+        assert rest.items() == ['B', 'C', 'D'] and rest.tail.data == 'D'
+        assert ll.size == 1 and rest.size == 3
+        assert rest.split_at(3).is_empty()  # at the end
+        assert rest.size == 3
+        head = rest.split_at(0)  # at the head
+        assert head.items() == ['B', 'C', 'D']
+        assert rest.is_empty()
+        with self.assertRaises(ValueError):
+            ll.split_at(2)  # index too high
+        with self.assertRaises(ValueError):
+            ll.split_at(-1)  # index too low
+
+    def test_sort(self):
+        ll = LinkedList([5, 2, 8, 1, 9, 3, 7])
+        nodes = set()
+        node = ll.head
+        while node is not None:
+            nodes.add(node)
+            node = node.next
+        ll.sort()
+        assert ll.items() == [1, 2, 3, 5, 7, 8, 9]
+        assert ll.head.data == 1
+        assert ll.tail.data == 9 and ll.tail.next is None
+        assert ll.size == 7
+        node = ll.head
+        while node is not None:
+            assert node in nodes  # Same nodes, relinked
+            node = node.next
+        ll = LinkedList()
+        ll.sort()  # Nothing to sort
+        assert ll.is_empty()
+
+    def test_sort_with_key_is_stable(self):
+        words = ['pear', 'fig', 'apple', 'kiwi', 'date', 'plum', 'banana']
+        ll = LinkedList(words)
+        ll.sort(key=len)
+        assert ll.items() == sorted(words, key=len)
+        assert ll.tail.data == 'banana'
+
+    def test_sort_against_sorted(self):
+        rng = random.Random(7)
+        for size in [2, 3, 31, 64, 100]:
+            items = [rng.randrange(20) for _ in range(size)]
+            ll = LinkedList(items)
+            ll.sort(key=lambda item: -item)
+            assert ll.items() == sorted(items, key=lambda item: -item)
+            assert ll.tail.data == ll.items()[-1]
+
+    def test_insert_sorted(self):
+        ll = LinkedList()
+        for item in [4, 1, 3, 5, 1, 2]:
+            ll.insert_sorted(item)
+        assert ll.items() == [1, 1, 2, 3, 4, 5]
+        assert ll.tail.data == 5
+        assert ll.size == 6
+        ll = LinkedList(['a', 'bb', 'ccc'])  # sorted by length
+        ll.insert_sorted('xy', key=len)
+        ll.insert_sorted('z', key=len)
+        assert ll.items() == ['a', 'z', 'bb', 'xy', 'ccc']
+
+    def test_find_key(self):
+        class Entry(object):
+            def __init__(self, key, hash):
+                self.key = key
+                self.hash = hash
+        first, second, third = Entry('A', 1), Entry('B', 2), Entry('B', 3)
+        ll = LinkedList([first, second, third])
+        assert ll.find_key('B') is second
+        assert ll.find_key('B', 3) is third
+        assert ll.find_key('A', 2) is None  # hash differs
+        assert ll.find_key('X') is None
+
+    def test_index_of_and_count(self):
+        ll = LinkedList(['A', 'B', 'A', 'C'])
+        assert ll.index_of('A') == 0
+        assert ll.index_of('C') == 3
+        with self.assertRaises(ValueError):
+            ll.index_of('X')  # item not in list
+        assert ll.count('A') == 2
+        assert ll.count('B') == 1
+        assert ll.count('X') == 0
+        assert ll.contains('C') is True
+        assert ll.contains('X') is False
+
+    def test_indexed(self):
+        ll = LinkedList(['B', 'C'], indexed=True)
+        ll.prepend('A')
+        ll.append('E')
+        ll.insert_at_index(3, 'D')
+        assert ll.items() == ['A', 'B', 'C', 'D', 'E']
+        assert ll.predecessors['A'] is None
+        assert ll.predecessors['D'].data == 'C'
+        assert ll.predecessors['E'].data == 'D'
+        assert ll.contains('C') and ll.count('C') == 1
+        assert ll.count('X') == 0
+        with self.assertRaises(ValueError):
+            ll.append('B')  # items must be unique
+        ll.replace('C', 'X')
+        assert ll.items() == ['A', 'B', 'X', 'D', 'E']
+        assert ll.predecessors['X'].data == 'B' and 'C' not in ll.predecessors
+        with self.assertRaises(ValueError):
+            ll.replace('X', 'A')  # already in list
+        with self.assertRaises(ValueError):
+            ll.replace('C', 'Y')  # not in list
+        ll.delete('B')  # middle
+        assert ll.predecessors['X'].data == 'A'
+        ll.delete('E')  # tail
+        assert ll.tail.data == 'D'
+        assert ll.pop_left() == 'A'
+        assert ll.predecessors['X'] is None
+        assert ll.items() == ['X', 'D']
+        assert sorted(ll.predecessors) == ['D', 'X']
+        with self.assertRaises(ValueError):
+            ll.delete('A')  # not in list
+
+    def test_indexed_bulk_operations(self):
+        ll = LinkedList([3, 1, 2], indexed=True)
+        ll.concat(LinkedList([5, 4]))
+        assert ll.predecessors[5].data == 2
+        with self.assertRaises(ValueError):
+            ll.concat(LinkedList([1]))  # duplicate
+        ll.sort()
+        assert ll.predecessors[1] is None and ll.predecessors[5].data == 4
+        rest = ll.split_at(2)
+        assert sorted(ll.predecessors) == [1, 2]
+        assert rest.predecessors[3] is None and rest.predecessors[5].data == 4
+        ll.insert_sorted(0)
+        ll.insert_sorted(1.5)
+        assert ll.items() == [0, 1, 1.5, 2]
+        assert ll.predecessors[2].data == 1.5
+        for item in [0, 1, 1.5, 2]:
+            ll.delete(item)
+        assert ll.is_empty() and ll.predecessors == {}
+
+    def test_pop_left(self):
+        ll = LinkedList(['A', 'B'], pool=NodePool())
+        assert ll.pop_left() == 'A'
+        assert ll.head.data == 'B' and ll.tail.data == 'B'
+        assert ll.pop_left() == 'B'
+        assert ll.head is None and ll.tail is None
+        assert ll.size == 0
+        assert ll.pool.size == 2  # Both nodes were recycled
+        with self.assertRaises(ValueError):
+            ll.pop_left()
+
+    def test_pop_left_without_equality(self):
+        nan = float('nan')  # Not equal to itself, so delete can't find it
+        ll = LinkedList([nan, None])
+        assert ll.pop_left() is nan
+        assert ll.pop_left() is None
+        assert ll.is_empty()
+
+
+class DoublyLinkedListTest(unittest.TestCase):
+
+    def test_init_with_list(self):
+        ll = DoublyLinkedList(['A', 'B', 'C'])
+        assert ll.head.data == 'A'
+        assert ll.tail.data == 'C'
+        assert ll.tail.prev.data == 'B'
+        assert ll.items() == ['A', 'B', 'C']
+        assert ll.length() == 3
+
+    def test_append_and_prepend_return_nodes(self):
+        ll = DoublyLinkedList()
+        node_b = ll.append('B')
+        node_a = ll.prepend('A')
+        node_c = ll.append('C')
+        assert node_a.data == 'A' and node_a.next is node_b
+        assert node_c.prev is node_b
+        assert ll.items() == ['A', 'B', 'C']
+
+    def test_remove(self):
+        ll = DoublyLinkedList()
+        nodes = [ll.append(item) for item in 'ABCD']
+        assert ll.remove(nodes[1]) == 'B'  # middle
+        assert ll.items() == ['A', 'C', 'D']
+        ll.remove(nodes[0])  # head
+        assert ll.head is nodes[2] and ll.head.prev is None
+        ll.remove(nodes[3])  # tail
+        assert ll.tail is nodes[2] and ll.tail.next is None
+        ll.remove(nodes[2])  # only node
+        assert ll.head is None and ll.tail is None
+        assert ll.size == 0
+
+    def test_insert_after(self):
+        ll = DoublyLinkedList()
+        node_a = ll.append('A')
+        node_c = ll.insert_after(node_a, 'C')  # after the tail
+        assert ll.tail is node_c
+        node_b = ll.insert_after(node_a, 'B')  # in the middle
+        assert node_b.prev is node_a and node_b.next is node_c
+        assert node_c.prev is node_b
+        assert ll.items() == ['A', 'B', 'C']
+        assert ll.size == 3
+
+    def test_pop_left_and_pop_right(self):
+        ll = DoublyLinkedList(['A', 'B', 'C'])
+        assert ll.pop_left() == 'A'
+        assert ll.pop_right() == 'C'
+        assert ll.head is ll.tail and ll.head.prev is None
+        assert ll.pop_right() == 'B'
+        assert ll.head is None and ll.tail is None
+        assert ll.size == 0
+        with self.assertRaises(ValueError):
+            ll.pop_left()
+        with self.assertRaises(ValueError):
+            ll.pop_right()
+
+    def test_move_to_front(self):
+        ll = DoublyLinkedList()
+        nodes = [ll.append(item) for item in 'ABC']
+        ll.move_to_front(nodes[2])
+        assert ll.items() == ['C', 'A', 'B']
+        assert ll.tail is nodes[1]
+        ll.move_to_front(nodes[0])
+        assert ll.items() == ['A', 'C', 'B']
+        ll.move_to_front(nodes[0])  # already at the head
+        assert ll.items() == ['A', 'C', 'B']
+        assert ll.size == 3
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,7 @@
 #!python
-from linkedlist import LinkedList # from folder.filename import Class
+from linkedlist import LinkedList, NodePool # from folder.filename import Class
+import threading
+import time
 
 
 # Implement LinkedQueue below, then change the assignment at the bottom
@@ -8,8 +10,9 @@ class LinkedQueue(object):
 
     def __init__(self, iterable=None):
         """Initialize this queue and enqueue the given items, if any."""
-        # Initialize a new linked list to store the items
-        self.list = LinkedList()
+        # Initialize a new linked list to store the items, recycling the nodes
+        # of removed items for the items added later
+        self.list = LinkedList(pool=NodePool())
         if iterable is not None:
             for item in iterable:
                 self.enqueue(item)
@@ -39,23 +42,30 @@ class LinkedQueue(object):
     
     def dequeue(self):
         """Remove and return item at front of queue or raise ValueError if queue empty
-        Running time: O(1) since only need to change pointer to head"""
-        head = self.front()
-        if head == None:
-            raise ValueError("list is empty")
-        else:
-            self.list.delete(head)
-            return head
+        Running time: O(1) since only need to change pointer to head, and
+        no items are compared so None or any other item can be queued"""
+        return self.list.pop_left()
 
 
 # Implement ArrayQueue below, then change the assignment at the bottom
 # to use this Queue implementation to verify it passes all tests
 class ArrayQueue(object):
+    """Queue stored in a circular buffer: a list whose length is a power of
+    two, with the front item at index head and the others after it, wrapping
+    around to the start of the list. Dequeuing just moves head forward
+    instead of shifting every remaining item. The buffer doubles when full
+    and halves when a quarter full, so it stays O(n) in size."""
+
+    MIN_CAPACITY = 8
 
     def __init__(self, iterable=None):
         """Initialize this queue and enqueue the given items, if any."""
-        # Initialize a new list (dynamic array) to store the items
-        self.list = list()
+        # Initialize a circular buffer (dynamic array) to store the items
+        self.list = [None] * self.MIN_CAPACITY
+        self.mask = self.MIN_CAPACITY - 1  # Wraps indexes around the buffer
+        self.shrink_size = -1  # Halve the buffer at this many items
+        self.head = 0  # Index of the front item
+        self.size = 0  # Number of items
         if iterable is not None:
             for item in iterable:
                 self.enqueue(item)
@@ -66,31 +76,188 @@ class ArrayQueue(object):
 
     def is_empty(self):
         """Return True if this queue is empty, or False otherwise."""
-        return True if self.length() <= 0 else False
+        return self.size == 0
 
     def length(self):
         """Return the number of items in this queue."""
-        return len(self.list)
-    
+        return self.size
+
+    def _resize(self, capacity):
+        """Move the items into a new buffer of the given capacity, starting
+        at its first index. Run time: O(n)"""
+        old = self.list
+        end = self.head + self.size
+        items = old[self.head:end] + old[:max(0, end - len(old))]
+        self.list = items + [None] * (capacity - self.size)
+        self.mask = capacity - 1
+        self.shrink_size = (capacity // 4 if capacity > self.MIN_CAPACITY
+                            else -1)
+        self.head = 0
+
     def enqueue(self, item):
         """ Insert given item at back of queue
-        Running time: O(1) unless reached maximum array size, then exceptionally O(n)"""
-        self.list.append(item)
+        Running time: O(1) amortized, O(n) when the buffer has to double"""
+        size = self.size
+        if size > self.mask:  # Full
+            self._resize(2 * size)
+        # Capacity is a power of two, so masking wraps the index around
+        self.list[(self.head + size) & self.mask] = item
+        self.size = size + 1
 
     def front(self):
         """Return the item at the front of this queue without removing it,
         or None if this queue is empty."""
-        return None if self.length() <= 0 else self.list[0]
+        return None if self.size == 0 else self.list[self.head]
 
     def dequeue(self):
         """Remove and return item at front of queue or raise ValueError if queue empty
-        Running time: O(n) since all array items have to shift"""
-        if self.front() == None:
+        Running time: O(1) amortized, O(n) when the buffer has to halve"""
+        size = self.size - 1
+        if size < 0:
             raise ValueError("list is empty")
-        else:
-            return self.list.pop(0)
+        items = self.list
+        head = self.head
+        item = items[head]
+        items[head] = None  # Don't keep the dequeued item alive
+        self.head = (head + 1) & self.mask
+        self.size = size
+        if size <= self.shrink_size:
+            self._resize(len(items) // 2)
+        return item
+
+class Empty(ValueError):
+    """Raised by BlockingQueue.get when no item arrives before the timeout.
+    Named like the standard library's queue.Empty, which this module
+    shadows."""
+
+
+class Full(ValueError):
+    """Raised by BlockingQueue.put when no space frees up before the
+    timeout. Named like the standard library's queue.Full."""
+
+
+class BlockingQueue(object):
+    """Thread-safe queue for any number of producer and consumer threads,
+    holding at most max_size items (no limit if max_size is 0) in an
+    ArrayQueue or LinkedQueue. get waits until an item is available and put
+    waits until there is space, on condition variables that share one lock.
+    The batch methods put_many and get_many take the lock once per batch
+    instead of once per item."""
+
+    def __init__(self, max_size=0, queue_class=ArrayQueue):
+        """Initialize this queue, holding at most max_size items (no limit if
+        max_size is 0) in a new instance of queue_class."""
+        self.queue = queue_class()
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # Waited on by get when empty and by put when full
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __repr__(self):
+        """Return a string representation of this queue."""
+        return 'BlockingQueue({} items, max_size={})'.format(
+            self.length(), self.max_size)
+
+    def is_empty(self):
+        """Return True if this queue is empty, or False otherwise. Other
+        threads may change that as soon as this returns."""
+        return self.queue.length() == 0
+
+    def length(self):
+        """Return the number of items in this queue."""
+        return self.queue.length()
+
+    def _space(self):
+        """Return how many more items fit in this queue right now."""
+        if self.max_size <= 0:
+            return float('inf')
+        return self.max_size - self.queue.length()
+
+    def _wait(self, condition, ready, deadline, error):
+        """Wait on the given condition, with the lock held, until ready()
+        returns True, or raise error if the deadline (None for no deadline)
+        passes first."""
+        while not ready():
+            if deadline is None:
+                condition.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise error
+                condition.wait(remaining)
+
+    @staticmethod
+    def _deadline(timeout):
+        """Return the time.monotonic() time after the given timeout in
+        seconds, or None if timeout is None (wait forever)."""
+        return None if timeout is None else time.monotonic() + timeout
+
+    def put(self, item, timeout=None):
+        """Insert the given item at the back of this queue, waiting up to
+        timeout seconds (forever if None) for space, or raise Full.
+        Running time: O(1) amortized, plus any time spent waiting"""
+        deadline = self._deadline(timeout)
+        with self.lock:
+            if self._space() <= 0:
+                self._wait(self.not_full, lambda: self._space() > 0,
+                           deadline, Full('Queue is full'))
+            self.queue.enqueue(item)
+            self.not_empty.notify()
+
+    def get(self, timeout=None):
+        """Remove and return the item at the front of this queue, waiting up
+        to timeout seconds (forever if None) for one, or raise Empty.
+        Running time: O(1) amortized, plus any time spent waiting"""
+        deadline = self._deadline(timeout)
+        with self.lock:
+            if self.queue.length() == 0:
+                self._wait(self.not_empty, lambda: self.queue.length() > 0,
+                           deadline, Empty('Queue is empty'))
+            item = self.queue.dequeue()
+            self.not_full.notify()
+            return item
+
+    def put_many(self, items, timeout=None):
+        """Insert the given items at the back of this queue in order, taking
+        the lock once for as many items as fit at a time, and waiting up to
+        timeout seconds in total (forever if None) for space, or raise Full.
+        Items put before the timeout stay in the queue.
+        Running time: O(k) amortized for k items, plus time spent waiting"""
+        items = list(items)
+        deadline = self._deadline(timeout)
+        done = 0
+        while done < len(items):
+            with self.lock:
+                if self._space() <= 0:
+                    self._wait(self.not_full, lambda: self._space() > 0,
+                               deadline,
+                               Full('Queue is full: {} of {} items put'.format(
+                                   done, len(items))))
+                count = min(len(items) - done, self._space())
+                for item in items[done:done + count]:
+                    self.queue.enqueue(item)
+                done += count
+                self.not_empty.notify(count)
+
+    def get_many(self, max_items, timeout=None):
+        """Remove and return a list of up to max_items items from the front
+        of this queue, taking the lock once. Wait up to timeout seconds
+        (forever if None) for at least one item, or raise Empty, but don't
+        wait for more.
+        Running time: O(k) amortized for k items, plus time spent waiting"""
+        deadline = self._deadline(timeout)
+        with self.lock:
+            if self.queue.length() == 0:
+                self._wait(self.not_empty, lambda: self.queue.length() > 0,
+                           deadline, Empty('Queue is empty'))
+            count = min(max_items, self.queue.length())
+            items = [self.queue.dequeue() for _ in range(count)]
+            self.not_full.notify(count)
+            return items
+
 
 # Implement LinkedQueue and ArrayQueue above, then change the assignment below
 # to use each of your Queue implementations to verify they each pass all tests
-Queue = LinkedQueue
-# Queue = ArrayQueue
+# Queue = LinkedQueue
+Queue = ArrayQueue
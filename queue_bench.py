@@ -0,0 +1,135 @@
+#!python
+"""Benchmarks of the queue implementations in this folder.
+Run with: python queue_bench.py"""
+
+from queue import ArrayQueue, BlockingQueue, LinkedQueue
+import collections
+import threading
+import time
+
+
+class ListQueue(object):
+    """The earlier ArrayQueue, which dequeues with list.pop(0), kept here as
+    a baseline."""
+
+    def __init__(self):
+        self.list = []
+
+    def enqueue(self, item):
+        self.list.append(item)
+
+    def dequeue(self):
+        return self.list.pop(0)
+
+
+class DequeQueue(object):
+    """Queue around collections.deque, as a reference for C speed."""
+
+    def __init__(self):
+        self.deque = collections.deque()
+
+    def enqueue(self, item):
+        self.deque.append(item)
+
+    def dequeue(self):
+        return self.deque.popleft()
+
+
+def seconds(func):
+    """Return the time in seconds that calling func takes."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def benchmark_drain(counts=(10000, 100000, 1000000)):
+    """Compare the time to enqueue count items and then dequeue them all."""
+    print('{:<10} {:>10} {:>14} {:>14}'.format('queue', 'items',
+                                               'enqueue ns', 'dequeue ns'))
+    for count in counts:
+        for name, factory in [('list', ListQueue), ('linked', LinkedQueue),
+                              ('array', ArrayQueue), ('deque', DequeQueue)]:
+            if factory is ListQueue and count > 100000:
+                continue  # Quadratic, would take minutes
+            queue = factory()
+
+            def fill():
+                for number in range(count):
+                    queue.enqueue(number)
+
+            def drain():
+                for _ in range(count):
+                    queue.dequeue()
+            fill_ns = seconds(fill) / count * 1e9
+            drain_ns = seconds(drain) / count * 1e9
+            print('{:<10} {:>10} {:>14.0f} {:>14.0f}'.format(
+                name, count, fill_ns, drain_ns))
+
+
+def benchmark_steady(depth=1000, count=1000000):
+    """Compare the time per enqueue and dequeue pair on a queue that stays
+    at the given depth, like a work queue between a producer and consumer."""
+    print('{} items deep'.format(depth))
+    print('{:<10} {:>16}'.format('queue', 'enqueue+dequeue ns'))
+    for name, factory in [('linked', LinkedQueue), ('array', ArrayQueue),
+                          ('deque', DequeQueue)]:
+        queue = factory()
+        for number in range(depth):
+            queue.enqueue(number)
+
+        def churn():
+            for number in range(count):
+                queue.enqueue(number)
+                queue.dequeue()
+        print('{:<10} {:>16.0f}'.format(name, seconds(churn) / count * 1e9))
+
+
+def benchmark_threads(thread_counts=(1, 4, 16), count=200000, max_size=1024,
+                      batch=64):
+    """Compare the throughput of a BlockingQueue passing count items from
+    producer threads to as many consumer threads, one item at a time and in
+    batches. Threads are plain threads: concurrent.futures imports the
+    standard library queue module, which this folder's queue.py shadows."""
+    print('{} items, max_size={}, batch={}'.format(count, max_size, batch))
+    print('{:<8} {:>14} {:>14}'.format('threads', 'single items/s',
+                                       'batch items/s'))
+    for thread_count in thread_counts:
+        share = count // thread_count
+        rates = []
+        for batched in (False, True):
+            queue = BlockingQueue(max_size)
+
+            def produce():
+                if batched:
+                    for start in range(0, share, batch):
+                        queue.put_many(range(start, min(start + batch, share)))
+                else:
+                    for number in range(share):
+                        queue.put(number)
+
+            def consume():
+                if batched:
+                    remaining = share
+                    while remaining:
+                        remaining -= len(queue.get_many(min(batch, remaining)))
+                else:
+                    for _ in range(share):
+                        queue.get()
+            threads = ([threading.Thread(target=produce)
+                        for _ in range(thread_count)] +
+                       [threading.Thread(target=consume)
+                        for _ in range(thread_count)])
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            rates.append(share * thread_count /
+                         (time.perf_counter() - start))
+        print('{:<8} {:>14.0f} {:>14.0f}'.format(thread_count, *rates))
+
+
+if __name__ == '__main__':
+    benchmark_drain()
+    benchmark_steady()
+    benchmark_threads()
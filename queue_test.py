@@ -1,6 +1,10 @@
 #!python
 
-from queue import Queue
+from queue import Queue, LinkedQueue, ArrayQueue, BlockingQueue, Empty, Full
+import collections
+import random
+import threading
+import time
 import unittest
 
 
@@ -68,5 +72,152 @@ class QueueTest(unittest.TestCase):
             q.dequeue()
 
 
+class LinkedQueueTest(unittest.TestCase):
+
+    def test_dequeue_without_equality(self):
+        nan = float('nan')  # Not equal to itself
+        items = LinkedQueue()
+        items.enqueue(None)
+        items.enqueue(nan)
+        assert items.dequeue() is None
+        assert items.dequeue() is nan
+        assert items.is_empty() is True
+        with self.assertRaises(ValueError):
+            items.dequeue()
+
+
+class ArrayQueueTest(unittest.TestCase):
+
+    def test_wrap_around(self):
+        q = ArrayQueue()
+        for item in range(6):
+            q.enqueue(item)
+        for item in range(4):
+            assert q.dequeue() == item
+        for item in range(6, 12):
+            q.enqueue(item)  # wraps around to the start of the buffer
+        assert len(q.list) == ArrayQueue.MIN_CAPACITY
+        assert [q.dequeue() for _ in range(8)] == list(range(4, 12))
+        assert q.is_empty() is True
+
+    def test_grow_and_shrink(self):
+        q = ArrayQueue(range(100))
+        assert len(q.list) == 128
+        assert q.length() == 100
+        for item in range(99):
+            assert q.dequeue() == item
+        assert len(q.list) == ArrayQueue.MIN_CAPACITY
+        assert q.front() == 99
+        assert q.dequeue() == 99
+
+    def test_none_items(self):
+        q = ArrayQueue([None, 'A'])
+        assert q.length() == 2
+        assert q.dequeue() is None
+        assert q.dequeue() == 'A'
+        with self.assertRaises(ValueError):
+            q.dequeue()
+
+    def test_against_deque(self):
+        rng = random.Random(3)
+        q = ArrayQueue()
+        expected = collections.deque()
+        for number in range(5000):
+            if rng.random() < 0.55 or not expected:
+                q.enqueue(number)
+                expected.append(number)
+            else:
+                assert q.dequeue() == expected.popleft()
+            assert q.front() == (expected[0] if expected else None)
+        assert q.length() == len(expected)
+
+
+class BlockingQueueTest(unittest.TestCase):
+
+    def test_put_and_get(self):
+        for queue_class in (ArrayQueue, LinkedQueue):
+            q = BlockingQueue(queue_class=queue_class)
+            q.put('A')
+            q.put('B')
+            assert q.length() == 2
+            assert q.get() == 'A'
+            assert q.get() == 'B'
+            assert q.is_empty() is True
+
+    def test_timeouts(self):
+        q = BlockingQueue(max_size=1)
+        with self.assertRaises(Empty):
+            q.get(timeout=0.01)
+        q.put('A')
+        start = time.monotonic()
+        with self.assertRaises(Full):
+            q.put('B', timeout=0.05)
+        assert time.monotonic() - start >= 0.04
+        with self.assertRaises(ValueError):  # Full is a ValueError
+            q.put('B', timeout=0)
+        assert q.get(timeout=0) == 'A'
+
+    def test_put_waits_for_get(self):
+        q = BlockingQueue(max_size=1)
+        q.put('A')
+        thread = threading.Thread(target=q.put, args=('B',))
+        thread.start()
+        time.sleep(0.02)
+        assert thread.is_alive()  # Waiting for space
+        assert q.get() == 'A'
+        thread.join(1)
+        assert not thread.is_alive()
+        assert q.get() == 'B'
+
+    def test_put_many_and_get_many(self):
+        q = BlockingQueue(max_size=3)
+        q.put_many(['A', 'B'])
+        assert q.get_many(5) == ['A', 'B']  # Doesn't wait for more
+        with self.assertRaises(Full):
+            q.put_many('CDEF', timeout=0.01)
+        assert q.length() == 3  # Items put before the timeout stay
+        assert q.get_many(2) == ['C', 'D']
+        assert q.get_many(2) == ['E']
+        with self.assertRaises(Empty):
+            q.get_many(2, timeout=0.01)
+
+    def test_put_many_waits_for_space(self):
+        q = BlockingQueue(max_size=4)
+        received = []
+
+        def consume():
+            while len(received) < 100:
+                received.extend(q.get_many(3))
+        thread = threading.Thread(target=consume)
+        thread.start()
+        q.put_many(range(100))
+        thread.join(5)
+        assert received == list(range(100))
+
+    def test_producers_and_consumers(self):
+        q = BlockingQueue(max_size=8)
+        received = []
+        lock = threading.Lock()
+
+        def produce(start):
+            for item in range(start, start + 500):
+                q.put(item)
+
+        def consume():
+            for _ in range(500):
+                item = q.get(timeout=5)
+                with lock:
+                    received.append(item)
+        threads = ([threading.Thread(target=produce, args=(start,))
+                    for start in range(0, 2000, 500)] +
+                   [threading.Thread(target=consume) for _ in range(4)])
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        assert sorted(received) == list(range(2000))
+        assert q.is_empty() is True
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -21,12 +21,19 @@ class Set(HashTable):
 
     def __iter__(self):
         """Make the Set iterable and return the keys of the items."""
-        for item in self.keys():
-            yield item
+        return self._iter_keys()
 
     def __repr__(self):
         """Return a string representation of this Set."""
-        return '({!r})'.format(self.keys())
+        return '({!r})'.format(list(self.keys()))
+
+    @classmethod
+    def load(cls, fp, hash_func=None):
+        """Return a new Set read from a snapshot in the given binary file,
+        with room for as many more items as the default max_size allows."""
+        loaded_set = super(Set, cls).load(fp, hash_func)
+        loaded_set.max_size = max(loaded_set.max_size, loaded_set.size * 3 + 10)
+        return loaded_set
 
     def add(self, element):
         """
@@ -1,4 +1,5 @@
 from set import Set
+import io
 import unittest
 
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
@@ -35,10 +36,10 @@ class SetTest(unittest.TestCase):
         add element to this set, if not present already
         """
         s = Set([], 3)
-        assert s.keys() == []
+        assert list(s.keys()) == []
         s.add('I')
         assert s.size == 1
-        assert s.keys() == ['I']
+        assert list(s.keys()) == ['I']
         s.add('V')
         assert s.size == 2
         self.assertCountEqual(s.keys(), ['I', 'V'])  # Ignore item order
@@ -124,6 +125,21 @@ class SetTest(unittest.TestCase):
         s2.add('B')
         assert s1.is_subset(s2) == False
 
+    def test_dump_and_load(self):
+        """
+        write this set to a snapshot and read it back
+        """
+        s = Set(['I', 'V', 'X'])
+        snapshot = io.BytesIO()
+        s.dump(snapshot)
+        snapshot.seek(0)
+        loaded = Set.load(snapshot)
+        assert isinstance(loaded, Set)
+        self.assertCountEqual(loaded.keys(), ['I', 'V', 'X'])
+        assert loaded.max_size == 19
+        loaded.add('L')
+        assert loaded.contains('L') == True
+
     # *----------------------------------------------*
     # Begin Stretch Challenge Tests
 
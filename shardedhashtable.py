@@ -0,0 +1,131 @@
+#!python
+from hashtable import HashTable # from folder.filename import Class
+import threading
+
+
+class ShardedHashTable(object):
+    """Thread-safe hash table that partitions keys across several HashTable
+    shards, each guarded by its own lock, so threads working on keys in
+    different shards don't wait for each other."""
+
+    def __init__(self, shard_count=16, init_size=8):
+        """Initialize this hash table with the given number of shards, each
+        a HashTable with the given initial size."""
+        if shard_count < 1:
+            raise ValueError('Need at least one shard: {}'.format(shard_count))
+        self.shards = [HashTable(init_size) for _ in range(shard_count)]
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'ShardedHashTable({!r})'.format(self.items())
+
+    def __iter__(self):
+        """Generate each key in a snapshot of this hash table's keys."""
+        return iter(self.keys())
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.length()
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _shard_index(self, key):
+        """Return the index of the shard the given key is stored in.
+        The hash is scrambled by a multiplication first, since each shard
+        picks a bucket using the low bits of the same hash: taking those bits
+        here too would leave most buckets of every shard empty."""
+        mixed = ((hash(key) & 0xFFFFFFFFFFFFFFFF) *
+                 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return (mixed >> 32) % len(self.shards)
+
+    def _snapshot(self, method):
+        """Return a list of the results of calling the given view method on
+        every shard, each one taken while holding that shard's lock."""
+        result = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result.extend(method(shard))
+        return result
+
+    def keys(self):
+        """Return a list of all keys in this hash table. Each shard is copied
+        atomically, but other threads may change other shards meanwhile.
+        Run time: O(n + b) where b is the total # of buckets"""
+        return self._snapshot(HashTable.keys)
+
+    def values(self):
+        """Return a list of all values in this hash table, copied shard by
+        shard. Run time: O(n + b)"""
+        return self._snapshot(HashTable.values)
+
+    def items(self):
+        """Return a list of all entries (key-value pairs) in this hash table,
+        copied shard by shard. Run time: O(n + b)"""
+        return self._snapshot(HashTable.items)
+
+    def length(self):
+        """Return the number of key-value entries in this hash table.
+        Run time: O(s) where s is the number of shards"""
+        return sum(shard.size for shard in self.shards)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) on average"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].contains(key)
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def set(self, key, value=None):
+        """Insert or update the given key with its associated value.
+        Run time: O(1) on average, O(n / s) when the shard has to resize"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            self.shards[index].set(key, value)
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError.
+        Run time: O(1) on average"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            self.shards[index].delete(key)
+
+    def get_or_set(self, key, default=None):
+        """Return the value associated with the given key, or atomically set
+        it to the given default and return that if the key is not found.
+        Run time: O(1) on average"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            shard = self.shards[index]
+            entry = shard._find(key)
+            if entry is not None:
+                return entry.value
+            shard.set(key, default)
+            return default
+
+    def compare_and_set(self, key, expected, value):
+        """Atomically set the given key to the given value if it is currently
+        associated with the expected value, and return True, or else return
+        False without changing anything. Run time: O(1) on average"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            shard = self.shards[index]
+            entry = shard._find(key)
+            if entry is None or entry.value != expected:
+                return False
+            entry.value = value
+            return True
@@ -0,0 +1,79 @@
+#!python
+
+from shardedhashtable import ShardedHashTable
+import threading
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class ShardedHashTableTest(unittest.TestCase):
+
+    def test_init(self):
+        ht = ShardedHashTable(4)
+        assert len(ht.shards) == 4
+        assert ht.length() == 0
+        with self.assertRaises(ValueError):
+            ShardedHashTable(0)
+
+    def test_set_get_and_delete(self):
+        ht = ShardedHashTable()
+        ht.set('I', 1)
+        ht.set('V', 4)
+        ht.set('V', 5)  # Update value
+        assert ht.get('I') == 1
+        assert ht.get('V') == 5
+        assert ht.length() == len(ht) == 2
+        assert ht.contains('I') is True
+        assert 'A' not in ht
+        ht.delete('I')
+        with self.assertRaises(KeyError):
+            ht.get('I')
+        with self.assertRaises(KeyError):
+            ht.delete('I')
+        self.assertCountEqual(ht.items(), [('V', 5)])
+
+    def test_keys_spread_over_shards(self):
+        ht = ShardedHashTable(4)
+        for number in range(400):
+            ht.set(number, number)
+        assert all(shard.size > 50 for shard in ht.shards)
+        self.assertCountEqual(ht.keys(), range(400))
+        self.assertCountEqual(ht.values(), range(400))
+
+    def test_get_or_set(self):
+        ht = ShardedHashTable()
+        assert ht.get_or_set('I', 1) == 1
+        assert ht.get_or_set('I', 2) == 1
+        assert ht.get('I') == 1
+
+    def test_compare_and_set(self):
+        ht = ShardedHashTable()
+        assert ht.compare_and_set('I', None, 1) is False  # Key not found
+        ht.set('I', 1)
+        assert ht.compare_and_set('I', 2, 3) is False
+        assert ht.compare_and_set('I', 1, 3) is True
+        assert ht.get('I') == 3
+
+    def test_concurrent_increments(self):
+        ht = ShardedHashTable(4)
+
+        def increment(times):
+            for number in range(times):
+                key = number % 10
+                while True:
+                    old = ht.get_or_set(key, 0)
+                    if ht.compare_and_set(key, old, old + 1):
+                        break
+        threads = [threading.Thread(target=increment, args=(1000,))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(ht.values()) == 4000
+
+
+if __name__ == '__main__':
+    unittest.main()
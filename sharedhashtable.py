@@ -0,0 +1,307 @@
+#!python
+from hashtable import KeysView, ValuesView, ItemsView, round_up_power_of_two
+from diskhashtable import SLOT, RECORD, EMPTY, encode, encode_key, stable_hash
+from multiprocessing import shared_memory
+import pickle
+import struct
+
+# Control block layout: magic, version, generation of the current data block
+CONTROL = struct.Struct('<4sIQ')
+CONTROL_MAGIC = b'HTSC'
+# Data block layout, all integers little-endian:
+#   header: magic, version, generation, capacity, size
+#   slots:  capacity (hash, offset) pairs as in a DiskHashTable, where offset
+#           points to a record in the heap, or is EMPTY
+#   heap:   records of (key length, value length, key bytes, value bytes)
+HEADER = struct.Struct('<4sIQQQ')
+MAGIC = b'HTSD'
+VERSION = 1
+
+
+def data_block_name(name, generation):
+    """Return the name of the data block holding the given generation of the
+    shared hash table with the given name."""
+    return '{}_{}'.format(name, generation)
+
+
+def attach(name):
+    """Return the existing shared memory block with the given name."""
+    try:
+        # Only the creator should unlink the block when it exits
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 attached blocks are always tracked, which is
+        # harmless for forked workers since they share the creator's tracker
+        return shared_memory.SharedMemory(name)
+
+
+class SharedHashTable(object):
+    """Read-only hash table stored in shared memory, so that processes on
+    the same machine can all look up entries in a single copy of it.
+    One writer process creates the table and publishes its contents, and
+    other processes attach to it by name and read it without any locking.
+    Each publish writes a complete new data block and then bumps the
+    generation in a small control block, which readers check before every
+    lookup to switch over to the newest data block. Keys and values are
+    pickled and hashed as in a DiskHashTable, so keys that are equal but of
+    different types (such as 1 and 1.0) are different keys here."""
+
+    def __init__(self, name=None, create=False, items=()):
+        """Attach to the shared hash table with the given name, or if create
+        is True, create one (with a random name if name is None) holding the
+        given (key, value) pairs or the entries of the given mapping."""
+        self.owner = create
+        self.block = None  # Data block of the generation being read
+        self.generation = 0
+        if create:
+            self.control = shared_memory.SharedMemory(name, create=True,
+                                                      size=CONTROL.size)
+            self.name = self.control.name
+            self.publish(items)
+        else:
+            self.control = attach(name)
+            self.name = name
+            if CONTROL.unpack_from(self.control.buf, 0)[0] != CONTROL_MAGIC:
+                self.control.close()
+                raise ValueError('Not a shared hash table: {}'.format(name))
+            self._refresh()
+
+    def close(self):
+        """Detach from this hash table's shared memory. If this process
+        created the hash table, also remove it, although processes that are
+        still attached keep reading the data they mapped."""
+        if self.owner:
+            self.block.unlink()
+            self.control.unlink()
+        self.block.close()
+        self.control.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __str__(self):
+        """Return a formatted string representation of this hash table."""
+        items = ['{!r}: {!r}'.format(key, val) for key, val in self.items()]
+        return '{' + ', '.join(items) + '}'
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'SharedHashTable({!r})'.format(self.name)
+
+    def __iter__(self):
+        """Generate each key in this hash table."""
+        return self._iter_keys()
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        self._refresh()
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def _refresh(self):
+        """Switch to the data block of the current generation if a newer one
+        was published, and return True if so, or False. Raise ValueError if
+        that block was removed because the creator closed this hash table.
+        Run time: O(1)"""
+        while True:
+            generation = CONTROL.unpack_from(self.control.buf, 0)[2]
+            if generation == self.generation:
+                return False
+            try:
+                block = attach(data_block_name(self.name, generation))
+            except FileNotFoundError:
+                # A block is only removed after the generation moves past it,
+                # or when the creator closes the hash table
+                if CONTROL.unpack_from(self.control.buf, 0)[2] == generation:
+                    raise ValueError('Shared hash table was removed: {}'
+                                     .format(self.name))
+                # Replaced by an even newer generation while attaching, so
+                # read the generation again
+                continue
+            # The old block is closed once iterators still reading it finish
+            self.block = block
+            self.generation = generation
+            _, _, _, self.capacity, self.size = HEADER.unpack_from(block.buf, 0)
+            return True
+
+    def publish(self, items):
+        """Replace the contents of this hash table with the given (key,
+        value) pairs or the entries of the given mapping. Readers keep seeing
+        the old contents until their next lookup after this returns.
+        Run time: O(n) where n is the number of entries given"""
+        if not self.owner:
+            raise ValueError('Only the creator can publish: {}'.format(
+                self.name))
+        if hasattr(items, 'items'):
+            items = items.items()
+        records = []
+        for key, value in items:
+            key_bytes = encode_key(key)
+            records.append((stable_hash(key_bytes), key_bytes, encode(value)))
+        generation = self.generation + 1
+        old_block = self.block
+        self.block = self._build(records, generation)
+        self.generation = generation
+        _, _, _, self.capacity, self.size = HEADER.unpack_from(
+            self.block.buf, 0)
+        # Readers only look for the new block once the generation changes
+        CONTROL.pack_into(self.control.buf, 0, CONTROL_MAGIC, VERSION,
+                          generation)
+        if old_block is not None:
+            old_block.unlink()
+            old_block.close()
+
+    def _build(self, records, generation):
+        """Return a new data block holding the given (hash, key bytes, value
+        bytes) records, with a later record replacing an earlier one with the
+        same key, and enough slots to keep the load factor at most 0.75."""
+        capacity = round_up_power_of_two(max(8, len(records) * 4 // 3 + 1))
+        heap_start = HEADER.size + capacity * SLOT.size
+        heap_size = sum(RECORD.size + len(key_bytes) + len(value_bytes)
+                        for _, key_bytes, value_bytes in records)
+        block = shared_memory.SharedMemory(
+            data_block_name(self.name, generation), create=True,
+            size=heap_start + heap_size)
+        buf = block.buf  # New shared memory is zeroed, so every slot is EMPTY
+        mask = capacity - 1
+        offset = heap_start
+        size = 0
+        for key_hash, key_bytes, value_bytes in records:
+            RECORD.pack_into(buf, offset, len(key_bytes), len(value_bytes))
+            start = offset + RECORD.size
+            end = start + len(key_bytes) + len(value_bytes)
+            buf[start:end] = key_bytes + value_bytes
+            index = key_hash & mask
+            while True:
+                slot_hash, slot_offset = SLOT.unpack_from(
+                    buf, HEADER.size + index * SLOT.size)
+                if slot_offset == EMPTY:
+                    size += 1
+                    break
+                if (slot_hash == key_hash and
+                        self._record_key(buf, slot_offset) == key_bytes):
+                    break  # Point the slot at the newer record below
+                index = (index + 1) & mask
+            SLOT.pack_into(buf, HEADER.size + index * SLOT.size, key_hash,
+                           offset)
+            offset = end
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, generation, capacity, size)
+        return block
+
+    @staticmethod
+    def _record_key(buf, offset):
+        """Return the key bytes of the record at the given offset."""
+        key_length = RECORD.unpack_from(buf, offset)[0]
+        start = offset + RECORD.size
+        return bytes(buf[start:start + key_length])
+
+    @staticmethod
+    def _record_value(buf, offset):
+        """Return the value bytes of the record at the given offset."""
+        key_length, value_length = RECORD.unpack_from(buf, offset)
+        start = offset + RECORD.size + key_length
+        return bytes(buf[start:start + value_length])
+
+    def _find_offset(self, key):
+        """Return the offset of the record with the given key, or EMPTY if
+        not found. Run time: O(1) on average"""
+        self._refresh()
+        buf = self.block.buf
+        key_bytes = encode_key(key)
+        key_hash = stable_hash(key_bytes)
+        mask = self.capacity - 1
+        index = key_hash & mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(buf,
+                                                 HEADER.size + index * SLOT.size)
+            if offset == EMPTY or (slot_hash == key_hash and
+                                   self._record_key(buf, offset) == key_bytes):
+                return offset
+            index = (index + 1) & mask
+
+    def _iter_records(self):
+        """Generate the (key bytes, value bytes) of each entry in the data
+        block that was current when iteration started."""
+        self._refresh()
+        block = self.block  # Keeps the block open until iteration ends
+        for index in range(self.capacity):
+            offset = SLOT.unpack_from(block.buf,
+                                      HEADER.size + index * SLOT.size)[1]
+            if offset != EMPTY:
+                yield (self._record_key(block.buf, offset),
+                       self._record_value(block.buf, offset))
+
+    def _iter_keys(self):
+        """Generate each key in this hash table."""
+        for key_bytes, _ in self._iter_records():
+            yield pickle.loads(key_bytes)
+
+    def _iter_values(self):
+        """Generate each value in this hash table."""
+        for _, value_bytes in self._iter_records():
+            yield pickle.loads(value_bytes)
+
+    def _iter_items(self):
+        """Generate each (key, value) pair in this hash table."""
+        for key_bytes, value_bytes in self._iter_records():
+            yield (pickle.loads(key_bytes), pickle.loads(value_bytes))
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Run time: O(1) to create the view, O(c) to iterate it where c is the
+        number of slots"""
+        return KeysView(self)
+
+    def values(self):
+        """Return a live view of all values in this hash table."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return a live view of all entries (key-value pairs)."""
+        return ItemsView(self)
+
+    def load_factor(self):
+        """Return the load factor, the ratio of number of entries to slots."""
+        self._refresh()
+        return float(self.size) / self.capacity
+
+    def length(self):
+        """Return the number of key-value entries by traversing its slots.
+        Run time: O(c) where c is the number of slots"""
+        return sum(1 for _ in self._iter_records())
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Run time: O(1) on average"""
+        return self._find_offset(key) != EMPTY
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Run time: O(1) on average, plus unpickling the value"""
+        offset = self._find_offset(key)
+        if offset == EMPTY:
+            raise KeyError('Key not found: {}'.format(key))
+        return pickle.loads(self._record_value(self.block.buf, offset))
+
+    def get_many(self, keys):
+        """Return a list of the values associated with the given keys, in
+        order, or raise KeyError if any key is not found."""
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value=None):
+        """Raise ValueError, since a shared hash table can only be changed by
+        publishing all of its contents again."""
+        raise ValueError('Shared hash table is read-only: {}'.format(
+            self.name))
+
+    def delete(self, key):
+        """Raise ValueError, since a shared hash table can only be changed by
+        publishing all of its contents again."""
+        raise ValueError('Shared hash table is read-only: {}'.format(
+            self.name))
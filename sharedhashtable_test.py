@@ -0,0 +1,110 @@
+#!python
+
+from sharedhashtable import SharedHashTable
+from hashtable import HashTable
+import multiprocessing
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+def read_in_child(name, keys, connection):
+    """Attach to the named shared hash table and send back its values."""
+    with SharedHashTable(name) as table:
+        connection.send([table.get(key) for key in keys])
+
+
+class SharedHashTableTest(unittest.TestCase):
+
+    def test_create_and_get(self):
+        items = [('I', 1), ('V', 5), (('X', 10), {'nested': [1, 2]})]
+        with SharedHashTable(create=True, items=items) as ht:
+            assert ht.size == 3
+            assert ht.length() == 3
+            assert len(ht) == 3
+            assert ht.get('I') == 1
+            assert ht.get(('X', 10)) == {'nested': [1, 2]}
+            assert ht.contains('V') is True
+            assert 'A' not in ht
+            with self.assertRaises(KeyError):
+                ht.get('A')
+            assert ht.get_many(['V', 'I']) == [5, 1]
+            self.assertCountEqual(ht.keys(), ['I', 'V', ('X', 10)])
+            self.assertCountEqual(ht.values(), [1, 5, {'nested': [1, 2]}])
+            assert ('I', 1) in ht.items()
+            assert ht.load_factor() <= 0.75
+
+    def test_duplicate_keys(self):
+        with SharedHashTable(create=True,
+                             items=[('A', 1), ('B', 2), ('A', 3)]) as ht:
+            assert ht.size == 2
+            assert ht.get('A') == 3  # Later pairs replace earlier ones
+
+    def test_equal_keys_sharing_objects(self):
+        first = ''.join(['ab', 'cd'])
+        second = ''.join(['ab', 'cd'])
+        with SharedHashTable(create=True, items=[((first, first), 1)]) as ht:
+            assert ht.contains((first, second)) is True
+            assert ht.get((second, second)) == 1
+
+    def test_publish_from_hash_table(self):
+        table = HashTable(iterable=[(number, number * 2)
+                                    for number in range(100)])
+        with SharedHashTable(create=True, items=table) as ht:
+            assert ht.size == 100
+            for number in range(100):
+                assert ht.get(number) == number * 2
+
+    def test_read_only(self):
+        with SharedHashTable(create=True, items=[('A', 1)]) as ht:
+            reader = SharedHashTable(ht.name)
+            with self.assertRaises(ValueError):
+                reader.set('B', 2)
+            with self.assertRaises(ValueError):
+                reader.delete('A')
+            with self.assertRaises(ValueError):
+                reader.publish([('B', 2)])
+            reader.close()
+
+    def test_reader_sees_new_generation(self):
+        with SharedHashTable(create=True, items=[('A', 1), ('B', 2)]) as ht:
+            reader = SharedHashTable(ht.name)
+            assert reader.generation == 1
+            keys = iter(reader.keys())
+            first_key = next(keys)
+            ht.publish({'A': 3, 'C': 4})
+            ht.publish({'A': 5, 'D': 6})
+            # Iteration keeps reading the generation it started on
+            assert sorted([first_key] + list(keys)) == ['A', 'B']
+            assert reader.get('A') == 5
+            assert reader.generation == 3
+            assert reader.contains('C') is False
+            assert reader.size == 2
+            reader.close()
+
+    def test_reader_after_creator_closes(self):
+        ht = SharedHashTable(create=True, items=[('a', 1)])
+        reader = SharedHashTable(ht.name)
+        ht.publish([('a', 2)])
+        ht.close()  # Removes the newest block before the reader switched
+        with self.assertRaises(ValueError):
+            reader.get('a')
+        reader.close()
+
+    def test_other_process_reads(self):
+        context = multiprocessing.get_context('fork')
+        keys = [number for number in range(50)]
+        with SharedHashTable(create=True,
+                             items=[(key, str(key)) for key in keys]) as ht:
+            receiver, sender = context.Pipe()
+            process = context.Process(target=read_in_child,
+                                      args=(ht.name, keys, sender))
+            process.start()
+            assert receiver.recv() == [str(key) for key in keys]
+            process.join()
+            assert process.exitcode == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,231 @@
+#!python
+import random
+
+# Most levels a node can have, enough for about 2 ** 32 items
+MAX_LEVEL = 32
+
+
+class SkipNode(object):
+    """Node of an indexable skip list. It has a forward link on each of its
+    levels, and each link records its width: the number of positions it
+    skips over on the bottom level."""
+
+    __slots__ = ('data', 'next', 'width')
+
+    def __init__(self, data, level):
+        """Initialize this node with the given data and number of levels."""
+        self.data = data
+        self.next = [None] * level  # Next node on each level
+        self.width = [1] * level  # Positions skipped by each link
+
+    def __repr__(self):
+        """Return a string representation of this node."""
+        return 'SkipNode({!r})'.format(self.data)
+
+
+class IndexableSkipList(object):
+    """Sequence with the positional interface of LinkedList, built as a skip
+    list: every node is on the bottom level, and each level above holds
+    about half of the nodes of the level below, chosen at random. Links on
+    the higher levels skip over many nodes at once, and their widths tell how
+    many, so finding the node at an index takes O(log n) expected time
+    instead of walking from the head. Links to the end of the list count
+    the positions up to one past the last item."""
+
+    def __init__(self, iterable=None, seed=None):
+        """Initialize this skip list and append the given items, if any.
+        Seed the random levels with seed to make them repeatable."""
+        self.random = random.Random(seed)
+        self.head = SkipNode(None, MAX_LEVEL)  # Sentinel before the items
+        self.level = 1  # Number of levels in use
+        self.size = 0  # Number of items
+        # Link the given items in order
+        if iterable is not None:
+            self._build(iterable)
+
+    def __str__(self):
+        """Return a formatted string representation of this skip list."""
+        items = ['({!r})'.format(item) for item in self.items()]
+        return '[{}]'.format(' -> '.join(items))
+
+    def __repr__(self):
+        """Return a string representation of this skip list."""
+        return 'IndexableSkipList({!r})'.format(self.items())
+
+    def __iter__(self):
+        node = self.head.next[0]
+        while node is not None:
+            yield node.data
+            node = node.next[0]
+
+    def __len__(self):
+        """Return the number of items in this skip list."""
+        return self.size
+
+    def items(self):
+        """Return a list of all items in this skip list.
+        Best and worst case running time: Theta(n) for n items in the list"""
+        return list(self)
+
+    def is_empty(self):
+        """Return True if this skip list is empty, or False."""
+        return self.size == 0
+
+    def length(self):
+        """Return the number of items in this skip list.
+        Best and worst case running time: O(1) since size is kept up to date"""
+        return self.size
+
+    def _build(self, iterable):
+        """Link the given items into this empty skip list in one pass, keeping
+        the last node on each level so no search is needed to reach the tail.
+        Run time: O(n) expected for n items"""
+        last = [self.head] * MAX_LEVEL  # Last node on each level
+        positions = [0] * MAX_LEVEL  # Positions of those nodes
+        for item in iterable:
+            self.size += 1
+            level = self._random_level()
+            node = SkipNode(item, level)
+            for index in range(level):
+                last[index].next[index] = node
+                last[index].width[index] = self.size - positions[index]
+                last[index] = node
+                positions[index] = self.size
+            self.level = max(self.level, level)
+        # Close the last link on each level with a link to the end
+        for index in range(self.level):
+            last[index].width[index] = self.size + 1 - positions[index]
+
+    def _random_level(self):
+        """Return a random number of levels for a new node, where each level
+        above the first is half as likely as the one below it."""
+        level = 1
+        bits = self.random.getrandbits(MAX_LEVEL - 1)
+        while bits & 1:
+            level += 1
+            bits >>= 1
+        return level
+
+    def _predecessors(self, position):
+        """Return a list of the last node before the given position (counting
+        the first item as position 1) on each level in use, and a list of the
+        positions of those nodes. Run time: O(log n) expected"""
+        nodes = [None] * self.level
+        positions = [0] * self.level
+        node = self.head
+        node_position = 0
+        for level in range(self.level - 1, -1, -1):
+            while (node.next[level] is not None and
+                   node_position + node.width[level] < position):
+                node_position += node.width[level]
+                node = node.next[level]
+            nodes[level] = node
+            positions[level] = node_position
+        return nodes, positions
+
+    def get_at_index(self, index):
+        """Return the item at the given index in this skip list, or raise
+        ValueError if the given index is out of range of the list size.
+        Run time: O(log n) expected"""
+        if not (0 <= index < self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        position = index + 1
+        node = self.head
+        node_position = 0
+        for level in range(self.level - 1, -1, -1):
+            while node_position + node.width[level] <= position:
+                node_position += node.width[level]
+                node = node.next[level]
+        return node.data
+
+    def insert_at_index(self, index, item):
+        """Insert the given item at the given index in this skip list, or
+        raise ValueError if the given index is out of range of the list size.
+        Run time: O(log n) expected"""
+        if not (0 <= index <= self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        new_level = self._random_level()
+        if new_level > self.level:
+            # New levels start out as one link from the head to the end
+            for level in range(self.level, new_level):
+                self.head.next[level] = None
+                self.head.width[level] = self.size + 1
+            self.level = new_level
+        position = index + 1
+        nodes, positions = self._predecessors(position)
+        new_node = SkipNode(item, new_level)
+        for level in range(new_level):
+            previous = nodes[level]
+            # The link from previous is split in two around the new node
+            end = positions[level] + previous.width[level]
+            new_node.next[level] = previous.next[level]
+            new_node.width[level] = end + 1 - position
+            previous.next[level] = new_node
+            previous.width[level] = position - positions[level]
+        for level in range(new_level, self.level):
+            nodes[level].width[level] += 1  # Links over the new node
+        self.size += 1
+
+    def delete_at_index(self, index):
+        """Delete and return the item at the given index in this skip list, or
+        raise ValueError if the given index is out of range of the list size.
+        Run time: O(log n) expected"""
+        if not (0 <= index < self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        nodes, _ = self._predecessors(index + 1)
+        node = nodes[0].next[0]
+        for level in range(len(node.next)):
+            # Join the links before and after the deleted node
+            previous = nodes[level]
+            previous.next[level] = node.next[level]
+            previous.width[level] += node.width[level] - 1
+        for level in range(len(node.next), self.level):
+            nodes[level].width[level] -= 1  # Links over the deleted node
+        self.size -= 1
+        # Stop using levels that no longer have any node
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        return node.data
+
+    def append(self, item):
+        """Insert the given item at the tail of this skip list.
+        Run time: O(log n) expected"""
+        self.insert_at_index(self.size, item)
+
+    def prepend(self, item):
+        """Insert the given item at the head of this skip list.
+        Run time: O(log n) expected"""
+        self.insert_at_index(0, item)
+
+    def index(self, item):
+        """Return the index of the first occurrence of the given item, or
+        raise ValueError. Run time: O(n)"""
+        for index, data in enumerate(self):
+            if data == item:
+                return index
+        raise ValueError('Item not found: {}'.format(item))
+
+    def find(self, quality):
+        """Return an item from this skip list satisfying the given quality, or
+        None. Run time: O(n) if the item is not near the head"""
+        for item in self:
+            if quality(item):
+                return item
+        return None
+
+    def replace(self, old_item, new_item):
+        """Replace the given old_item in this skip list with given new_item
+        in the same node, or raise ValueError if old_item is not found.
+        Run time: O(n) if old_item is not near the head"""
+        node = self.head.next[0]
+        while node is not None:
+            if node.data == old_item:
+                node.data = new_item
+                return
+            node = node.next[0]
+        raise ValueError('Item not in list: {}'.format(old_item))
+
+    def delete(self, item):
+        """Delete the given item from this skip list, or raise ValueError.
+        Run time: O(n) to find the item, plus O(log n) expected to unlink it"""
+        return self.delete_at_index(self.index(item))
@@ -0,0 +1,112 @@
+#!python
+
+from skiplist import IndexableSkipList
+import random
+import unittest
+
+
+class IndexableSkipListTest(unittest.TestCase):
+
+    def check_widths(self, sl):
+        """Check that every link's width matches the positions it skips."""
+        positions = {id(sl.head): 0}
+        node = sl.head.next[0]
+        position = 1
+        while node is not None:
+            positions[id(node)] = position
+            node = node.next[0]
+            position += 1
+        for level in range(sl.level):
+            node = sl.head
+            while node is not None:
+                target = node.next[level]
+                end = sl.size + 1 if target is None else positions[id(target)]
+                assert node.width[level] == end - positions[id(node)]
+                node = target
+
+    def test_init(self):
+        sl = IndexableSkipList()
+        assert sl.size == 0
+        assert sl.length() == 0
+        assert sl.is_empty() is True
+        assert sl.items() == []
+
+    def test_init_with_list(self):
+        sl = IndexableSkipList(['A', 'B', 'C'], seed=1)
+        assert sl.items() == ['A', 'B', 'C']
+        assert len(sl) == 3
+        self.check_widths(sl)
+
+    def test_get_at_index(self):
+        sl = IndexableSkipList('ABCDEFG', seed=1)
+        for index, item in enumerate('ABCDEFG'):
+            assert sl.get_at_index(index) == item
+        with self.assertRaises(ValueError):
+            sl.get_at_index(7)  # index too high
+        with self.assertRaises(ValueError):
+            sl.get_at_index(-1)  # index too low
+
+    def test_insert_at_index(self):
+        sl = IndexableSkipList(seed=2)
+        sl.insert_at_index(0, 'B')  # append('B')
+        sl.insert_at_index(0, 'A')  # prepend('A')
+        sl.insert_at_index(2, 'D')  # append('D')
+        sl.insert_at_index(2, 'C')  # insert 'C' between 'B' and 'D'
+        assert sl.items() == ['A', 'B', 'C', 'D']
+        self.check_widths(sl)
+        with self.assertRaises(ValueError):
+            sl.insert_at_index(5, 'X')  # index too high
+        with self.assertRaises(ValueError):
+            sl.insert_at_index(-1, 'Y')  # index too low
+
+    def test_append_and_prepend(self):
+        sl = IndexableSkipList(seed=3)
+        sl.append('B')
+        sl.prepend('A')
+        sl.append('C')
+        assert sl.items() == ['A', 'B', 'C']
+
+    def test_find_and_replace(self):
+        sl = IndexableSkipList(['A', 'B', 'C'], seed=4)
+        assert sl.find(lambda item: item > 'A') == 'B'
+        assert sl.find(lambda item: item == 'X') is None
+        sl.replace('B', 'X')
+        assert sl.items() == ['A', 'X', 'C']
+        with self.assertRaises(ValueError):
+            sl.replace('B', 'Y')  # item not in list
+
+    def test_delete(self):
+        sl = IndexableSkipList(['A', 'B', 'C'], seed=5)
+        assert sl.delete('B') == 'B'
+        assert sl.items() == ['A', 'C']
+        assert sl.delete_at_index(1) == 'C'
+        assert sl.delete_at_index(0) == 'A'
+        assert sl.size == 0
+        assert sl.level == 1
+        with self.assertRaises(ValueError):
+            sl.delete('X')  # item not in list
+        with self.assertRaises(ValueError):
+            sl.delete_at_index(0)
+
+    def test_against_list(self):
+        rng = random.Random(6)
+        sl = IndexableSkipList(seed=6)
+        expected = []
+        for number in range(3000):
+            if rng.random() < 0.6 or not expected:
+                index = rng.randint(0, len(expected))
+                sl.insert_at_index(index, number)
+                expected.insert(index, number)
+            else:
+                index = rng.randrange(len(expected))
+                assert sl.delete_at_index(index) == expected.pop(index)
+        assert sl.items() == expected
+        assert sl.size == len(expected)
+        for index in range(len(expected)):
+            assert sl.get_at_index(index) == expected[index]
+        self.check_widths(sl)
+        assert sl.level > 4  # Express levels are in use
+
+
+if __name__ == '__main__':
+    unittest.main()
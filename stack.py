@@ -1,5 +1,5 @@
 #!python
-from linkedlist import LinkedList # from folder.filename import Class
+from linkedlist import LinkedList, NodePool # from folder.filename import Class
 
 # Implement LinkedStack below, then change the assignment at the bottom
 # to use this Stack implementation to verify it passes all tests
@@ -7,8 +7,9 @@ class LinkedStack(object):
 
     def __init__(self, iterable=None):
         """Initialize this stack and push the given items, if any."""
-        # Initialize a new linked list to store the items
-        self.list = LinkedList()
+        # Initialize a new linked list to store the items, recycling the nodes
+        # of removed items for the items added later
+        self.list = LinkedList(pool=NodePool())
         if iterable is not None:
             for item in iterable:
                 self.push(item)
@@ -38,10 +39,9 @@ class LinkedStack(object):
     
     def pop(self):
         """Remove and return top item, if any, or raise ValueError if empty
-        Run time: O(1) because we only need to change head node"""
-        head = self.peek()
-        self.list.delete(head)
-        return head
+        Run time: O(1) because we only need to change head node, and no
+        items are compared so None or any other item can be pushed"""
+        return self.list.pop_left()
 
 
 # Implement ArrayStack below, then change the assignment at the bottom
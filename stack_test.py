@@ -1,6 +1,6 @@
 #!python
 
-from stack import Stack
+from stack import Stack, LinkedStack
 import unittest
 
 
@@ -72,5 +72,19 @@ class StackTest(unittest.TestCase):
             s.pop()
 
 
+class LinkedStackTest(unittest.TestCase):
+
+    def test_pop_without_equality(self):
+        nan = float('nan')  # Not equal to itself
+        items = LinkedStack()
+        items.push(None)
+        items.push(nan)
+        assert items.pop() is nan
+        assert items.pop() is None
+        assert items.is_empty() is True
+        with self.assertRaises(ValueError):
+            items.pop()
+
+
 if __name__ == '__main__':
     unittest.main()
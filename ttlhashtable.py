@@ -0,0 +1,184 @@
+#!python
+from hashtable import HashTable, Entry # from folder.filename import Class
+import heapq
+import time
+
+
+class TTLEntry(Entry):
+    """A hash table entry that also stores the time it expires at."""
+
+    __slots__ = ('deadline',)
+
+    def __init__(self, key, value, key_hash):
+        """Initialize this entry with the given key, value and key hash,
+        without an expiry time."""
+        Entry.__init__(self, key, value, key_hash)
+        self.deadline = None  # Time this entry expires at, or None
+
+
+class TTLHashTable(HashTable):
+    """Hash table whose entries can expire a given number of seconds (their
+    time to live, or TTL) after they were set.
+    Expired entries are dropped lazily by any lookup that finds them, and
+    incrementally by expire(), which each set also calls with a small budget
+    as a background sweep. Deadlines are kept in a min-heap, so expire() only
+    visits entries that are actually due instead of scanning the table.
+    Expired entries still count toward size until they are removed, but
+    lookups and iteration never return them."""
+
+    entry_class = TTLEntry
+
+    # Number of due deadlines each set call removes in passing
+    REAP_STEP = 4
+
+    def __init__(self, init_size=8, default_ttl=None, clock=time.monotonic):
+        """Initialize this hash table with the given initial size, a TTL in
+        seconds for entries set without one (None to never expire), and the
+        clock function used to read the current time."""
+        HashTable.__init__(self, init_size)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        # Min-heap of (deadline, sequence, key), ordered by deadline. Entries
+        # that were updated or deleted since stay in it until they are popped
+        self.deadlines = []
+        self.sequence = 0  # Tie breaker so keys are never compared
+        self.expired = 0  # Number of entries dropped because they expired
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'TTLHashTable({!r})'.format(list(self.items()))
+
+    def _is_expired(self, entry, now):
+        """Return True if the given entry expired at or before now."""
+        return entry.deadline is not None and entry.deadline <= now
+
+    def _find(self, key):
+        """Return the entry with the given key, or None if not found or
+        expired, in which case the entry is removed."""
+        entry = HashTable._find(self, key)
+        if entry is not None and self._is_expired(entry, self.clock()):
+            self._remove(key)
+            self.expired += 1
+            return None
+        return entry
+
+    def _iter_entries(self):
+        """Generate each entry in this hash table that has not expired."""
+        now = self.clock()
+        for entry in HashTable._iter_entries(self):
+            if not self._is_expired(entry, now):
+                yield entry
+
+    def set(self, key, value=None, ttl=None):
+        """Insert or update the given key with its associated value, expiring
+        ttl seconds from now (or default_ttl seconds if ttl is None).
+        Run time: O(log d) on average, where d is the number of deadlines"""
+        if self.old_buckets is not None:
+            self._migrate(self.MIGRATE_STEP)
+        if ttl is None:
+            ttl = self.default_ttl
+        entry = self._insert(key, value)
+        if ttl is None:
+            entry.deadline = None
+        else:
+            entry.deadline = self.clock() + ttl
+            self.sequence += 1
+            heapq.heappush(self.deadlines,
+                           (entry.deadline, self.sequence, key))
+        # Check if the load factor exceeds a threshold such as 0.75
+        if self.load_factor() > 0.75:
+            self._resize()
+        self.expire(self.REAP_STEP)
+        # Rebuild the heap once outdated deadlines make up most of it
+        if len(self.deadlines) > 2 * self.size + 16:
+            self._rebuild_deadlines()
+
+    def set_many(self, items, ttl=None):
+        """Insert or update every (key, value) pair in the given iterable,
+        each expiring ttl seconds from now (or default_ttl seconds if ttl is
+        None). The buckets are grown once up front to fit all of the pairs.
+        Run time: O(n + m log d) where m is the number of pairs given"""
+        if not isinstance(items, (list, tuple)):
+            items = list(items)  # Count the pairs before inserting them
+        if ttl is None:
+            ttl = self.default_ttl
+        self._reserve(len(items))
+        deadline = None if ttl is None else self.clock() + ttl
+        for key, value in items:
+            entry = self._insert(key, value)
+            entry.deadline = deadline
+            if deadline is not None:
+                self.sequence += 1
+                heapq.heappush(self.deadlines,
+                               (deadline, self.sequence, key))
+        self.expire(self.REAP_STEP)
+        # Rebuild the heap once outdated deadlines make up most of it
+        if len(self.deadlines) > 2 * self.size + 16:
+            self._rebuild_deadlines()
+
+    def delete(self, key):
+        """Delete the given key and its associated value, or raise KeyError
+        if it is not found or has expired."""
+        if self._find(key) is None:
+            raise KeyError('Key not found: {}'.format(key))
+        HashTable.delete(self, key)
+
+    def delete_many(self, keys):
+        """Delete the given keys and their associated values, or raise KeyError
+        at the first key not found or expired. The buckets are shrunk at most
+        once, after all of the keys have been deleted."""
+        if self.old_buckets is not None:
+            self._migrate(len(self.old_buckets))
+        try:
+            for key in keys:
+                if self._find(key) is None:
+                    raise KeyError('Key not found: {}'.format(key))
+                self._remove(key)
+        finally:
+            self._shrink()
+
+    def ttl(self, key):
+        """Return the number of seconds until the given key expires, None if
+        it never expires, or raise KeyError if it is not found."""
+        entry = self._find(key)
+        if entry is None:
+            raise KeyError('Key not found: {}'.format(key))
+        if entry.deadline is None:
+            return None
+        return entry.deadline - self.clock()
+
+    def expire(self, limit=None):
+        """Remove entries whose deadline has passed, looking at no more than
+        limit deadlines (or all due ones if limit is None), and return the
+        number of entries removed.
+        Run time: O(k log d) where k is the number of due deadlines visited,
+        independent of the number of entries in this hash table"""
+        now = self.clock()
+        deadlines = self.deadlines
+        removed = 0
+        visited = 0
+        while deadlines and deadlines[0][0] <= now:
+            if limit is not None and visited >= limit:
+                break
+            deadline, _, key = heapq.heappop(deadlines)
+            visited += 1
+            entry = HashTable._find(self, key)
+            # Skip deadlines of entries that were updated or deleted since
+            if entry is not None and entry.deadline == deadline:
+                self._remove(key)
+                removed += 1
+        if removed:
+            self.expired += removed
+            self._shrink()
+        return removed
+
+    def _rebuild_deadlines(self):
+        """Rebuild the deadline heap from the entries that still expire,
+        dropping all outdated deadlines. Run time: O(n)"""
+        self.deadlines = []
+        for entry in HashTable._iter_entries(self):
+            if entry.deadline is not None:
+                self.sequence += 1
+                self.deadlines.append((entry.deadline, self.sequence,
+                                       entry.key))
+        heapq.heapify(self.deadlines)
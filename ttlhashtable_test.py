@@ -0,0 +1,155 @@
+#!python
+
+from ttlhashtable import TTLHashTable
+import io
+import unittest
+# Python 2 and 3 compatibility: unittest module renamed this assertion method
+if not hasattr(unittest.TestCase, 'assertCountEqual'):
+    unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
+
+
+class FakeClock(object):
+    """Clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLHashTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_set_without_ttl(self):
+        ht = TTLHashTable(clock=self.clock)
+        ht.set('I', 1)
+        self.clock.now = 1000
+        assert ht.get('I') == 1
+        assert ht.ttl('I') is None
+        assert ht.deadlines == []
+
+    def test_lazy_expiry(self):
+        ht = TTLHashTable(clock=self.clock)
+        ht.set('I', 1, ttl=10)
+        ht.set('V', 5, ttl=20)
+        self.clock.now = 5
+        assert ht.get('I') == 1
+        assert ht.ttl('I') == 5
+        self.clock.now = 10
+        assert ht.contains('I') is False
+        with self.assertRaises(KeyError):
+            ht.get('I')
+        assert ht.size == 1
+        assert ht.expired == 1
+        assert list(ht.keys()) == ['V']
+
+    def test_default_ttl(self):
+        ht = TTLHashTable(default_ttl=10, clock=self.clock)
+        ht.set('I', 1)
+        ht.set('V', 5, ttl=30)
+        self.clock.now = 15
+        assert ht.contains('I') is False
+        assert ht.get('V') == 5
+
+    def test_update_resets_ttl(self):
+        ht = TTLHashTable(clock=self.clock)
+        ht.set('I', 1, ttl=10)
+        self.clock.now = 5
+        ht.set('I', 2, ttl=10)
+        self.clock.now = 12
+        assert ht.expire() == 0  # The first deadline is outdated
+        assert ht.get('I') == 2
+        ht.set('I', 3)  # No TTL any more
+        self.clock.now = 100
+        assert ht.get('I') == 3
+
+    def test_expire(self):
+        ht = TTLHashTable(clock=self.clock)
+        for number in range(100):
+            ht.set(number, number, ttl=number + 1)
+        self.clock.now = 10
+        assert ht.expire(limit=3) == 3
+        assert ht.size == 97
+        assert ht.expire() == 7
+        assert ht.size == ht.length() == 90
+        assert ht.contains(9) is False
+        assert ht.contains(10) is True
+        assert ht.expired == 10
+
+    def test_set_reaps_due_entries(self):
+        ht = TTLHashTable(clock=self.clock)
+        for number in range(8):
+            ht.set(number, number, ttl=1)
+        self.clock.now = 2
+        ht.set('I', 1)
+        assert ht.size == 1 + 8 - TTLHashTable.REAP_STEP
+
+    def test_delete(self):
+        ht = TTLHashTable(clock=self.clock)
+        ht.set('I', 1, ttl=10)
+        ht.set('V', 5, ttl=10)
+        ht.delete('I')
+        assert ht.contains('I') is False
+        self.clock.now = 10
+        with self.assertRaises(KeyError):
+            ht.delete('V')  # Expired
+
+    def test_set_many(self):
+        ht = TTLHashTable(default_ttl=10, clock=self.clock)
+        ht.set('I', 1, ttl=5)
+        ht.set_many([('I', 1), ('V', 5)])
+        ht.set_many([('X', 10)], ttl=20)
+        assert ht.ttl('I') == 10  # Updated entries get the new deadline
+        assert ht.ttl('X') == 20
+        self.clock.now = 10
+        assert ht.contains('I') is False
+        assert ht.contains('V') is False
+        assert ht.get('X') == 10
+        assert ht.expire() == 0  # Both were dropped by the lookups
+        self.clock.now = 20
+        assert ht.expire() == 1
+
+    def test_delete_many(self):
+        ht = TTLHashTable(clock=self.clock)
+        ht.set('I', 1, ttl=10)
+        ht.set('V', 5, ttl=20)
+        ht.set('X', 10)
+        ht.delete_many(['V'])
+        assert ht.contains('V') is False
+        self.clock.now = 10
+        with self.assertRaises(KeyError):
+            ht.delete_many(['X', 'I'])  # 'I' expired
+        assert ht.contains('X') is False
+
+    def test_dump_with_moving_clock(self):
+        clock = self.clock
+
+        class TickingClock(object):
+            """Clock that moves one second each time it is read."""
+
+            def __call__(self):
+                clock.now += 1
+                return clock.now
+        ht = TTLHashTable(clock=TickingClock())
+        for number in range(10):
+            ht.set(number, str(number), ttl=20 - number)  # Expires at 21 + n
+        # Each read of the clock expires one more entry
+        snapshot = io.BytesIO()
+        ht.dump(snapshot)
+        snapshot.seek(0)
+        loaded = TTLHashTable.load(snapshot)
+        assert loaded.size == 9
+        self.assertCountEqual(loaded.keys(), range(1, 10))
+
+    def test_outdated_deadlines_are_dropped(self):
+        ht = TTLHashTable(clock=self.clock)
+        for _ in range(100):
+            ht.set('I', 1, ttl=10)
+        assert len(ht.deadlines) <= 2 * ht.size + 16
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+#!python
+import itertools
+
+
+class Chunk(object):
+    """Node of an unrolled linked list, holding a list of up to chunk_size
+    consecutive items instead of a single item."""
+
+    __slots__ = ('items', 'next')
+
+    def __init__(self, items=None):
+        """Initialize this chunk with the given list of items, if any."""
+        self.items = [] if items is None else items
+        self.next = None
+
+    def __repr__(self):
+        """Return a string representation of this chunk."""
+        return 'Chunk({!r})'.format(self.items)
+
+
+class UnrolledLinkedList(object):
+    """Linked list of chunks that each store up to chunk_size items in an
+    array, with the same interface as LinkedList. A chunk that overflows is
+    split in two, and a chunk left less than half full by a deletion borrows
+    items from the next chunk or merges with it, so chunks stay mostly full.
+    Walking the list then visits one chunk per many items, which makes
+    iteration and indexing several times faster than visiting a node per
+    item, and the chunk overhead is shared by all of its items."""
+
+    def __init__(self, iterable=None, chunk_size=64):
+        """Initialize this linked list with chunks of up to chunk_size items
+        and append the given items, if any."""
+        if chunk_size < 2:
+            raise ValueError('Chunk size must be at least 2: {}'.format(
+                chunk_size))
+        self.chunk_size = chunk_size
+        self.head = None  # First chunk
+        self.tail = None  # Last chunk
+        self.size = 0  # Number of items
+        # Append the given items
+        if iterable is not None:
+            for item in iterable:
+                self.append(item)
+
+    def __str__(self):
+        """Return a formatted string representation of this linked list."""
+        items = ['({!r})'.format(item) for item in self.items()]
+        return '[{}]'.format(' -> '.join(items))
+
+    def __repr__(self):
+        """Return a string representation of this linked list."""
+        return 'UnrolledLinkedList({!r})'.format(self.items())
+
+    def __iter__(self):
+        # Chain the chunks' lists, so only moving to the next chunk runs here
+        return itertools.chain.from_iterable(self._iter_chunks())
+
+    def _iter_chunks(self):
+        """Generate the list of items of each chunk in this linked list."""
+        chunk = self.head
+        while chunk is not None:
+            yield chunk.items
+            chunk = chunk.next
+
+    def items(self):
+        """Return a list of all items in this linked list.
+        Best and worst case running time: Theta(n) for n items in the list,
+        but copying a chunk's items at once only takes Theta(n / b) steps
+        where b is the chunk size."""
+        result = []
+        chunk = self.head
+        while chunk is not None:
+            result.extend(chunk.items)
+            chunk = chunk.next
+        return result
+
+    def is_empty(self):
+        """Return True if this linked list is empty, or False."""
+        return self.head is None
+
+    def length(self):
+        """Return the length of this linked list by traversing its chunks.
+        Best and worst case run time: O(n / b) where b is the chunk size"""
+        item_count = 0
+        chunk = self.head
+        while chunk is not None:
+            item_count += len(chunk.items)
+            chunk = chunk.next
+        self.size = item_count
+        return item_count
+
+    def _locate(self, index):
+        """Return the chunk holding the item at the given index, which may be
+        one past the last item, and the index of the item in that chunk.
+        Run time: O(n / b) where b is the chunk size"""
+        chunk = self.head
+        while index > len(chunk.items):
+            index -= len(chunk.items)
+            chunk = chunk.next
+        return chunk, index
+
+    def get_at_index(self, index):
+        """Return the item at the given index in this linked list, or
+        raise ValueError if the given index is out of range of the list size.
+        Best case running time: O(1) if the item is in the head chunk
+        Worst case running time: O(n / b) where b is the chunk size"""
+        if not (0 <= index < self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        # The tail chunk is found without walking the list
+        tail_start = self.size - len(self.tail.items)
+        if index >= tail_start:
+            return self.tail.items[index - tail_start]
+        chunk = self.head
+        while index >= len(chunk.items):
+            index -= len(chunk.items)
+            chunk = chunk.next
+        return chunk.items[index]
+
+    def insert_at_index(self, index, item):
+        """Insert the given item at the given index in this linked list, or
+        raise ValueError if the given index is out of range of the list size.
+        Best case running time: O(1) if inserting at head or tail
+        Worst case running time: O(n / b + b) where b is the chunk size, to
+        find the chunk and shift the items after the index in it"""
+        if not (0 <= index <= self.size):
+            raise ValueError('List index out of range: {}'.format(index))
+        if index == 0:
+            self.prepend(item)
+        elif index == self.size:
+            self.append(item)
+        else:
+            chunk, offset = self._locate(index)
+            chunk.items.insert(offset, item)
+            self.size += 1
+            if len(chunk.items) > self.chunk_size:
+                self._split(chunk)
+
+    def append(self, item):
+        """Insert the given item at the tail of this linked list.
+        Best and worst case running time: O(1)"""
+        if self.tail is None or len(self.tail.items) >= self.chunk_size:
+            # Start a new chunk rather than splitting the full tail, so
+            # appended items fill every chunk completely
+            chunk = Chunk()
+            if self.tail is None:
+                self.head = chunk
+            else:
+                self.tail.next = chunk
+            self.tail = chunk
+        self.tail.items.append(item)
+        self.size += 1
+
+    def prepend(self, item):
+        """Insert the given item at the head of this linked list.
+        Best and worst case running time: O(b) where b is the chunk size, to
+        shift the items of the head chunk"""
+        if self.head is None or len(self.head.items) >= self.chunk_size:
+            chunk = Chunk()
+            chunk.next = self.head
+            if self.head is None:
+                self.tail = chunk
+            self.head = chunk
+        self.head.items.insert(0, item)
+        self.size += 1
+
+    def find(self, quality):
+        """Return an item from this linked list satisfying the given quality.
+        Best case running time: O(1) if item is near the head of the list.
+        Worst case running time: O(n) if item is near the tail of the list or
+        not present and we need to loop through all n items in the list."""
+        for item in self:
+            if quality(item):
+                return item
+        return None
+
+    def replace(self, old_item, new_item):
+        """Replace the given old_item in this linked list with given new_item,
+        or raise ValueError if old_item is not found.
+        Best case running time: O(1) if old_item is in the head chunk
+        Worst case running time: O(n) if old_item doesn't exist"""
+        chunk = self.head
+        while chunk is not None:
+            if old_item in chunk.items:
+                chunk.items[chunk.items.index(old_item)] = new_item
+                return
+            chunk = chunk.next
+        raise ValueError('Item not in list: {}'.format(old_item))
+
+    def delete(self, item):
+        """Delete the given item from this linked list, or raise ValueError.
+        Best case running time: O(b) if item is in the head chunk
+        Worst case running time: O(n) if item doesn't exist"""
+        chunk = self.head
+        previous = None
+        while chunk is not None:
+            if item in chunk.items:
+                chunk.items.remove(item)
+                self.size -= 1
+                self._rebalance(chunk, previous)
+                return item
+            previous = chunk
+            chunk = chunk.next
+        raise ValueError('Item not found: {}'.format(item))
+
+    def _split(self, chunk):
+        """Move the second half of the items of the given overflowing chunk
+        into a new chunk after it. Run time: O(b)"""
+        half = len(chunk.items) // 2
+        new_chunk = Chunk(chunk.items[half:])
+        del chunk.items[half:]
+        new_chunk.next = chunk.next
+        chunk.next = new_chunk
+        if chunk is self.tail:
+            self.tail = new_chunk
+
+    def _rebalance(self, chunk, previous):
+        """Fix the given chunk, which comes after the given previous chunk
+        (None for the head), after an item was deleted from it: drop it if it
+        is empty, and if it is less than half full, merge the next chunk into
+        it or move enough items from the next chunk to make it half full.
+        Run time: O(b)"""
+        if not chunk.items:
+            if previous is None:
+                self.head = chunk.next
+            else:
+                previous.next = chunk.next
+            if chunk is self.tail:
+                self.tail = previous
+            return
+        next_chunk = chunk.next
+        half = self.chunk_size // 2
+        if next_chunk is None or len(chunk.items) >= half:
+            return
+        if len(chunk.items) + len(next_chunk.items) <= self.chunk_size:
+            chunk.items.extend(next_chunk.items)
+            chunk.next = next_chunk.next
+            if next_chunk is self.tail:
+                self.tail = chunk
+        else:
+            needed = half - len(chunk.items)
+            chunk.items.extend(next_chunk.items[:needed])
+            del next_chunk.items[:needed]
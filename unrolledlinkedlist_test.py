@@ -0,0 +1,147 @@
+#!python
+
+from unrolledlinkedlist import UnrolledLinkedList
+import random
+import unittest
+
+
+class UnrolledLinkedListTest(unittest.TestCase):
+
+    def chunk_lengths(self, ll):
+        """Return the number of items in each chunk of the given list."""
+        lengths = []
+        chunk = ll.head
+        while chunk is not None:
+            lengths.append(len(chunk.items))
+            chunk = chunk.next
+        return lengths
+
+    def test_init(self):
+        ll = UnrolledLinkedList()
+        assert ll.head is None
+        assert ll.tail is None
+        assert ll.size == 0
+        with self.assertRaises(ValueError):
+            UnrolledLinkedList(chunk_size=1)
+
+    def test_init_with_list(self):
+        ll = UnrolledLinkedList(['A', 'B', 'C', 'D', 'E'], chunk_size=2)
+        assert ll.head.items == ['A', 'B']
+        assert ll.tail.items == ['E']
+        assert ll.size == 5
+        assert ll.items() == ['A', 'B', 'C', 'D', 'E']
+        assert list(ll) == ['A', 'B', 'C', 'D', 'E']
+
+    def test_items(self):
+        ll = UnrolledLinkedList(chunk_size=2)
+        assert ll.items() == []
+        ll.append('B')
+        assert ll.items() == ['B']
+        ll.prepend('A')
+        assert ll.items() == ['A', 'B']
+        ll.append('C')
+        assert ll.items() == ['A', 'B', 'C']
+        ll.prepend('Z')
+        assert ll.items() == ['Z', 'A', 'B', 'C']
+
+    def test_length(self):
+        ll = UnrolledLinkedList(chunk_size=2)
+        assert ll.length() == 0
+        for item in 'ABCDE':
+            ll.append(item)
+        assert ll.length() == 5
+        ll.delete('B')
+        assert ll.length() == 4
+        assert ll.size == 4
+
+    def test_get_at_index(self):
+        ll = UnrolledLinkedList('ABCDEFG', chunk_size=3)
+        for index, item in enumerate('ABCDEFG'):
+            assert ll.get_at_index(index) == item
+        with self.assertRaises(ValueError):
+            ll.get_at_index(7)  # index too high
+        with self.assertRaises(ValueError):
+            ll.get_at_index(-1)  # index too low
+
+    def test_insert_at_index(self):
+        ll = UnrolledLinkedList(chunk_size=4)
+        ll.insert_at_index(0, 'B')  # append('B')
+        ll.insert_at_index(0, 'A')  # prepend('A')
+        ll.insert_at_index(2, 'D')  # append('D')
+        ll.insert_at_index(2, 'C')  # insert 'C' between 'B' and 'D'
+        assert ll.items() == ['A', 'B', 'C', 'D']
+        ll.insert_at_index(1, 'X')  # Head chunk overflows and splits
+        assert ll.items() == ['A', 'X', 'B', 'C', 'D']
+        assert self.chunk_lengths(ll) == [2, 3]
+        assert ll.tail.items == ['B', 'C', 'D']
+        with self.assertRaises(ValueError):
+            ll.insert_at_index(6, 'X')  # index too high
+        with self.assertRaises(ValueError):
+            ll.insert_at_index(-1, 'Y')  # index too low
+
+    def test_find(self):
+        ll = UnrolledLinkedList(['A', 'B', 'C'], chunk_size=2)
+        assert ll.find(lambda item: item == 'B') == 'B'
+        assert ll.find(lambda item: item < 'B') == 'A'
+        assert ll.find(lambda item: item > 'B') == 'C'
+        assert ll.find(lambda item: item == 'X') is None
+
+    def test_replace(self):
+        ll = UnrolledLinkedList(['A', 'B', 'C'], chunk_size=2)
+        ll.replace('A', 'D')
+        ll.replace('C', 'F')
+        assert ll.items() == ['D', 'B', 'F']
+        with self.assertRaises(ValueError):
+            ll.replace('X', 'Y')  # item not in list
+
+    def test_delete(self):
+        ll = UnrolledLinkedList(['A', 'B', 'C'])
+        assert ll.delete('A') == 'A'
+        assert ll.items() == ['B', 'C']
+        ll.delete('C')
+        ll.delete('B')
+        assert ll.head is None
+        assert ll.tail is None
+        assert ll.size == 0
+        with self.assertRaises(ValueError):
+            ll.delete('X')  # item not in list
+
+    def test_delete_merges_and_borrows(self):
+        ll = UnrolledLinkedList(range(12), chunk_size=4)
+        assert self.chunk_lengths(ll) == [4, 4, 4]
+        ll.delete(0)
+        ll.delete(1)  # Still half full
+        assert self.chunk_lengths(ll) == [2, 4, 4]
+        ll.delete(2)  # Borrows an item, since the chunks can't be merged
+        assert self.chunk_lengths(ll) == [2, 3, 4]
+        ll.delete(3)  # Merges with the next chunk
+        assert self.chunk_lengths(ll) == [4, 4]
+        assert ll.items() == list(range(4, 12))
+        for item in range(4, 12):
+            ll.delete(item)
+        assert ll.head is None and ll.tail is None
+
+    def test_against_list(self):
+        rng = random.Random(3)
+        ll = UnrolledLinkedList(chunk_size=8)
+        expected = []
+        for number in range(2000):
+            operation = rng.random()
+            if operation < 0.5 or not expected:
+                index = rng.randint(0, len(expected))
+                ll.insert_at_index(index, number)
+                expected.insert(index, number)
+            else:
+                item = rng.choice(expected)
+                ll.delete(item)
+                expected.remove(item)
+            assert ll.size == len(expected)
+        assert ll.items() == expected
+        assert ll.length() == len(expected)
+        for index in range(0, len(expected), 7):
+            assert ll.get_at_index(index) == expected[index]
+        assert max(self.chunk_lengths(ll)) <= 8
+
+
+if __name__ == '__main__':
+    unittest.main()